@@ -53,6 +53,7 @@ __all__ = [
     "mtraj",
     "mstraj",
     "jsingu",
+    "ReachabilityMap",
     "jacobian_numerical",
     "hessian_numerical",
     "rtb_load_data",
@@ -73,6 +74,7 @@ __all__ = [
     "Bug2",
     "DistanceTransformPlanner",
     "DstarPlanner",
+    "DstarLitePlanner",
     "DubinsPlanner",
     "LatticePlanner",
     "ReedsSheppPlanner",
@@ -93,7 +95,9 @@ __all__ = [
     "PlannerBase",
     "RRTPlanner",
     "EKF",
+    "EIF",
     "ParticleFilter",
+    "History",
 ]
 
 try:
@@ -2,8 +2,12 @@
 @Author: Peter Corke, original MATLAB code and Python version
 @Author: Kristian Gibson, initial MATLAB port
 """
+from collections import OrderedDict
+import hashlib
 from numpy import disp
 from scipy import integrate
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
 from spatialmath.base.transforms2d import *
 from spatialmath.base.vectors import *
 from spatialmath.pose2d import SE2
@@ -22,6 +26,8 @@ class DistanceTransformPlanner(PlannerBase):
     :type occgrid: :class:`BinaryOccGrid` or ndarray(h,w)
     :param metric: distane metric, one of: "euclidean" [default], "manhattan"
     :type metric: str optional
+    :param cachesize: number of distance maps to cache, defaults to 4
+    :type cachesize: int, optional
     :param kwargs: common planner options, see :class:`PlannerBase`
 
     ==================   ========================
@@ -58,19 +64,23 @@ class DistanceTransformPlanner(PlannerBase):
         >>> path = dx.query(start=(5, 4))
         >>> print(path.T)
 
-    .. warning:: The distance planner is iterative and implemented in Python, will
-        be slow for very large occupancy grids.
+    The distance maps for the most recent ``cachesize`` goals are cached, so
+    planning again, or querying, for one of those goals does not recompute
+    the distance transform.
 
     :author: Peter Corke
 
     :seealso: :meth:`plan` :meth:`query` :class:`PlannerBase`
     """
 
-    def __init__(self, occgrid=None, metric="euclidean", **kwargs):
+    def __init__(self, occgrid=None, metric="euclidean", cachesize=4, **kwargs):
 
         super().__init__(occgrid=occgrid, ndims=2, **kwargs)
         self._metric = metric
         self._distancemap = None
+        self._distancemap_goal = None
+        self._cache = OrderedDict()
+        self._cachesize = cachesize
 
     @property
     def metric(self):
@@ -117,6 +127,9 @@ class DistanceTransformPlanner(PlannerBase):
         minimum obstacle-free distance to the goal using the particular distance
         metric.
 
+        If a distance map for this goal and the current occupancy grid is in
+        the cache it is used, unless ``animate`` is True.
+
         :seealso: :meth:`query`
         """
         # show = None
@@ -131,13 +144,117 @@ class DistanceTransformPlanner(PlannerBase):
         if self._goal is None:
             raise ValueError("No goal specified here or in constructor")
 
-        self._distancemap = distancexform(
-            self.occgrid.grid,
-            goal=self._goal,
-            metric=self._metric,
-            animate=animate,
-            summary=summary,
-        )
+        # key on the goal and the occupancy grid, which may have been changed
+        grid = self.occgrid.grid
+        digest = hashlib.sha1(grid.tobytes()).hexdigest()
+        key = (tuple(self._goal.astype(int)), grid.shape, grid.dtype.str, digest)
+        if key in self._cache and not animate:
+            self._cache.move_to_end(key)
+        else:
+            # the next cell map is computed when first needed
+            self._cache[key] = [
+                distancexform(
+                    self.occgrid.grid,
+                    goal=self._goal,
+                    metric=self._metric,
+                    animate=animate,
+                    summary=summary,
+                ),
+                None,
+            ]
+            if len(self._cache) > self._cachesize:
+                self._cache.popitem(last=False)
+        self._distancemap = self._cache[key][0]
+        self._distancemap_goal = key[0]
+        self._cachekey = key
+
+    @property
+    def nextmap(self):
+        """
+        Get the next cell map
+
+        :return: flat index of the next cell on the path from every cell
+        :rtype: ndarray(h,w)
+
+        The 2D array, the same size as the distance map, has elements equal
+        to the index, into the flattened distance map, of the neighbouring
+        cell that is closest to the goal.  Elements are -1 for the goal,
+        obstacles and unreachable cells.  The array is computed, once for
+        each distance map, when first required.
+
+        :seealso: :meth:`distancemap` :meth:`query`
+        """
+        if self._distancemap is None:
+            return None
+        entry = self._cache.get(self._cachekey)
+        if entry is None or entry[0] is not self._distancemap:
+            # evicted from the cache
+            entry = [self._distancemap, None]
+        if entry[1] is None:
+            entry[1] = nextcell(self._distancemap)
+        return entry[1]
+
+    def query(
+        self, start=None, goal=None, dtype=None, next=True, animate=False, movie=None
+    ):
+        r"""
+        Find path from start to goal
+
+        :param start: start position :math:`(x, y)`, or one per row, defaults to previously set value
+        :type start: array_like(2) or ndarray(N,2), optional
+        :param goal: goal position :math:`(x, y)`, defaults to the goal of the plan
+        :type goal: array_like(2), optional
+        :param dtype: data type for point coordinates, defaults to None
+        :type dtype: str, optional
+        :param next: find the path, defaults to True
+        :type next: bool, optional
+        :param animate: show the vehicle path, defaults to False
+        :type animate: bool, optional
+        :param movie: passed to :meth:`PlannerBase.query`, defaults to None
+        :raises RuntimeError: the goal cannot be reached from the start
+        :return: path from start to goal, one point :math:`(x, y)` per row
+        :rtype: ndarray(N,2) or list of ndarray(N,2)
+
+        If ``goal`` differs from the goal of the current plan, :meth:`plan` is
+        invoked for the new goal, which is free if its distance map is cached.
+
+        The path is found by following the :meth:`nextmap` from the start
+        cell.  If ``start`` has multiple rows, the paths from all of them are
+        found together and a list of paths is returned.
+
+        If ``animate`` is True the path is found by the superclass method
+        which iterates on :meth:`next`.  If ``next`` is False the start and
+        goal are only validated and set, and None is returned, as for the
+        superclass method.
+
+        :seealso: :meth:`plan` :meth:`next` :meth:`nextmap`
+        """
+        if goal is not None:
+            goal = base.getvector(goal, 2, dtype=int)
+            if tuple(goal) != self._distancemap_goal:
+                self.plan(goal)
+
+        if animate or not next:
+            return super().query(
+                start=start,
+                goal=goal,
+                dtype=dtype,
+                next=next,
+                animate=animate,
+                movie=movie,
+            )
+
+        if self.distancemap is None:
+            raise RuntimeError("No distance map computed, you need to plan.")
+
+        if start is not None and np.ndim(start) == 2:
+            start = np.array(start, dtype=int)
+            for p in start:
+                self.validate_endpoint(p, dtype=dtype)
+            return followpath(self.nextmap, start, self._goal)
+
+        self.start = self.validate_endpoint(start, dtype=dtype)
+        return followpath(self.nextmap, self._start.reshape((1, 2)), self._goal)[0]
 
     def next(self, position):
         """
@@ -155,44 +272,19 @@ class DistanceTransformPlanner(PlannerBase):
         :seealso: :meth:`plan` :meth:`query`
         """
         if self.distancemap is None:
-            Error("No distance map computed, you need to plan.")
-
-        directions = np.array(
-            [
-                # dy  dx
-                [-1, -1],
-                [0, -1],
-                [1, -1],
-                [-1, 0],
-                [0, 0],
-                [1, 0],
-                [0, 1],
-                [1, 1],
-            ],
-            dtype=int,
-        )
+            raise RuntimeError("No distance map computed, you need to plan.")
 
         x = int(position[0])
         y = int(position[1])
+        shape = self._distancemap.shape
+        i = self.nextmap[y, x]
 
-        min_dist = np.inf
-        for d in directions:
-            try:
-                if self._distancemap[y + d[0], x + d[1]] < min_dist:
-                    min_dir = d
-                    min_dist = self._distancemap[y + d[0], x + d[1]]
-            except:
-                # come here if the neighbouring cell is outside the map bounds
-                # raise RuntimeError(f"Unexpected error finding next min dist at {d}")
-                pass
-
-        if np.isinf(min_dist):
+        if i < 0:
+            if (x, y) == self._distancemap_goal:
+                return None
             raise RuntimeError("no minimum found, shouldn't happen")
 
-        x = x + min_dir[1]
-        y = y + min_dir[0]
-
-        next = np.r_[x, y]
+        next = np.r_[np.unravel_index(i, shape)][::-1]
         if all(next == self._goal):
             return None
         else:
@@ -253,8 +345,12 @@ def distancexform(occgrid, goal, metric="cityblock", animate=False, summary=Fals
     :return: Distance transform matrix
     :rtype: NumPy ndarray
 
-    Implements the grass/brush fire algorithm to compute, for every reachable
-    cell in the occupancy grid, its distance from the goal.
+    Computes, for every reachable cell in the occupancy grid, its distance
+    from the goal.  The cells are the vertices of a graph with edges between
+    4-way (cityblock metric) or 8-way (Euclidean metric) adjacent free cells,
+    and the distances are found in a single pass of Dijkstra's algorithm.  If
+    ``animate`` is True the grass/brush fire algorithm is used instead, which
+    iteratively propagates distance from the goal over the whole grid.
 
     The result is an array, the same size as the occupancy grid ``occgrid``,
     where each cell contains the distance to the goal according to the chosen
@@ -276,6 +372,12 @@ def distancexform(occgrid, goal, metric="cityblock", animate=False, summary=Fals
 
     goal = base.getvector(goal, 2, dtype=int)
 
+    if not animate:
+        distance = _distancexform_dijkstra(occgrid, goal, metric)
+        if summary:
+            print(f"{np.isinf(distance).sum():d} unreachable cells")
+        return distance
+
     distance = occgrid.astype(np.float32)
     distance[occgrid > 0] = np.nan  # assign nan to obstacle cells
     distance[occgrid == 0] = np.inf  # assign inf to other cells
@@ -344,6 +446,122 @@ def distancexform(occgrid, goal, metric="cityblock", animate=False, summary=Fals
     return distance
 
 
+def nextcell(distance):
+    """
+    Next cell map for path following
+
+    :param distance: distance transform matrix
+    :type distance: ndarray(h,w)
+    :return: flat index of the next cell on the path from every cell
+    :rtype: ndarray(h,w)
+
+    For every cell, find the index into the flattened ``distance`` array of the
+    8-way neighbouring cell with the least distance, if that is less than the
+    distance of the cell itself.  Otherwise, for the goal, obstacles (``nan``)
+    and unreachable cells (``inf``), the index is -1.
+    """
+    nr, nc = distance.shape
+    d = np.where(np.isnan(distance), np.inf, distance)
+    H = np.pad(d, 1, "constant", constant_values=np.inf)
+    cells = np.arange(nr * nc).reshape((nr, nc))
+
+    best = d.copy()
+    next = np.full((nr, nc), -1, dtype=int)
+    # ties are broken by the order of the neighbours
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            if dx == 0 and dy == 0:
+                continue
+            v = H[1 + dy : nr + 1 + dy, 1 + dx : nc + 1 + dx]
+            k = v < best
+            best[k] = v[k]
+            next[k] = cells[k] + dy * nc + dx
+    next[np.isinf(d)] = -1
+    return next
+
+
+def followpath(next, start, goal):
+    """
+    Follow paths through a next cell map
+
+    :param next: flat index of the next cell on the path from every cell
+    :type next: ndarray(h,w)
+    :param start: start positions :math:`(x, y)`, one per row
+    :type start: ndarray(N,2)
+    :param goal: goal position :math:`(x, y)`
+    :type goal: array_like(2)
+    :raises RuntimeError: the goal cannot be reached from a start
+    :return: path from each start to the goal, one point :math:`(x, y)` per row
+    :rtype: list of ndarray(M,2)
+
+    The paths are followed together, one step for all of them at a time.
+
+    :seealso: :func:`nextcell`
+    """
+    nr, nc = next.shape
+    next = next.ravel()
+    goal = int(goal[1]) * nc + int(goal[0])
+    start = np.array(start, dtype=int).reshape((-1, 2))
+    cells = start[:, 1] * nc + start[:, 0]
+
+    steps = [cells]
+    active = cells != goal
+    while active.any():
+        cells = cells.copy()
+        cells[active] = next[cells[active]]
+        if (cells < 0).any():
+            raise RuntimeError("goal cannot be reached from start")
+        steps.append(cells)
+        active = cells != goal
+
+    steps = np.array(steps)
+    paths = []
+    for k in range(steps.shape[1]):
+        path = steps[: np.argmax(steps[:, k] == goal) + 1, k]
+        paths.append(np.column_stack((path % nc, path // nc)))
+    return paths
+
+
+def _distancexform_dijkstra(occgrid, goal, metric):
+    # distance transform by Dijkstra search over the graph of adjacent free
+    # cells, the goal is treated as free
+    nr, nc = occgrid.shape
+    free = occgrid == 0
+    free[goal[1], goal[0]] = True
+    cells = np.arange(nr * nc).reshape((nr, nc))
+
+    # pairs of adjacent cells and the distance between them
+    pairs = [
+        (cells[:, :-1], cells[:, 1:], 1.0),
+        (cells[:-1, :], cells[1:, :], 1.0),
+    ]
+    if metric.lower() == "euclidean":
+        r2 = np.sqrt(2)
+        pairs += [
+            (cells[:-1, :-1], cells[1:, 1:], r2),
+            (cells[:-1, 1:], cells[1:, :-1], r2),
+        ]
+    elif metric.lower() not in ("manhattan", "cityblock"):
+        raise ValueError("unknown metric")
+
+    i, j, d = [], [], []
+    for a, b, dist in pairs:
+        k = free.ravel()[a.ravel()] & free.ravel()[b.ravel()]
+        i.append(a.ravel()[k])
+        j.append(b.ravel()[k])
+        d.append(np.full(k.sum(), dist))
+    graph = coo_matrix(
+        (np.concatenate(d), (np.concatenate(i), np.concatenate(j))),
+        shape=(nr * nc, nr * nc),
+    ).tocsr()
+
+    distance = dijkstra(graph, directed=False, indices=goal[1] * nc + goal[0])
+    distance = distance.reshape((nr, nc)).astype(np.float32)
+    distance[occgrid > 0] = np.nan
+    distance[goal[1], goal[0]] = 0
+    return distance
+
+
 def grassfire_step(G, D):
 
     # pad with inf
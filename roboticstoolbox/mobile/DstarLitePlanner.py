@@ -0,0 +1,534 @@
+"""
+D* Lite incremental grid planner
+
+See S. Koenig and M. Likhachev, "D* Lite", AAAI 2002.
+"""
+
+import math
+import time
+from collections import namedtuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from roboticstoolbox.mobile.PlannerBase import PlannerBase
+from roboticstoolbox.mobile.OccGrid import OccupancyGrid
+
+
+class _IndexedHeap:
+    def __init__(self, n):
+        # binary min-heap of (k1, k2, vertex) tuples with an index from vertex
+        # to heap position, -1 if the vertex is not in the heap
+        self._heap = []
+        self._pos = np.full(n, -1, dtype=np.intp)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, v):
+        return self._pos[v] >= 0
+
+    def top(self):
+        return self._heap[0]
+
+    def push(self, v, key):
+        # insert the vertex, or change its key if already present
+        entry = (key[0], key[1], v)
+        i = self._pos[v]
+        if i < 0:
+            self._heap.append(entry)
+            self._up(len(self._heap) - 1)
+        else:
+            old = self._heap[i]
+            self._heap[i] = entry
+            if entry < old:
+                self._up(i)
+            else:
+                self._down(i)
+
+    def remove(self, v):
+        i = self._pos[v]
+        if i < 0:
+            return
+        self._pos[v] = -1
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._up(i)
+            self._down(self._pos[last[2]])
+
+    def rebuild(self, keyfunc):
+        # recompute every key, used when the heuristic changes
+        self._heap = [(*keyfunc(e[2]), e[2]) for e in self._heap]
+        self._heap.sort()
+        for i, e in enumerate(self._heap):
+            self._pos[e[2]] = i
+
+    def _up(self, i):
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if entry < heap[parent]:
+                heap[i] = heap[parent]
+                pos[heap[i][2]] = i
+                i = parent
+            else:
+                break
+        heap[i] = entry
+        pos[entry[2]] = i
+
+    def _down(self, i):
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1] < heap[child]:
+                child += 1
+            if heap[child] < entry:
+                heap[i] = heap[child]
+                pos[heap[i][2]] = i
+                i = child
+            else:
+                break
+        heap[i] = entry
+        pos[entry[2]] = i
+
+
+class DstarLitePlanner(PlannerBase):
+    r"""
+    D* Lite path planner
+
+    :param costmap: traversability costmap
+    :type costmap: OccGrid or ndarray(h,w)
+    :param kwargs: common planner options, see :class:`PlannerBase`
+
+    ==================   ========================
+    Feature              Capability
+    ==================   ========================
+    Plan                 :math:`\mathbb{R}^2`, discrete
+    Obstacle avoidance   Yes, occupancy grid
+    Curvature            Discontinuous
+    Motion               Omnidirectional
+    ==================   ========================
+
+    Creates a planner that finds the minimum-cost path between two points in
+    the plane using omnidirectional motion, and efficiently replans when the
+    costmap changes.  The path comprises a set of 8-way connected points in
+    adjacent cells.  The costmap and path costs are the same as for
+    :class:`DstarPlanner`: the cost of moving between adjacent cells is the
+    mean of their costs, multiplied by :math:`\sqrt{2}` for a diagonal move.
+    An infinite cost indicates an untraversable cell or obstacle.
+
+    The planner state is held in flat arrays over the cells of the grid,
+    padded with a border of obstacle cells so that the 8 neighbours of any
+    cell are at fixed index offsets.  The initial plan computes the cost to
+    the goal from every cell using Dijkstra's algorithm over the grid graph.
+    Subsequent changes to the costmap, by :meth:`modify_cost` or by a sensor
+    during :meth:`query`, are repaired by D* Lite which uses an indexed
+    priority queue and an octile distance heuristic to expand only the cells
+    whose cost to the goal affects the robot's current position.
+
+    Example:
+
+    .. runblock:: pycon
+
+        >>> from roboticstoolbox import DstarLitePlanner
+        >>> import numpy as np
+        >>> costmap = np.ones((6, 6));
+        >>> costmap[2:5, 3:5] = 10
+        >>> ds = DstarLitePlanner(costmap, goal=(1, 1));
+        >>> ds.plan()
+        >>> path, status = ds.query(start=(5, 4))
+        >>> print(path.T)
+        >>> print(status)
+
+    :seealso: :class:`DstarPlanner` :class:`PlannerBase`
+    """
+
+    def __init__(self, costmap=None, **kwargs):
+        super().__init__(ndims=2, **kwargs)
+
+        if isinstance(costmap, np.ndarray):
+            pass
+        elif isinstance(costmap, OccupancyGrid):
+            costmap = costmap.grid
+        elif self.occgrid is not None:
+            costmap = np.where(self.occgrid.grid > 0, np.inf, 1)
+        else:
+            raise ValueError("unknown type of map")
+
+        nr, nc = costmap.shape
+        self._width = nc + 2
+        cost = np.full((nr + 2, nc + 2), np.inf)
+        cost[1:-1, 1:-1] = costmap
+        self._cost = cost.ravel()
+
+        # flat index offset and distance for each of the 8 neighbours
+        root2 = math.sqrt(2)
+        self._neighbours = [
+            (dy * self._width + dx, root2 if dx and dy else 1.0)
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            if dx or dy
+        ]
+
+        self._g = None
+        self._rhs = None
+        self._queue = None
+        self._nexpand = 0
+        self._replans = []
+
+    @property
+    def costmap(self):
+        """
+        Get the costmap
+
+        :return: cost of traversing each cell
+        :rtype: ndarray(h,w)
+
+        The array is a view of the planner's costmap, use :meth:`modify_cost`
+        to change it.
+        """
+        return self._cost.reshape((-1, self._width))[1:-1, 1:-1]
+
+    @property
+    def distancemap(self):
+        """
+        Get the cost to goal map
+
+        :return: cost to goal from every cell
+        :rtype: ndarray(h,w)
+
+        Elements are infinite for cells from which the goal cannot be reached.
+        After replanning, only the costs of the cells on the robot's path are
+        guaranteed to be correct.
+        """
+        if self._g is None:
+            return None
+        return self._g.reshape((-1, self._width))[1:-1, 1:-1].copy()
+
+    @property
+    def nexpand(self):
+        """
+        Number of node expansions
+
+        :return: number of expansions
+        :rtype: int
+
+        This number will increase during initial planning, where every
+        reachable cell is expanded once, and also if replanning is invoked
+        by :meth:`query`.
+        """
+        return self._nexpand
+
+    @property
+    def metrics(self):
+        """
+        Planner performance metrics
+
+        :return: expansion count and replanning statistics
+        :rtype: namedtuple
+
+        The returned value has elements:
+
+        ===============  ===================================================
+        Element          Description
+        ===============  ===================================================
+        ``nexpand``      total number of node expansions
+        ``nreplan``      number of incremental replans
+        ``expansions``   node expansions for each replan, ndarray(nreplan)
+        ``latency``      time in seconds for each replan, ndarray(nreplan)
+        ===============  ===================================================
+        """
+        replans = np.array(self._replans, dtype=float).reshape((-1, 2))
+        return namedtuple(
+            "DstarLiteMetrics", ["nexpand", "nreplan", "expansions", "latency"]
+        )(self._nexpand, len(self._replans), replans[:, 0].astype(int), replans[:, 1])
+
+    def _index(self, p):
+        # flat index of the cell containing the point p
+        return int(p[1] + 1) * self._width + int(p[0] + 1)
+
+    def _xy(self, s):
+        y, x = divmod(s, self._width)
+        return (x - 1, y - 1)
+
+    def _c(self, s, t, d):
+        # cost of the move between adjacent cells s and t a distance d apart
+        return (self._cost[s] + self._cost[t]) / 2 * d
+
+    def _h(self, s, t):
+        # octile distance heuristic scaled by the minimum cell cost
+        if s is None:
+            return 0.0
+        sy, sx = divmod(s, self._width)
+        ty, tx = divmod(t, self._width)
+        dx = abs(sx - tx)
+        dy = abs(sy - ty)
+        return self._hscale * (max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy))
+
+    def _key(self, s):
+        m = min(self._g[s], self._rhs[s])
+        return (m + self._h(self._slast, s) + self._km, m)
+
+    def _rhs_min(self, s):
+        # one-step lookahead cost of the cell
+        if self._cost[s] == np.inf:
+            return np.inf
+        g = self._g
+        return min(self._c(s, s + o, d) + g[s + o] for o, d in self._neighbours)
+
+    def _update(self, s):
+        # place an inconsistent cell on the open list
+        if self._g[s] != self._rhs[s]:
+            self._queue.push(s, self._key(s))
+        else:
+            self._queue.remove(s)
+
+    def plan(self, goal=None):
+        r"""
+        Plan D* Lite path
+
+        :param goal: goal position :math:`(x, y)`, defaults to previously set value
+        :type goal: array_like(2), optional
+
+        Compute the minimum-cost obstacle-free distance to the goal from all
+        points in the grid.
+        """
+        if goal is not None:
+            self.goal = goal
+
+        if self._goal is None:
+            raise ValueError("No goal specified here or in constructor")
+
+        self._goal = self._goal.astype(int)
+
+        # Dijkstra's algorithm over the graph of 8-way connected cells
+        costmap = self.costmap
+        nr, nc = costmap.shape
+        cells = np.arange(nr * nc).reshape((nr, nc))
+        c = costmap.ravel()
+        edges = []
+        for a, b, d in [
+            (cells[:, :-1], cells[:, 1:], 1.0),
+            (cells[:-1, :], cells[1:, :], 1.0),
+            (cells[:-1, :-1], cells[1:, 1:], math.sqrt(2)),
+            (cells[:-1, 1:], cells[1:, :-1], math.sqrt(2)),
+        ]:
+            a = a.ravel()
+            b = b.ravel()
+            w = (c[a] + c[b]) / 2 * d
+            k = np.isfinite(w)
+            edges.append((a[k], b[k], w[k]))
+        a, b, w = [np.concatenate(e) for e in zip(*edges)]
+        graph = coo_matrix((w, (a, b)), shape=(nr * nc, nr * nc)).tocsr()
+
+        goal = self._goal[1] * nc + self._goal[0]
+        dist = dijkstra(graph, directed=False, indices=goal)
+
+        g = np.full((nr + 2, nc + 2), np.inf)
+        g[1:-1, 1:-1] = dist.reshape((nr, nc))
+        self._g = g.ravel()
+        self._rhs = self._g.copy()
+        self._sgoal = self._index(self._goal)
+        self._queue = _IndexedHeap(len(self._g))
+        self._slast = None
+        self._km = 0.0
+        finite = c[np.isfinite(c)]
+        self._hscale = max(finite.min(), 0) if len(finite) > 0 else 0
+
+        self._nexpand = int(np.isfinite(dist).sum())
+        self._replans = []
+
+    def modify_cost(self, p, cost):
+        r"""
+        Change the cost of cells
+
+        :param p: cell coordinate :math:`(x, y)`, or one per row
+        :type p: array_like(2) or ndarray(N,2)
+        :param cost: new cost of the cells
+        :type cost: float or array_like(N)
+
+        The costs of the cells are changed and the affected cells are placed
+        on the open list.  The plan is repaired by the next :meth:`query`.
+        """
+        if self._g is None:
+            raise RuntimeError("no plan, call plan() first")
+
+        p = np.array(p, dtype=int).reshape((-1, 2))
+        cost = np.broadcast_to(np.array(cost, dtype=float), (p.shape[0],))
+
+        nr, nc = self.costmap.shape
+        g, rhs = self._g, self._rhs
+        for (x, y), cnew in zip(p, cost):
+            if not (0 <= x < nc and 0 <= y < nr):
+                raise ValueError(f"cell ({x}, {y}) is outside the costmap")
+            s = self._index((x, y))
+            cold = self._cost[s]
+            if cnew == cold:
+                continue
+            self._cost[s] = cnew
+
+            if cnew < self._hscale:
+                # keep the heuristic admissible
+                self._hscale = cnew
+                self._queue.rebuild(self._key)
+
+            # the costs of the 8 edges incident on the cell change
+            for o, d in self._neighbours:
+                t = s + o
+                eold = (cold + self._cost[t]) / 2 * d
+                enew = (cnew + self._cost[t]) / 2 * d
+                if eold == enew:
+                    continue
+                for u, v in ((s, t), (t, s)):
+                    if u == self._sgoal:
+                        continue
+                    if eold > enew:
+                        rhs[u] = min(rhs[u], enew + g[v])
+                    elif rhs[u] == eold + g[v]:
+                        rhs[u] = self._rhs_min(u)
+
+            for u in [s] + [s + o for o, _ in self._neighbours]:
+                self._update(u)
+
+    def _replan(self, sstart):
+        # D* Lite compute shortest path, repair the costs of the open cells
+        # until the cost of the start cell is correct
+        g, rhs = self._g, self._rhs
+        queue = self._queue
+        sgoal = self._sgoal
+        nexpand = 0
+        t0 = time.perf_counter()
+
+        while len(queue) > 0:
+            top = queue.top()
+            kold = top[:2]
+            if kold >= self._key(sstart) and rhs[sstart] == g[sstart]:
+                break
+            u = top[2]
+            knew = self._key(u)
+            if kold < knew:
+                queue.push(u, knew)
+                continue
+
+            nexpand += 1
+            if g[u] > rhs[u]:
+                # lower state, the cost decreases
+                g[u] = rhs[u]
+                queue.remove(u)
+                for o, d in self._neighbours:
+                    s = u + o
+                    if s != sgoal:
+                        rhs[s] = min(rhs[s], self._c(s, u, d) + g[u])
+                    self._update(s)
+            else:
+                # raise state, the cost increases
+                gold = g[u]
+                g[u] = np.inf
+                for o, d in self._neighbours:
+                    s = u + o
+                    if s != sgoal and rhs[s] == self._c(s, u, d) + gold:
+                        rhs[s] = self._rhs_min(s)
+                    self._update(s)
+                if u != sgoal:
+                    rhs[u] = self._rhs_min(u)
+                self._update(u)
+
+        self._nexpand += nexpand
+        self._replans.append((nexpand, time.perf_counter() - t0))
+
+    def _next(self, s):
+        # the neighbouring cell on the minimum cost path to the goal
+        g = self._g
+        best, cbest, tbest = np.inf, None, None
+        for o, d in self._neighbours:
+            t = s + o
+            c = self._c(s, t, d)
+            if c + g[t] < best:
+                best, cbest, tbest = c + g[t], c, t
+        return tbest, cbest
+
+    def query(self, start, sensor=None, animate=False):
+        """
+        Find path with replanning
+
+        :param start: start position :math:`(x,y)`
+        :type start: array_like(2)
+        :param sensor: sensor function, defaults to None
+        :type sensor: callable, optional
+        :raises RuntimeError: there is no path to the goal
+        :return: path from start to goal, one point :math:`(x, y)` per row, and status
+        :rtype: ndarray(N,2), namedtuple
+
+        If ``sensor`` is None then the plan determined by the ``plan`` phase,
+        and any changes made by :meth:`modify_cost`, is used.
+
+        If ``sensor`` is not None it must be callable, and is called at each
+        step of the path with the current robot coordinates:
+
+            sensor((x, y))
+
+        and mimics the behaviour of a simple sensor onboard the robot which can
+        dynamically change the costmap. The function returns a list (0 or
+        more) of 3-tuples (x, y, newcost) which are the coordinates of cells
+        and their cost.  If the cost has changed this will trigger D* Lite
+        incremental replanning.  The number of expansions and the time taken
+        for each replan are given by :meth:`metrics`.
+
+        The returned status value has elements:
+
+        ===========  =====================================================
+        Element      Description
+        ===========  =====================================================
+        ``cost``     cost of the path followed, using the costmap at the
+                     time each move was made
+        ===========  =====================================================
+
+        :seealso: :meth:`plan` :meth:`modify_cost` :meth:`metrics`
+        """
+        if self._g is None:
+            raise RuntimeError("no plan, call plan() first")
+        if sensor is not None and not callable(sensor):
+            raise ValueError("sensor must be callable")
+
+        self.start = start
+        s = self._index(self._start.astype(int))
+
+        def replan(s):
+            if self._slast is not None:
+                self._km += self._h(self._slast, s)
+            self._slast = s
+            self._replan(s)
+
+        if len(self._queue) > 0:
+            # apply changes made by modify_cost
+            replan(s)
+
+        path = []
+        cost = 0
+        while True:
+            path.append(self._xy(s))
+            if s == self._sgoal:
+                break
+
+            if sensor is not None:
+                changes = sensor(path[-1])
+                if changes:
+                    for x, y, newcost in changes:
+                        self.modify_cost((x, y), newcost)
+                    replan(s)
+
+            if self._g[s] == np.inf:
+                raise RuntimeError("no path to goal")
+            s, c = self._next(s)
+            cost += c
+
+        status = namedtuple("DstarLiteStatus", ["cost"])
+
+        return np.array(path), status(cost)
@@ -9,6 +9,7 @@
 
 import math
 from collections import namedtuple
+from functools import lru_cache
 from roboticstoolbox.mobile import PlannerBase
 
 import matplotlib.pyplot as plt
@@ -17,155 +18,159 @@ from spatialmath import *
 from spatialmath import base
 
 
+def _wrap_0_2pi(theta):
+    # as base.wrap_0_2pi but for scalars or arrays of any shape
+    return theta - 2.0 * math.pi * np.floor(theta / 2.0 / np.pi)
+
+
+def _mask(infeasible, t, p, q):
+    # set lengths of infeasible paths to nan
+    return tuple(np.where(infeasible, np.nan, x) for x in (t, p, q))
+
+
+# The path words are evaluated for scalar or array arguments.  Lengths of
+# infeasible paths are nan.
+
+
 def left_straight_left(alpha, beta, d):
-    sa = math.sin(alpha)
-    sb = math.sin(beta)
-    ca = math.cos(alpha)
-    cb = math.cos(beta)
-    c_ab = math.cos(alpha - beta)
+    sa = np.sin(alpha)
+    sb = np.sin(beta)
+    ca = np.cos(alpha)
+    cb = np.cos(beta)
+    c_ab = np.cos(alpha - beta)
 
     tmp0 = d + sa - sb
 
     mode = ["L", "S", "L"]
     p_squared = 2 + (d * d) - (2 * c_ab) + (2 * d * (sa - sb))
-    if p_squared < 0:
-        return None, None, None, mode
-    tmp1 = math.atan2((cb - ca), tmp0)
-    t = base.wrap_0_2pi(-alpha + tmp1)
-    p = math.sqrt(p_squared)
-    q = base.wrap_0_2pi(beta - tmp1)
+    tmp1 = np.arctan2((cb - ca), tmp0)
+    t = _wrap_0_2pi(-alpha + tmp1)
+    p = np.sqrt(np.maximum(p_squared, 0))
+    q = _wrap_0_2pi(beta - tmp1)
 
-    return t, p, q, mode
+    return _mask(p_squared < 0, t, p, q) + (mode,)
 
 
 def right_straight_right(alpha, beta, d):
-    sa = math.sin(alpha)
-    sb = math.sin(beta)
-    ca = math.cos(alpha)
-    cb = math.cos(beta)
-    c_ab = math.cos(alpha - beta)
+    sa = np.sin(alpha)
+    sb = np.sin(beta)
+    ca = np.cos(alpha)
+    cb = np.cos(beta)
+    c_ab = np.cos(alpha - beta)
 
     tmp0 = d - sa + sb
     mode = ["R", "S", "R"]
     p_squared = 2 + (d * d) - (2 * c_ab) + (2 * d * (sb - sa))
-    if p_squared < 0:
-        return None, None, None, mode
-    tmp1 = math.atan2((ca - cb), tmp0)
-    t = base.wrap_0_2pi(alpha - tmp1)
-    p = math.sqrt(p_squared)
-    q = base.wrap_0_2pi(-beta + tmp1)
+    tmp1 = np.arctan2((ca - cb), tmp0)
+    t = _wrap_0_2pi(alpha - tmp1)
+    p = np.sqrt(np.maximum(p_squared, 0))
+    q = _wrap_0_2pi(-beta + tmp1)
 
-    return t, p, q, mode
+    return _mask(p_squared < 0, t, p, q) + (mode,)
 
 
 def left_straight_right(alpha, beta, d):
-    sa = math.sin(alpha)
-    sb = math.sin(beta)
-    ca = math.cos(alpha)
-    cb = math.cos(beta)
-    c_ab = math.cos(alpha - beta)
+    sa = np.sin(alpha)
+    sb = np.sin(beta)
+    ca = np.cos(alpha)
+    cb = np.cos(beta)
+    c_ab = np.cos(alpha - beta)
 
     p_squared = -2 + (d * d) + (2 * c_ab) + (2 * d * (sa + sb))
     mode = ["L", "S", "R"]
-    if p_squared < 0:
-        return None, None, None, mode
-    p = math.sqrt(p_squared)
-    tmp2 = math.atan2((-ca - cb), (d + sa + sb)) - math.atan2(-2.0, p)
-    t = base.wrap_0_2pi(-alpha + tmp2)
-    q = base.wrap_0_2pi(-base.wrap_0_2pi(beta) + tmp2)
+    p = np.sqrt(np.maximum(p_squared, 0))
+    tmp2 = np.arctan2((-ca - cb), (d + sa + sb)) - np.arctan2(-2.0, p)
+    t = _wrap_0_2pi(-alpha + tmp2)
+    q = _wrap_0_2pi(-_wrap_0_2pi(beta) + tmp2)
 
-    return t, p, q, mode
+    return _mask(p_squared < 0, t, p, q) + (mode,)
 
 
 def right_straight_left(alpha, beta, d):
-    sa = math.sin(alpha)
-    sb = math.sin(beta)
-    ca = math.cos(alpha)
-    cb = math.cos(beta)
-    c_ab = math.cos(alpha - beta)
+    sa = np.sin(alpha)
+    sb = np.sin(beta)
+    ca = np.cos(alpha)
+    cb = np.cos(beta)
+    c_ab = np.cos(alpha - beta)
 
     p_squared = (d * d) - 2 + (2 * c_ab) - (2 * d * (sa + sb))
     mode = ["R", "S", "L"]
-    if p_squared < 0:
-        return None, None, None, mode
-    p = math.sqrt(p_squared)
-    tmp2 = math.atan2((ca + cb), (d - sa - sb)) - math.atan2(2.0, p)
-    t = base.wrap_0_2pi(alpha - tmp2)
-    q = base.wrap_0_2pi(beta - tmp2)
+    p = np.sqrt(np.maximum(p_squared, 0))
+    tmp2 = np.arctan2((ca + cb), (d - sa - sb)) - np.arctan2(2.0, p)
+    t = _wrap_0_2pi(alpha - tmp2)
+    q = _wrap_0_2pi(beta - tmp2)
 
-    return t, p, q, mode
+    return _mask(p_squared < 0, t, p, q) + (mode,)
 
 
 def right_left_right(alpha, beta, d):
-    sa = math.sin(alpha)
-    sb = math.sin(beta)
-    ca = math.cos(alpha)
-    cb = math.cos(beta)
-    c_ab = math.cos(alpha - beta)
+    sa = np.sin(alpha)
+    sb = np.sin(beta)
+    ca = np.cos(alpha)
+    cb = np.cos(beta)
+    c_ab = np.cos(alpha - beta)
 
     mode = ["R", "L", "R"]
     tmp_rlr = (6.0 - d * d + 2.0 * c_ab + 2.0 * d * (sa - sb)) / 8.0
-    if abs(tmp_rlr) > 1.0:
-        return None, None, None, mode
 
-    p = base.wrap_0_2pi(2 * math.pi - math.acos(tmp_rlr))
-    t = base.wrap_0_2pi(
-        alpha - math.atan2(ca - cb, d - sa + sb) + base.wrap_0_2pi(p / 2.0)
-    )
-    q = base.wrap_0_2pi(alpha - beta - t + base.wrap_0_2pi(p))
-    return t, p, q, mode
+    p = _wrap_0_2pi(2 * math.pi - np.arccos(np.clip(tmp_rlr, -1, 1)))
+    t = _wrap_0_2pi(alpha - np.arctan2(ca - cb, d - sa + sb) + _wrap_0_2pi(p / 2.0))
+    q = _wrap_0_2pi(alpha - beta - t + _wrap_0_2pi(p))
+    return _mask(np.abs(tmp_rlr) > 1.0, t, p, q) + (mode,)
 
 
 def left_right_left(alpha, beta, d):
-    sa = math.sin(alpha)
-    sb = math.sin(beta)
-    ca = math.cos(alpha)
-    cb = math.cos(beta)
-    c_ab = math.cos(alpha - beta)
+    sa = np.sin(alpha)
+    sb = np.sin(beta)
+    ca = np.cos(alpha)
+    cb = np.cos(beta)
+    c_ab = np.cos(alpha - beta)
 
     mode = ["L", "R", "L"]
     tmp_lrl = (6.0 - d * d + 2.0 * c_ab + 2.0 * d * (-sa + sb)) / 8.0
-    if abs(tmp_lrl) > 1:
-        return None, None, None, mode
-    p = base.wrap_0_2pi(2 * math.pi - math.acos(tmp_lrl))
-    t = base.wrap_0_2pi(-alpha - math.atan2(ca - cb, d + sa - sb) + p / 2.0)
-    q = base.wrap_0_2pi(base.wrap_0_2pi(beta) - alpha - t + base.wrap_0_2pi(p))
+    p = _wrap_0_2pi(2 * math.pi - np.arccos(np.clip(tmp_lrl, -1, 1)))
+    t = _wrap_0_2pi(-alpha - np.arctan2(ca - cb, d + sa - sb) + p / 2.0)
+    q = _wrap_0_2pi(_wrap_0_2pi(beta) - alpha - t + _wrap_0_2pi(p))
 
-    return t, p, q, mode
+    return _mask(np.abs(tmp_lrl) > 1, t, p, q) + (mode,)
 
 
-def dubins_path_planning_from_origin(end_x, end_y, end_yaw, curvature, step_size):
-    dx = end_x
-    dy = end_y
-    D = math.hypot(dx, dy)
+_planners = [
+    left_straight_left,
+    right_straight_right,
+    left_straight_right,
+    right_straight_left,
+    right_left_right,
+    left_right_left,
+]
+
+
+def _words(end_x, end_y, end_yaw, curvature):
+    # normalized segment lengths, ndarray(6,3,...), and total normalized
+    # length, ndarray(6,...), of each path word from the origin to the
+    # configurations (end_x, end_y, end_yaw) which are scalars or arrays,
+    # and the mode of each path word
+    D = np.hypot(end_x, end_y)
     d = D * curvature
 
-    theta = base.wrap_0_2pi(math.atan2(dy, dx))
-    alpha = base.wrap_0_2pi(-theta)
-    beta = base.wrap_0_2pi(end_yaw - theta)
-
-    planners = [
-        left_straight_left,
-        right_straight_right,
-        left_straight_right,
-        right_straight_left,
-        right_left_right,
-        left_right_left,
-    ]
-
-    best_cost = float("inf")
-    bt, bp, bq, best_mode = None, None, None, None
-
-    for planner in planners:
-        t, p, q, mode = planner(alpha, beta, d)
-        if t is None:
-            continue
-
-        cost = abs(t) + abs(p) + abs(q)
-        if best_cost > cost:
-            bt, bp, bq, best_mode = t, p, q, mode
-            best_cost = cost
-    lengths = [bt, bp, bq]
+    theta = _wrap_0_2pi(np.arctan2(end_y, end_x))
+    alpha = _wrap_0_2pi(-theta)
+    beta = _wrap_0_2pi(end_yaw - theta)
+
+    words = [planner(alpha, beta, d) for planner in _planners]
+    lengths = np.array([word[:3] for word in words])
+    cost = np.abs(lengths[:, 0]) + np.abs(lengths[:, 1]) + np.abs(lengths[:, 2])
+    cost[np.isnan(cost)] = np.inf
+
+    return lengths, cost, [word[3] for word in words]
+
+
+def dubins_path_planning_from_origin(end_x, end_y, end_yaw, curvature, step_size):
+    tpq, cost, modes = _words(end_x, end_y, end_yaw, curvature)
+    best = np.argmin(cost)
+    best_mode = modes[best]
+    best_cost = cost[best]
+    lengths = [float(length) for length in tpq[best]]
 
     x_list, y_list, yaw_list, directions = generate_local_course(
         sum(lengths), lengths, best_mode, curvature, step_size
@@ -174,6 +179,36 @@ def dubins_path_planning_from_origin(end_x, end_y, end_yaw, curvature, step_size
     return x_list, y_list, yaw_list, best_mode, best_cost, lengths
 
 
+def path_length(start, goal, curvature):
+    r"""
+    Length of Dubins paths
+
+    :param start: start configurations :math:`(x, y, \theta)`
+    :type start: array_like(3) or ndarray(N,3)
+    :param goal: goal configurations :math:`(x, y, \theta)`
+    :type goal: array_like(3) or ndarray(N,3)
+    :param curvature: maximum path curvature
+    :type curvature: float
+    :return: length of the shortest path between each start and goal
+    :rtype: ndarray(N)
+
+    The lengths are computed for all pairs of configurations at once, without
+    computing points along the paths.  Either argument can be a single
+    configuration which is paired with every configuration of the other.
+    """
+    start = np.atleast_2d(start)
+    goal = np.atleast_2d(goal)
+
+    dx = goal[:, 0] - start[:, 0]
+    dy = goal[:, 1] - start[:, 1]
+    c = np.cos(start[:, 2])
+    s = np.sin(start[:, 2])
+    _, cost, _ = _words(
+        c * dx + s * dy, -s * dx + c * dy, goal[:, 2] - start[:, 2], curvature
+    )
+    return cost.min(axis=0) / curvature
+
+
 def interpolate(
     ind,
     length,
@@ -187,17 +222,18 @@ def interpolate(
     path_yaw,
     directions,
 ):
+    # ind and length can be arrays, to set several points on the same segment
     if mode == "S":
         path_x[ind] = origin_x + length / max_curvature * math.cos(origin_yaw)
         path_y[ind] = origin_y + length / max_curvature * math.sin(origin_yaw)
         path_yaw[ind] = origin_yaw
     else:  # curve
-        ldx = math.sin(length) / max_curvature
+        ldx = np.sin(length) / max_curvature
         ldy = 0.0
         if mode == "L":  # left turn
-            ldy = (1.0 - math.cos(length)) / max_curvature
+            ldy = (1.0 - np.cos(length)) / max_curvature
         elif mode == "R":  # right turn
-            ldy = (1.0 - math.cos(length)) / -max_curvature
+            ldy = (1.0 - np.cos(length)) / -max_curvature
         gdx = math.cos(-origin_yaw) * ldx + math.sin(-origin_yaw) * ldy
         gdy = -math.sin(-origin_yaw) * ldx + math.cos(-origin_yaw) * ldy
         path_x[ind] = origin_x + gdx
@@ -208,10 +244,7 @@ def interpolate(
     elif mode == "R":  # right turn
         path_yaw[ind] = origin_yaw - length
 
-    if length > 0.0:
-        directions[ind] = 1
-    else:
-        directions[ind] = -1
+    directions[ind] = np.where(length > 0.0, 1, -1)
 
     return path_x, path_y, path_yaw, directions
 
@@ -219,10 +252,12 @@ def interpolate(
 def generate_local_course(total_length, lengths, mode, max_curvature, step_size):
     n_point = math.trunc(total_length / step_size) + len(lengths) + 4
 
-    path_x = [0.0 for _ in range(n_point)]
-    path_y = [0.0 for _ in range(n_point)]
-    path_yaw = [0.0 for _ in range(n_point)]
-    directions = [0.0 for _ in range(n_point)]
+    # points are written into preallocated arrays, all the points on a segment
+    # at once
+    path_x = np.zeros((n_point,))
+    path_y = np.zeros((n_point,))
+    path_yaw = np.zeros((n_point,))
+    directions = np.zeros((n_point,))
     index = 1
 
     if lengths[0] > 0.0:
@@ -247,22 +282,25 @@ def generate_local_course(total_length, lengths, mode, max_curvature, step_size)
         else:
             pd = d - ll
 
-        while abs(pd) <= abs(l):
-            index += 1
-            path_x, path_y, path_yaw, directions = interpolate(
-                index,
-                pd,
-                m,
-                max_curvature,
-                origin_x,
-                origin_y,
-                origin_yaw,
-                path_x,
-                path_y,
-                path_yaw,
-                directions,
-            )
-            pd += d
+        # distances along the segment, accumulated one step at a time, up to
+        # the first that lies beyond the end of the segment
+        pds = np.add.accumulate(np.r_[pd, np.full(int(abs(l) / step_size) + 3, d)])
+        n = np.argmax(np.abs(pds) > abs(l))
+        path_x, path_y, path_yaw, directions = interpolate(
+            np.arange(index + 1, index + n + 1),
+            pds[:n],
+            m,
+            max_curvature,
+            origin_x,
+            origin_y,
+            origin_yaw,
+            path_x,
+            path_y,
+            path_yaw,
+            directions,
+        )
+        index += n
+        pd = pds[n]
 
         ll = l - pd - d  # calc remain length
 
@@ -281,17 +319,22 @@ def generate_local_course(total_length, lengths, mode, max_curvature, step_size)
             directions,
         )
 
-    if len(path_x) <= 1:
-        return [], [], [], []
-
     # remove unused data
-    while len(path_x) >= 1 and path_x[-1] == 0.0:
-        path_x.pop()
-        path_y.pop()
-        path_yaw.pop()
-        directions.pop()
+    n = index + 1
+    while n >= 1 and path_x[n - 1] == 0.0:
+        n -= 1
+    return path_x[:n], path_y[:n], path_yaw[:n], directions[:n]
 
-    return path_x, path_y, path_yaw, directions
+
+@lru_cache(maxsize=1024)
+def _local_path(end_x, end_y, end_yaw, curvature, step_size):
+    # path from the origin, memoized for repeated relative configurations
+    lp_x, lp_y, lp_yaw, mode, length, lengths = dubins_path_planning_from_origin(
+        end_x, end_y, end_yaw, curvature, step_size
+    )
+    path = np.c_[lp_x, lp_y, lp_yaw]
+    path.flags.writeable = False
+    return path, tuple(mode), tuple(lengths)
 
 
 def path_planning(start, goal, curvature, step_size=0.1):
@@ -318,18 +361,25 @@ def path_planning(start, goal, curvature, step_size=0.1):
     le_xy = np.stack([g_x, g_y]).T @ l_rot
     le_yaw = g_yaw - s_yaw
 
-    lp_x, lp_y, lp_yaw, mode, length, lengths = dubins_path_planning_from_origin(
-        le_xy[0], le_xy[1], le_yaw, curvature, step_size
+    # goal relative to start, the path for a repeated relative configuration
+    # is found in the cache
+    lpath, mode, lengths = _local_path(
+        float(le_xy[0]),
+        float(le_xy[1]),
+        float(le_yaw),
+        curvature,
+        step_size * curvature,
     )
+    lengths = [length / curvature for length in lengths]
 
     rot = base.rot2(-s_yaw)
-    converted_xy = np.stack([lp_x, lp_y]).T @ rot
+    converted_xy = lpath[:, :2] @ rot
     x_list = converted_xy[:, 0] + s_x
     y_list = converted_xy[:, 1] + s_y
-    yaw_list = [base.wrap_mpi_pi(i_yaw + s_yaw) for i_yaw in lp_yaw]
+    yaw_list = base.wrap_mpi_pi(lpath[:, 2] + s_yaw)
 
     path = np.c_[x_list, y_list, yaw_list]
-    return path, length, mode, lengths
+    return path, sum(lengths), list(mode), lengths
 
 
 # ====================== RTB wrapper ============================= #
@@ -443,6 +493,37 @@ class DubinsPlanner(PlannerBase):
 
         return path, status(mode, sum(lengths), lengths)
 
+    def length(self, start, goal):
+        r"""
+        Length of paths between configurations
+
+        :param start: start configuration :math:`(x, y, \theta)`
+        :type start: array_like(3) or ndarray(N,3)
+        :param goal: goal configuration :math:`(x, y, \theta)`
+        :type goal: array_like(3) or ndarray(N,3)
+        :return: path length
+        :rtype: float or ndarray(N)
+
+        Returns the length of the path that :meth:`query` would find, without
+        computing the points along it.  If ``start`` and ``goal`` are arrays
+        the lengths of all the paths are computed at once, and either can be
+        a single configuration.  This is useful as a distance metric for
+        finding nearby configurations.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> from roboticstoolbox import DubinsPlanner
+            >>> from math import pi
+            >>> dubins = DubinsPlanner(curvature=1.0)
+            >>> dubins.length(start=(0, 0, pi/2), goal=[(1, 0, pi/2), (0, 2, pi/2)])
+        """
+        L = path_length(start, goal, self._curvature)
+        if np.ndim(start) == 1 and np.ndim(goal) == 1:
+            return L[0]
+        return L
+
 
 if __name__ == "__main__":
     from math import pi
@@ -0,0 +1,463 @@
+"""
+Python sparse extended information filter
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+from spatialmath import base
+from roboticstoolbox.mobile.EKF import EKF
+
+
+class EIF(EKF):
+    def __init__(
+        self,
+        robot,
+        sensor=None,
+        map=None,
+        P0=None,
+        nactive=10,
+        niter=1,
+        animate=True,
+        x0=[0, 0, 0],
+        verbose=False,
+        history=True,
+        workspace=None,
+    ):
+        r"""
+        Sparse extended information filter
+
+        :param robot: robot motion model
+        :type robot: 2-tuple
+        :param sensor: vehicle mounted sensor model, defaults to None
+        :type sensor: 2-tuple, optional
+        :param map: landmark map, defaults to None
+        :type map: :class:`LandmarkMap`, optional
+        :param P0: initial covariance matrix, defaults to None
+        :type P0: ndarray(n,n), optional
+        :param nactive: maximum number of active landmarks, defaults to 10
+        :type nactive: int, optional
+        :param niter: number of state recovery iterations per step, defaults to 1
+        :type niter: int, optional
+        :param animate: show animation of vehicle motion, defaults to True
+        :type animate: bool, optional
+        :param x0: initial state, defaults to [0, 0, 0]
+        :type x0: array_like(n), optional
+        :param verbose: display extra debug information, defaults to False
+        :type verbose: bool, optional
+        :param history: retain step-by-step history, defaults to True
+        :type history: bool, optional
+        :param workspace: dimension of workspace, see :func:`~spatialmath.base.graphics.expand_dims`
+        :type workspace: scalar, array_like(2), array_like(4)
+
+        The filter solves the same estimation problems as :class:`EKF`, and
+        takes the same ``robot`` and ``sensor`` arguments, but represents the
+        Gaussian by the information matrix :math:`\mat{\Omega} = \mat{P}^{-1}`,
+        held as a sparse matrix, and the information vector
+        :math:`\vec{\xi} = \mat{\Omega} \hat{\vec{x}}`.
+
+        - prediction changes only the rows and columns of :math:`\mat{\Omega}`
+          for the vehicle and the *active* landmarks, those linked to the
+          vehicle
+        - an observation adds information to the vehicle and landmark blocks
+          of :math:`\mat{\Omega}`
+        - a new landmark appends two rows and columns to :math:`\mat{\Omega}`
+        - the estimate of the vehicle and active landmarks is recovered by
+          ``niter`` Gauss-Seidel iterations at each step, the estimate of
+          other landmarks is updated when they next become active.  If
+          ``niter`` is None the whole state is recovered by a sparse solve
+          after each observation, see :meth:`recover`.
+
+        For SLAM, if more than ``nactive`` landmarks are linked to the vehicle
+        the least recently observed are deactivated by sparsification, an
+        approximation that keeps :math:`\mat{\Omega}` sparse.  If ``nactive``
+        and ``niter`` are None the filter is equivalent to :class:`EKF`.
+
+        Example::
+
+            V = np.diag([0.02, np.radians(0.5)]) ** 2;
+            robot = Bicycle(covar=V)
+            robot.control = RandomPath(workspace=10)
+
+            map = LandmarkMap(20, workspace=10)
+
+            W = np.diag([0.1, np.radians(1)]) ** 2
+            sensor = RangeBearingSensor(robot=robot, map=map, covar=W, angle=[-np.pi/2, np.pi/2], range=4)
+
+            P0 = np.diag([0.05, 0.05, np.radians(0.5)]) ** 2
+            eif = EIF(robot=(robot, V), P0=P0, sensor=(sensor, W))
+
+            eif.run(T=20)  # run the simulation for 20 seconds
+            eif.plot_map()
+
+        .. note:: The ``P`` element of the history is the covariance of the
+            vehicle state only, or None if the vehicle is not estimated.  The
+            ``S`` and ``K`` elements are None.  Computing the vehicle
+            covariance requires a sparse factorization at every step, for a
+            large map use ``history=False``.
+
+        :references:
+            - Simultaneous localization and mapping with sparse extended
+              information filters, S. Thrun et al., IJRR 23(7-8), 2004.
+
+        :seealso: :class:`EKF` :meth:`Omega` :meth:`xi`
+        """
+        self._nactive = nactive
+        self._niter = niter
+        super().__init__(
+            robot,
+            sensor=sensor,
+            map=map,
+            P0=P0,
+            animate=animate,
+            x0=x0,
+            verbose=verbose,
+            history=history,
+            workspace=workspace,
+        )
+
+    @property
+    def Omega(self):
+        r"""
+        Get information matrix
+
+        :return: information matrix
+        :rtype: sparse matrix(n,n)
+
+        Returns the information matrix :math:`\mat{\Omega}`, the inverse of
+        the covariance matrix, as a SciPy sparse matrix.
+        """
+        return self._Omega
+
+    @property
+    def xi(self):
+        r"""
+        Get information vector
+
+        :return: information vector
+        :rtype: ndarray(n)
+
+        Returns the information vector :math:`\vec{\xi}`.
+        """
+        return self._xi
+
+    @property
+    def P_est(self):
+        """
+        Get covariance
+
+        :return: covariance matrix
+        :rtype: ndarray(n,n)
+
+        Returns the covariance matrix by inverting the information matrix.
+
+        .. note:: The covariance matrix is dense, this is expensive for a
+            large map.
+        """
+        return np.linalg.inv(self._Omega.toarray())
+
+    @property
+    def nactive(self):
+        """
+        Maximum number of active landmarks
+
+        :return: maximum number of landmarks linked to the vehicle
+        :rtype: int or None
+        """
+        return self._nactive
+
+    def init(self):
+        super().init()
+
+        self._x_est = np.array(self._x_est, dtype=float)
+        if len(self._x_est) > 0:
+            self._Omega = sp.csr_matrix(np.linalg.inv(self._P_est))
+        else:
+            self._Omega = sp.csr_matrix((0, 0))
+        self._xi = self._Omega @ self._x_est
+        self._P_est = None
+
+        # landmarks linked to the vehicle, least recently observed first
+        self._active = {}
+
+    def recover(self):
+        r"""
+        Recover the state estimate
+
+        :return: state estimate
+        :rtype: ndarray(n)
+
+        Solves :math:`\mat{\Omega} \hat{\vec{x}} = \vec{\xi}` for the
+        whole state, using a sparse factorization of the information matrix.
+        The result is also the new value of :meth:`x_est`.
+        """
+        lu = splu(self._Omega.tocsc(), permc_spec="MMD_AT_PLUS_A")
+        self._x_est = lu.solve(self._xi)
+        self._wrap()
+        return self._x_est
+
+    def step(self, pause=None):
+        """
+        Execute one timestep of the simulation
+        """
+
+        # move the robot
+        odo = self.robot.step(pause=pause)
+        x = self._x_est
+
+        # =================================================================
+        # P R E D I C T I O N
+        # =================================================================
+        if self._est_vehicle:
+            xv_est = x[:3].copy()
+            Fx = self.robot.Fx(xv_est, odo)
+            Fv = self.robot.Fv(xv_est, odo)
+            xv_pred = self.robot.f(xv_est, odo)
+
+            self._predict(Fx, Fv @ self.V_est @ Fv.T, xv_pred - xv_est)
+        else:
+            xv_pred = self._robot.x
+
+        # =================================================================
+        # P R O C E S S    O B S E R V A T I O N S
+        # =================================================================
+        if self.sensor is not None:
+            z, lm_id = self.sensor.reading()
+        else:
+            z, lm_id = None, None
+
+        innov = None
+        observed = []  # landmarks whose information is updated
+        if z is not None:
+            if np.ndim(z) == 2:
+                # a batch of readings, the information from each is added in
+                # turn which is the same as a single stacked update
+                innov = [
+                    self._observe(xv_pred, zi, id, observed)
+                    for zi, id in zip(z, np.asarray(lm_id).tolist())
+                ]
+                innov = [v for v, id in zip(innov, lm_id) if id in observed]
+                innov = np.concatenate(innov) if innov else None
+            else:
+                innov = self._observe(xv_pred, z, lm_id, observed)
+
+            if (
+                self._est_vehicle
+                and self._nactive is not None
+                and len(self._active) > self._nactive
+            ):
+                self._sparsify()
+
+        # =================================================================
+        # R E C O V E R    T H E    S T A T E
+        # =================================================================
+        if self._niter is None:
+            if observed:
+                self.recover()
+        elif self._est_vehicle:
+            # the vehicle and active landmarks
+            self._relax(self._vehicle_links(), self._niter)
+        elif observed:
+            # the observed landmarks
+            blocks = []
+            for id in observed:
+                jx = self.landmark_index(id)
+                blocks.append(np.r_[jx : jx + 2])
+            self._relax(blocks, self._niter)
+
+        if self._keep_history:
+            Pv = None
+            if self._est_vehicle:
+                # vehicle covariance is the leading block of the inverse
+                lu = splu(self._Omega.tocsc(), permc_spec="MMD_AT_PLUS_A")
+                E = np.zeros((len(self._x_est), 3))
+                E[:3, :] = np.eye(3)
+                Pv = lu.solve(E)[:3, :]
+
+            hist = self._htuple(
+                self.robot._t,
+                self._x_est,
+                odo,
+                Pv,
+                innov,
+                None,
+                None,
+                lm_id if lm_id is not None else -1,
+                z,
+            )
+            self._history.append(hist)
+
+    def _add(self, idx, D):
+        # add the dense block D to the rows and columns idx of Omega, and
+        # keep xi consistent with the linearization point x_est
+        n = len(idx)
+        self._Omega = self._Omega + sp.csr_matrix(
+            (D.ravel(), (np.repeat(idx, n), np.tile(idx, n))),
+            shape=self._Omega.shape,
+        )
+        self._xi[idx] += D @ self._x_est[idx]
+
+    def _vehicle_links(self):
+        # state indices of the vehicle and the active landmarks, as a list
+        # of blocks
+        blocks = [np.r_[0:3]]
+        for lm_id in self._active:
+            jx = self.landmark_index(lm_id)
+            blocks.append(np.r_[jx : jx + 2])
+        return blocks
+
+    def _predict(self, Fx, R, dxv):
+        # information form of P = F P F' + R where only the vehicle state
+        # changes, by dxv.  Only the vehicle and active landmark block is
+        # affected, motion links the active landmarks to each other.  R is
+        # singular so the update is written without its inverse
+        idx = np.concatenate(self._vehicle_links())
+        B = self._Omega[idx][:, idx].toarray()
+
+        A = np.linalg.inv(Fx)
+        Phi = B.copy()
+        Phi[:3, :] = A.T @ Phi[:3, :]
+        Phi[:, :3] = Phi[:, :3] @ A
+        kappa = Phi[:, :3] @ R @ np.linalg.inv(np.eye(3) + Phi[:3, :3] @ R) @ Phi[:3, :]
+        self._add(idx, Phi - kappa - B)
+
+        # move the vehicle estimate
+        self._xi[idx] += (Phi - kappa)[:, :3] @ dxv
+        self._x_est[:3] += dxv
+
+    def _observe(self, xv_pred, z, lm_id, observed):
+        # add the information from a single reading, and return the
+        # innovation.  The ids of landmarks whose information is updated are
+        # appended to the list observed
+        z_pred = self.sensor.h(xv_pred, lm_id)
+        innov = np.array([z[0] - z_pred[0], base.wrap_mpi_pi(z[1] - z_pred[1])])
+
+        if not self._est_ekf_map:
+            # LBL
+            Hx = self.sensor.Hx(xv_pred, lm_id)
+            Hw = self.sensor.Hw(xv_pred, lm_id)
+            self._update(np.r_[0:3], Hx, Hw, innov)
+            observed.append(lm_id)
+
+        elif self._isseenbefore(lm_id):
+            # landmark is previously seen
+            jx = self.landmark_index(lm_id)
+            xf = self._x_est[jx : jx + 2].copy()
+
+            z_pred = self.sensor.h(xv_pred, xf)
+            innov = np.array([z[0] - z_pred[0], base.wrap_mpi_pi(z[1] - z_pred[1])])
+            Hx = self.sensor.Hp(xv_pred, xf)
+            Hw = self.sensor.Hw(xv_pred, xf)
+            if self._est_vehicle:
+                Hx = np.c_[self.sensor.Hx(xv_pred, xf), Hx]
+                idx = np.r_[0:3, jx : jx + 2]
+            else:
+                idx = np.r_[jx : jx + 2]
+
+            self._landmark_increment(lm_id)  # update the count
+            if self._verbose:
+                print(
+                    f"landmark {lm_id} seen"
+                    f" {self._landmark_count(lm_id)} times,"
+                    f" state_idx={self.landmark_index(lm_id)}"
+                )
+            self._update(idx, Hx, Hw, innov)
+            self._activate(lm_id)
+            observed.append(lm_id)
+
+        else:
+            # new landmark, seen for the first time
+            self._extend_map(xv_pred, z)
+
+            self._landmark_add(lm_id)
+            if self._verbose:
+                print(
+                    f"landmark {lm_id} seen for first time,"
+                    f" state_idx={self.landmark_index(lm_id)}"
+                )
+            self._activate(lm_id)
+
+        return innov
+
+    def _update(self, idx, Hx, Hw, innov):
+        # add the information from the observation, the Jacobian Hx is nonzero
+        # only in the state columns idx
+        Winv = np.linalg.inv(Hw @ self._W_est @ Hw.T)
+        self._add(idx, Hx.T @ Winv @ Hx)
+        self._xi[idx] += Hx.T @ Winv @ innov
+
+    def _extend_map(self, xv, z):
+        # append the new landmark, its information comes from the inverse
+        # sensor model xf = g(xv, z)
+        n = len(self._x_est)
+        self._x_est = np.r_[self._x_est, self.sensor.g(xv, z)]
+        self._xi = np.r_[self._xi, 0, 0]
+        self._Omega.resize((n + 2, n + 2))
+
+        Gz = self.sensor.Gz(xv, z)
+        M = np.linalg.inv(Gz @ self._W_est @ Gz.T)
+        if self._est_vehicle:
+            J = np.c_[-self.sensor.Gx(xv, z), np.eye(2)]
+            self._add(np.r_[0:3, n : n + 2], J.T @ M @ J)
+        else:
+            self._add(np.r_[n : n + 2], M)
+
+    def _activate(self, lm_id):
+        # move the landmark to the most recently observed end of the active set
+        self._active.pop(lm_id, None)
+        self._active[lm_id] = True
+
+    def _sparsify(self):
+        # remove the links between the vehicle and the least recently observed
+        # active landmarks, SEIF sparsification
+        m0 = list(self._active)[: len(self._active) - self._nactive]
+        i0 = []
+        for lm_id in m0:
+            del self._active[lm_id]
+            jx = self.landmark_index(lm_id)
+            i0.extend([jx, jx + 1])
+
+        idx = np.r_[np.concatenate(self._vehicle_links()), i0]
+        B = self._Omega[idx][:, idx].toarray()
+
+        def marginal(k):
+            # information removed by marginalizing out the states k
+            return B[:, k] @ np.linalg.solve(B[np.ix_(k, k)], B[k, :])
+
+        kv = np.r_[0:3]
+        k0 = np.arange(len(idx) - len(i0), len(idx))
+        D = -marginal(k0) + marginal(np.r_[kv, k0]) - marginal(kv)
+
+        # the vehicle and deactivated landmarks are now exactly unlinked
+        D[np.ix_(kv, k0)] = -B[np.ix_(kv, k0)]
+        D[np.ix_(k0, kv)] = -B[np.ix_(k0, kv)]
+        self._add(idx, D)
+        self._Omega.eliminate_zeros()
+
+    def _relax(self, blocks, niter):
+        # block Gauss-Seidel iterations on Omega x = xi over the given blocks
+        # of the state.  The rest of the state is fixed, so its contribution
+        # is computed once and the iterations use the dense diagonal block
+        idx = np.concatenate(blocks)
+        rows = self._Omega[idx]
+        D = rows[:, idx].toarray()
+        r = self._xi[idx] - rows @ self._x_est + D @ self._x_est[idx]
+
+        x = self._x_est[idx]
+        slices = np.split(np.arange(len(idx)), np.cumsum([len(k) for k in blocks]))
+        for _ in range(niter):
+            for k in slices[:-1]:
+                x[k] += np.linalg.solve(D[np.ix_(k, k)], r[k] - D[k, :] @ x)
+        self._x_est[idx] = x
+        self._wrap()
+
+    def _wrap(self):
+        # wrap heading state for a vehicle, and shift xi to match
+        if self._est_vehicle:
+            theta = base.wrap_mpi_pi(self._x_est[2])
+            if theta != self._x_est[2]:
+                self._xi += self._Omega[:, 2].toarray().ravel() * (
+                    theta - self._x_est[2]
+                )
+                self._x_est[2] = theta
@@ -18,6 +18,7 @@ from spatialmath import base, SE2
 from roboticstoolbox.mobile import VehicleBase
 from roboticstoolbox.mobile.landmarkmap import LandmarkMap
 from roboticstoolbox.mobile.sensors import SensorBase
+from roboticstoolbox.mobile.History import History
 
 
 class EKF:
@@ -34,6 +35,7 @@ class EKF:
         verbose=False,
         history=True,
         workspace=None,
+        inplace=False,
     ):
         r"""
         Extended Kalman filter
@@ -57,9 +59,11 @@ class EKF:
         :param verbose: display extra debug information, defaults to False
         :type verbose: bool, optional
         :param history: retain step-by-step history, defaults to True
-        :type history: bool, optional
+        :type history: bool or :class:`History`, optional
         :param workspace: dimension of workspace, see :func:`~spatialmath.base.graphics.expand_dims`
         :type workspace: scalar, array_like(2), array_like(4)
+        :param inplace: update the state and covariance in place, defaults to False
+        :type inplace: bool, optional
 
         This class solves several classical robotic estimation problems, which are
         selected according to the arguments:
@@ -236,7 +240,32 @@ class EKF:
             pn = ekf.get_Pnorm()
             plt.plot(t, pn);
 
-        :seealso: :meth:`run`
+        **In-place covariance update**
+
+        With ``inplace=True`` the state vector and covariance matrix are held in
+        preallocated buffers, sized for every landmark in the sensor's map, and
+        only the affected blocks are updated at each step:
+
+        - prediction updates the vehicle rows and columns of the covariance
+        - an observation of a known landmark involves only the vehicle and
+          landmark columns of the covariance, the update is a rank-2 correction
+        - a new landmark appends two rows and columns to the covariance
+
+        The cost of each step is :math:`O(N^2)` rather than :math:`O(N^3)` for
+        :math:`N` landmarks.  The results are the same as the default
+        implementation to within rounding error.  ``x_est`` and ``P_est`` are
+        views into the buffers and change as the filter runs.
+
+        **Batch observations**
+
+        If the sensor returns all visible landmarks at each step, see the
+        ``batch`` option of :class:`RangeBearingSensor`, the readings of known
+        landmarks are stacked into a single Kalman update with one gain, and
+        then the map is extended by any new landmarks.  The history fields
+        ``innov``, ``S`` and ``K`` are those of the stacked update, and ``lm``
+        and ``z`` are the arrays returned by the sensor.
+
+        :seealso: :meth:`run` :class:`EIF`
         """
 
         if robot is not None:
@@ -296,10 +325,15 @@ class EKF:
             # estimating ekf_map
             self._est_ekf_map = True
         self._joseph = joseph  #  flag: use Joseph form to compute p
+        self._inplace = inplace  #  flag: update state and covariance in place
 
         self._verbose = verbose
 
-        self._keep_history = history  #  keep history
+        # history recorder, a list that stays empty if not keeping history
+        if history is True:
+            history = History()
+        self._keep_history = isinstance(history, History)  #  keep history
+        self._history = history if self._keep_history else []
         self._htuple = namedtuple("EKFlog", "t xest odo P innov S K lm z")
 
         if workspace is not None:
@@ -347,7 +381,7 @@ class EKF:
         self.xxdata = ([], [])
 
     def __str__(self):
-        s = f"EKF object: {len(self._x_est)} states"
+        s = f"{self.__class__.__name__} object: {len(self._x_est)} states"
 
         def indent(s, n=2):
             spaces = " " * n
@@ -485,14 +519,15 @@ class EKF:
         Get EKF simulation history
 
         :return: simulation history
-        :rtype: list of namedtuples
+        :rtype: :class:`History` of namedtuples
 
         At each simulation timestep a namedtuple of is appended to the history
         list.  It contains, for that time step, estimated state and covariance,
-        and sensor observation.
+        and sensor observation.  What is kept is determined by the
+        :class:`History` passed to the constructor.
 
         :seealso: :meth:`get_t` :meth:`get_xyt` :meth:`get_map` :meth:`get_P`
-            :meth:`get_Pnorm`
+            :meth:`get_Pnorm` :class:`History`
         """
         return self._history
 
@@ -612,7 +647,8 @@ class EKF:
             self.sensor.init()
 
         # clear the history
-        self._history = []
+        if self._keep_history:
+            self._history.clear()
 
         if self._V_est is None:
             # perfect vehicle case
@@ -625,6 +661,20 @@ class EKF:
             self._P_est = self._P0
             self._estVehicle = True
 
+        if self._inplace:
+            # copy the initial state into buffers large enough for every
+            # landmark in the map, x_est and P_est are views of these
+            n = len(self._x_est)
+            nmax = n
+            if self._est_ekf_map:
+                nmax += 2 * len(self.sensor.map)
+            self._xbuf = np.zeros((nmax,))
+            self._Pbuf = np.zeros((nmax, nmax))
+            self._xbuf[:n] = self._x_est
+            self._Pbuf[:n, :n] = self._P_est
+            self._x_est = self._xbuf[:n]
+            self._P_est = self._Pbuf[:n, :n]
+
         if self.sensor is not None:
             # landmark dictionary maps lm_id to list[index, nseen]
             self._landmarks = {}
@@ -774,6 +824,10 @@ class EKF:
         # move the robot
         odo = self.robot.step(pause=pause)
 
+        if self._inplace:
+            self._step_inplace(odo)
+            return
+
         # =================================================================
         # P R E D I C T I O N
         # =================================================================
@@ -855,6 +909,14 @@ class EKF:
             z = None
             sensorReading = False
 
+        if sensorReading and np.ndim(z) == 2:
+            # a batch of readings, update a copy of the prediction
+            self._x_est = x_pred.copy()
+            self._P_est = P_pred.copy()
+            innov, S, K = self._update_batch(xv_pred, z, lm_id)
+            self._log(odo, innov, S, K, lm_id, z)
+            return
+
         if sensorReading:
             #  here for MBL, MM, SLAM
 
@@ -962,8 +1024,8 @@ class EKF:
                 P_est = (I - K @ Hx) @ P_pred @ (I - K @ Hx).T + K @ self._W_est @ K.T
             else:
                 P_est = P_pred - K @ S @ K.T
-                # enforce P to be symmetric
-                P_est = 0.5 * (P_est + P_est.T)
+            # enforce P to be symmetric
+            P_est = 0.5 * (P_est + P_est.T)
         else:
             # no update phase, estimate is same as prediction
             x_est = x_pred
@@ -974,20 +1036,245 @@ class EKF:
         self._x_est = x_est
         self._P_est = P_est
 
+        self._log(odo, innov, S, K, lm_id, z)
+
+    def _log(self, odo, innov, S, K, lm_id, z):
+        # save the current state and step information to the history, which
+        # copies the fields that it keeps
         if self._keep_history:
             hist = self._htuple(
                 self.robot._t,
-                x_est.copy(),
-                odo.copy(),
-                P_est.copy(),
-                innov.copy() if innov is not None else None,
-                S.copy() if S is not None else None,
-                K.copy() if K is not None else None,
+                self._x_est,
+                odo,
+                self._P_est,
+                innov,
+                S,
+                K,
                 lm_id if lm_id is not None else -1,
-                z.copy() if z is not None else None,
+                z,
             )
             self._history.append(hist)
 
+    def _step_inplace(self, odo):
+        # EKF step where only the affected blocks of the state vector and
+        # covariance matrix are updated, in place
+
+        x = self._x_est
+        P = self._P_est
+
+        # =================================================================
+        # P R E D I C T I O N
+        # =================================================================
+        if self._est_vehicle:
+            xv_est = x[:3].copy()
+            Fx = self.robot.Fx(xv_est, odo)
+            Fv = self.robot.Fv(xv_est, odo)
+
+            x[:3] = self.robot.f(xv_est, odo)
+            P[:3, :3] = Fx @ P[:3, :3] @ Fx.T + Fv @ self.V_est @ Fv.T
+            if self._est_ekf_map:
+                # SLAM case, update the vehicle-map correlations
+                P[:3, 3:] = Fx @ P[:3, 3:]
+                P[3:, :3] = P[:3, 3:].T
+            xv_pred = x[:3].copy()
+        else:
+            xv_pred = self._robot.x
+
+        # =================================================================
+        # P R O C E S S    O B S E R V A T I O N S
+        # =================================================================
+        if self.sensor is not None:
+            z, lm_id = self.sensor.reading()
+        else:
+            z, lm_id = None, None
+
+        innov = None
+        S = None
+        K = None
+        if z is not None and np.ndim(z) == 2:
+            # a batch of readings
+            innov, S, K = self._update_batch(xv_pred, z, lm_id)
+
+        elif z is not None:
+            z_pred = self.sensor.h(xv_pred, lm_id)
+            innov = np.array([z[0] - z_pred[0], base.wrap_mpi_pi(z[1] - z_pred[1])])
+
+            if not self._est_ekf_map:
+                # LBL
+                Hx = self.sensor.Hx(xv_pred, lm_id)
+                Hw = self.sensor.Hw(xv_pred, lm_id)
+                S, K = self._update_inplace(np.r_[0:3], Hx, Hw, innov)
+
+            elif self._isseenbefore(lm_id):
+                # landmark is previously seen, the Jacobian is nonzero only
+                # for the vehicle and this landmark
+                jx = self.landmark_index(lm_id)
+                xf = x[jx : jx + 2].copy()
+
+                z_pred = self.sensor.h(xv_pred, xf)
+                innov = np.array([z[0] - z_pred[0], base.wrap_mpi_pi(z[1] - z_pred[1])])
+                Hx = self.sensor.Hp(xv_pred, xf)
+                Hw = self.sensor.Hw(xv_pred, xf)
+                if self._est_vehicle:
+                    Hx = np.c_[self.sensor.Hx(xv_pred, xf), Hx]
+                    idx = np.r_[0:3, jx : jx + 2]
+                else:
+                    idx = np.r_[jx : jx + 2]
+
+                self._landmark_increment(lm_id)  # update the count
+                if self._verbose:
+                    print(
+                        f"landmark {lm_id} seen"
+                        f" {self._landmark_count(lm_id)} times,"
+                        f" state_idx={self.landmark_index(lm_id)}"
+                    )
+                S, K = self._update_inplace(idx, Hx, Hw, innov)
+
+            else:
+                # new landmark, seen for the first time
+                self._extend_map_inplace(xv_pred, z)
+
+                self._landmark_add(lm_id)
+                if self._verbose:
+                    print(
+                        f"landmark {lm_id} seen for first time,"
+                        f" state_idx={self.landmark_index(lm_id)}"
+                    )
+
+        self._log(odo, innov, S, K, lm_id, z)
+
+    def _update_batch(self, xv_pred, z, lm_id):
+        # process a batch of readings, one per row of z.  The readings of
+        # known landmarks are stacked into a single Kalman update, then the
+        # map is extended with the landmarks seen for the first time
+        x = self._x_est
+        lm_id = np.asarray(lm_id).tolist()
+        known = [
+            i
+            for i, id in enumerate(lm_id)
+            if not self._est_ekf_map or self._isseenbefore(id)
+        ]
+
+        innov = None
+        S = None
+        K = None
+        if len(known) > 0:
+            # the stacked Jacobian is nonzero only in the vehicle columns and
+            # the columns of the observed landmarks
+            m = len(known)
+            nv = 3 if self._est_vehicle else 0
+            idx = list(range(nv))
+            Hx = np.zeros((2 * m, nv + 2 * m if self._est_ekf_map else nv))
+            Hw = np.zeros((2 * m, 2 * m))
+            innov = np.zeros((2 * m,))
+
+            for j, i in enumerate(known):
+                id = lm_id[i]
+                r = slice(2 * j, 2 * j + 2)
+                if self._est_ekf_map:
+                    jx = self.landmark_index(id)
+                    xf = x[jx : jx + 2].copy()
+                    Hx[r, nv + 2 * j : nv + 2 * j + 2] = self.sensor.Hp(xv_pred, xf)
+                    idx.extend((jx, jx + 1))
+
+                    self._landmark_increment(id)  # update the count
+                    if self._verbose:
+                        print(
+                            f"landmark {id} seen"
+                            f" {self._landmark_count(id)} times,"
+                            f" state_idx={jx}"
+                        )
+                else:
+                    # LBL
+                    xf = id
+                if self._est_vehicle:
+                    Hx[r, :3] = self.sensor.Hx(xv_pred, xf)
+                Hw[r, r] = self.sensor.Hw(xv_pred, xf)
+
+                z_pred = self.sensor.h(xv_pred, xf)
+                innov[r] = (z[i, 0] - z_pred[0], base.wrap_mpi_pi(z[i, 1] - z_pred[1]))
+
+            S, K = self._update_inplace(np.array(idx), Hx, Hw, innov)
+
+        if self._est_ekf_map:
+            for i, id in enumerate(lm_id):
+                if self._isseenbefore(id):
+                    continue
+                # new landmark, seen for the first time, its position is
+                # estimated from the updated vehicle state
+                if self._est_vehicle:
+                    xv = self._x_est[:3].copy()
+                else:
+                    xv = xv_pred
+                if self._inplace:
+                    self._extend_map_inplace(xv, z[i])
+                else:
+                    x = self._x_est
+                    xm = x[3:] if self._est_vehicle else x
+                    self._x_est, self._P_est = self._extend_map(
+                        self._P_est, xv, xm, z[i], id
+                    )
+
+                self._landmark_add(id)
+                if self._verbose:
+                    print(
+                        f"landmark {id} seen for first time,"
+                        f" state_idx={self.landmark_index(id)}"
+                    )
+
+        return innov, S, K
+
+    def _update_inplace(self, idx, Hx, Hw, innov):
+        # Kalman update where the Jacobian Hx is nonzero only in the state
+        # columns idx.  P H' needs just those columns of P, and the
+        # covariance is corrected by low-rank outer products.  Hw and innov
+        # may be stacked for several readings, each with covariance W
+        x = self._x_est
+        P = self._P_est
+
+        W = block_diag(*[self._W_est] * (len(innov) // 2))
+        PHt = P[:, idx] @ Hx.T
+        S = Hx @ PHt[idx, :] + Hw @ W @ Hw.T
+        K = PHt @ np.linalg.inv(S)
+
+        x += K @ innov
+        if self._est_vehicle:
+            #  wrap heading state for a vehicle
+            x[2] = base.wrap_mpi_pi(x[2])
+
+        if self._joseph:
+            # Joseph form (I - KH) P (I - KH)' + K W K', each product with
+            # (I - KH) is a low-rank correction
+            P -= K @ PHt.T
+            P -= (P[:, idx] @ Hx.T) @ K.T
+            P += K @ W @ K.T
+        else:
+            P -= K @ S @ K.T
+        # enforce P to be symmetric
+        P[:] = 0.5 * (P + P.T)
+        return S, K
+
+    def _extend_map_inplace(self, xv, z):
+        # append the new landmark to the state vector and two rows and
+        # columns to the covariance matrix
+        n = len(self._x_est)
+        self._x_est = self._xbuf[: n + 2]
+        self._P_est = self._Pbuf[: n + 2, : n + 2]
+        x = self._x_est
+        P = self._P_est
+
+        x[n:] = self.sensor.g(xv, z)
+        Gz = self.sensor.Gz(xv, z)
+        if self._est_vehicle:
+            # the new landmark is correlated with everything the vehicle is
+            Gx = self.sensor.Gx(xv, z)
+            P[n:, :n] = Gx @ P[:3, :n]
+            P[n:, n:] = Gx @ P[:3, :3] @ Gx.T + Gz @ self._W_est @ Gz.T
+        else:
+            P[n:, :n] = 0
+            P[n:, n:] = Gz @ self._W_est @ Gz.T
+        P[:n, n:] = P[n:, :n].T
+
     ## landmark management
 
     def _isseenbefore(self, lm_id):
@@ -1175,11 +1462,10 @@ class EKF:
         bounds = []
         ppf = chi2.ppf(confidence, df=2)
 
-        x_gt = self.robot.x_hist
-        for k in range(len(self.history)):
-            hk = self.history[k]
+        x_gt = self.robot.x_hist[self.history.index]
+        for k, hk in enumerate(self.history):
             # error is true - estimated
-            e = x_gt[k, :] - hk.xest
+            e = x_gt[k, :] - hk.xest[:3]
             e[2] = base.wrap_mpi_pi(e[2])
             error.append(e)
 
@@ -1208,7 +1494,7 @@ class EKF:
                     edge.T, closed=True, facecolor="r", edgecolor="none", alpha=0.3
                 )
                 ax.add_patch(polygon)
-            ax.plot(error[:, k], **kwargs)
+            ax.plot(t, error[:, k], **kwargs)
             ax.grid(True)
             ax.set_ylabel(labels[k] + " error")
             ax.set_xlim(0, t[-1])
@@ -1289,8 +1575,8 @@ class EKF:
                 "linewidth": 0,
             }
 
-        xm = self._x_est
-        P = self._P_est
+        xm = self.x_est
+        P = self.P_est
         if self._est_vehicle:
             xm = xm[3:]
             P = P[3:, 3:]
@@ -0,0 +1,362 @@
+"""
+Vectorized simulation of a fleet of vehicles
+"""
+
+import numpy as np
+from scipy import interpolate
+import matplotlib.pyplot as plt
+
+from roboticstoolbox.mobile.Vehicle import DiffSteer
+from roboticstoolbox.mobile.drivers import RandomPath
+
+
+class Fleet:
+    def __init__(self, vehicle, x0, control=None, seed=0):
+        r"""
+        Simulate a fleet of vehicles
+
+        :param vehicle: vehicle kinematic model
+        :type vehicle: :class:`VehicleBase` subclass
+        :param x0: initial states, one per row, or the number of vehicles
+        :type x0: ndarray(K,3) or int
+        :param control: vehicle control inputs, defaults to the control of
+            ``vehicle``
+        :type control: array_like(2), ndarray(K,2), callable, interp1d,
+            :class:`RandomPath`
+        :param seed: random number seed, defaults to 0
+        :type seed: int, optional
+
+        All the vehicles share the kinematic model, limits, sample interval and
+        odometry covariance of ``vehicle``, but each has its own state, control
+        input and previous velocity for acceleration limiting.  At each time
+        step the control inputs and the derivatives of all the vehicles are
+        evaluated together, using the vectorized forms of the vehicle's
+        :meth:`~VehicleBase.u_limited` and :meth:`~VehicleBase.deriv` methods,
+        and the states are recorded in a preallocated history array.
+
+        If ``x0`` is an integer then all the vehicles start at the initial
+        state of ``vehicle``.
+
+        The control inputs can be:
+
+            * a constant tuple as the control inputs to all the vehicles
+            * an array with the constant control inputs to each vehicle, one
+              row per vehicle
+            * a function called as ``f(fleet, t, x)`` that returns an array with
+              the control inputs to each vehicle, one row per vehicle
+            * an interpolator called as ``f(t)`` that returns a tuple, see
+              SciPy interp1d
+            * a :class:`RandomPath` driver, each vehicle drives to its own
+              sequence of random waypoints chosen using the driver's workspace,
+              speed, distance threshold and heading gain.
+
+        Example::
+
+            bike = Bicycle(speed_max=2)
+            driver = RandomPath(workspace=100)
+            fleet = Fleet(bike, 500, control=driver)
+            fleet.run(T=100)
+            fleet.x_hist[3]  # state history of vehicle 3
+
+        .. note:: The ``vehicle`` object is used as the model and its acceleration
+            limiting state is changed by the simulation.
+
+        :seealso: :class:`Bicycle` :class:`Unicycle` :class:`DiffSteer`
+        """
+        self._vehicle = vehicle
+        if isinstance(x0, (int, np.integer)):
+            x0 = np.tile(vehicle.x0, (x0, 1))
+        self._x0 = np.array(x0, dtype=float).reshape((-1, 3))
+
+        if control is None:
+            control = vehicle.control
+        self._control = control
+        self._seed = seed
+        self._random = np.random.default_rng(seed)
+
+        self.init()
+
+    def __str__(self):
+        s = f"Fleet: {len(self)} x {self._vehicle.__class__.__name__}"
+        s += f", t = {self._t:.2f}"
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        """
+        Number of vehicles in fleet
+
+        :return: number of vehicles
+        :rtype: int
+        """
+        return self._x0.shape[0]
+
+    def init(self, x0=None, control=None):
+        """
+        Initialize for simulation
+
+        :param x0: initial states, defaults to value given to constructor
+        :type x0: ndarray(K,3), optional
+        :param control: vehicle control inputs, defaults to value given to
+            constructor
+        :type control: array_like(2), ndarray(K,2), callable, interp1d,
+            :class:`RandomPath`
+
+        Clears the state history, reseeds the random number generator, sets
+        the states to their initial values and the previous velocities to
+        zero.
+        """
+        if x0 is not None:
+            self._x0 = np.array(x0, dtype=float).reshape((-1, 3))
+        if control is not None:
+            self._control = control
+        n = len(self)
+
+        self._x = self._x0.copy()
+        self._t = 0
+        self._nhist = 0
+        self._hist = np.zeros((0, n, 3))
+
+        if self._seed is not None:
+            self._random = np.random.default_rng(self._seed)
+
+        # previous velocities of each vehicle, updated in place by limits_va
+        if isinstance(self._vehicle, DiffSteer):
+            self._vehicle._v_prev_L = np.zeros((n,))
+            self._vehicle._v_prev_R = np.zeros((n,))
+        else:
+            self._vehicle._v_prev = np.zeros((n,))
+
+        # random waypoint for each vehicle, and previous distance to it
+        self._goal = np.full((n, 2), np.nan)
+        self._d_prev = np.full((n,), np.inf)
+
+    def eval_control(self, control, x):
+        r"""
+        Evaluate vehicle control inputs
+
+        :param control: vehicle control
+        :type control: array_like(2), ndarray(K,2), callable, interp1d,
+            :class:`RandomPath`
+        :param x: vehicle states, one per row
+        :type x: ndarray(K,3)
+        :raises ValueError: bad control
+        :return: vehicle control inputs, one per row
+        :rtype: ndarray(K,2)
+
+        Evaluates the control for this time step and states, and applies the
+        vehicle speed, acceleration and steering limits.
+
+        :seealso: :meth:`VehicleBase.eval_control`
+        """
+        if isinstance(control, RandomPath):
+            u = self._random_path(control, x)
+
+        elif isinstance(control, interpolate.interpolate.interp1d):
+            u = control(self._t)
+
+        elif callable(control):
+            u = control(self, self._t, x)
+
+        elif control is not None and np.shape(control) in ((2,), (len(self), 2)):
+            u = control
+
+        else:
+            raise ValueError("bad control specified")
+
+        u = np.broadcast_to(np.array(u, dtype=float), (len(self), 2))
+        return self._vehicle.u_limited(u)
+
+    def step(self, u=None):
+        r"""
+        Step simulator by one time step
+
+        :param u: control inputs, defaults to the ``control`` given to the
+            constructor
+        :type u: array_like(2), ndarray(K,2), callable, interp1d,
+            :class:`RandomPath`
+        :return: odometry :math:`(\delta_d, \delta_\theta)` of each vehicle,
+            one per row
+        :rtype: ndarray(K,2)
+
+        The states of all vehicles are integrated forward one time step and
+        recorded in the state history.  If the vehicle has an odometry
+        covariance, independent noise is added to the odometry of each
+        vehicle.
+
+        :seealso: :meth:`run` :meth:`VehicleBase.step`
+        """
+        if u is None:
+            u = self._control
+        u = self.eval_control(u, self._x)
+
+        # update the states
+        xd = self.dt * self._vehicle.deriv(self._x, u, limits=False)
+        self._x += xd
+
+        if self._nhist == self._hist.shape[0]:
+            # grow the history buffer by doubling
+            self._hist = np.concatenate(
+                (self._hist, np.zeros((max(self._nhist, 64), len(self), 3)))
+            )
+        self._hist[self._nhist] = self._x
+        self._nhist += 1
+
+        # odometry comes from change in state vector
+        odo = np.c_[np.linalg.norm(xd[:, :2], axis=1), xd[:, 2]]
+        V = self._vehicle._V
+        if V is not None:
+            odo += self._random.multivariate_normal((0, 0), V, size=len(self))
+
+        self._t += self.dt
+        return odo
+
+    def run(self, T=10, x0=None, control=None):
+        r"""
+        Simulate motion of the fleet
+
+        :param T: simulation time in seconds, defaults to 10
+        :type T: float, optional
+        :param x0: initial states, defaults to value given to constructor
+        :type x0: ndarray(K,3), optional
+        :param control: vehicle control inputs, defaults to value given to
+            constructor
+        :type control: array_like(2), ndarray(K,2), callable, interp1d,
+            :class:`RandomPath`
+        :return: state history of each vehicle
+        :rtype: ndarray(K,n,3)
+
+        Runs the simulation for ``T`` seconds.  The history is allocated
+        once for the whole run.
+
+        :seealso: :meth:`init` :meth:`step` :meth:`x_hist`
+        """
+        self.init(x0=x0, control=control)
+
+        nsteps = round(T / self.dt)
+        self._hist = np.zeros((nsteps, len(self), 3))
+        for i in range(nsteps):
+            self.step()
+
+        return self.x_hist
+
+    def _random_path(self, driver, x):
+        # control inputs that drive each vehicle toward its own random
+        # waypoint, as for RandomPath.demand
+        d = np.linalg.norm(x[:, :2] - self._goal, axis=1)
+
+        # if nearly at goal point, or not getting closer, choose the next one
+        new = np.isnan(d) | (d < driver._dthresh) | (np.abs(d - self._d_prev) < 1e-3)
+        self._d_prev = d
+        k = np.flatnonzero(new)
+        while len(k) > 0:
+            # choose a uniform random goal within inner 80% of driving area
+            ws = driver._workspace
+            r = self._random.uniform(0.1, 0.9, size=(len(k), 2))
+            self._goal[k] = np.c_[
+                ws[0] * r[:, 0] + ws[1] * (1 - r[:, 0]),
+                ws[2] * r[:, 1] + ws[3] * (1 - r[:, 1]),
+            ]
+
+            # check not too close to the vehicle
+            d = np.linalg.norm(self._goal[k] - x[k, :2], axis=1)
+            k = k[d <= 2 * driver._dthresh]
+
+        goal_heading = np.arctan2(
+            self._goal[:, 1] - x[:, 1], self._goal[:, 0] - x[:, 0]
+        )
+        delta_heading = np.mod(goal_heading - x[:, 2] + np.pi, 2 * np.pi) - np.pi
+        return np.c_[
+            np.full((len(x),), driver._speed), driver._headinggain * delta_heading
+        ]
+
+    @property
+    def vehicle(self):
+        """
+        Vehicle kinematic model
+
+        :return: the vehicle model shared by the fleet
+        :rtype: :class:`VehicleBase` subclass
+        """
+        return self._vehicle
+
+    @property
+    def x(self):
+        r"""
+        Get vehicle states
+
+        :return: state :math:`(x, y, \theta)` of each vehicle, one per row
+        :rtype: ndarray(K,3)
+        """
+        return self._x
+
+    @property
+    def x_hist(self):
+        r"""
+        Get vehicle state history
+
+        :return: state history of each vehicle
+        :rtype: ndarray(K,n,3)
+
+        ``fleet.x_hist[k]`` is the history of vehicle ``k``, the same as
+        :meth:`VehicleBase.x_hist` for a single vehicle, with the state
+        :math:`(x, y, \theta)` at each time step, one row per time step.
+        """
+        return self._hist[: self._nhist].swapaxes(0, 1)
+
+    @property
+    def t(self):
+        """
+        Get simulation time
+
+        :return: time since the start of the simulation
+        :rtype: float
+        """
+        return self._t
+
+    @property
+    def dt(self):
+        """
+        Get sample time
+
+        :return: discrete time step for simulation
+        :rtype: float
+
+        The sample time of the vehicle model.
+        """
+        return self._vehicle.dt
+
+    @property
+    def random(self):
+        """
+        Get private random number generator
+
+        :return: NumPy random number generator
+        :rtype: :class:`numpy.random.Generator`
+
+        Used for odometry noise and random waypoints.  The generator is
+        initialized with the seed provided at constructor time every time
+        :meth:`init` is called.
+        """
+        return self._random
+
+    def plot_xy(self, *args, block=None, **kwargs):
+        """
+        Plot xy-paths from history
+
+        :param block: block until plot dismissed, defaults to None
+        :type block: bool, optional
+        :param args: positional arguments passed to :meth:`~matplotlib.axes.Axes.plot`
+        :param kwargs: keyword arguments passed to :meth:`~matplotlib.axes.Axes.plot`
+
+        The :math:`(x,y)` trajectory of each vehicle from the simulation
+        history is plotted as :math:`x` vs :math:`y`.
+
+        :seealso: :meth:`run` :meth:`VehicleBase.plot_xy`
+        """
+        xyt = self._hist[: self._nhist]
+        plt.plot(xyt[:, :, 0], xyt[:, :, 1], *args, **kwargs)
+        if block is not None:
+            plt.show(block=block)
@@ -0,0 +1,262 @@
+"""
+Bounded-memory simulation history for state estimators
+"""
+
+import os
+from collections import deque
+
+import numpy as np
+
+
+class History:
+    def __init__(
+        self, fields=None, every=1, maxlen=None, covar="full", file=None, chunk=1000
+    ):
+        r"""
+        Simulation history recorder
+
+        :param fields: names of the fields to record, defaults to all
+        :type fields: list of str, optional
+        :param every: record every ``every`` steps, defaults to 1
+        :type every: int, optional
+        :param maxlen: maximum number of records kept, defaults to no limit
+        :type maxlen: int, optional
+        :param covar: how to store the covariance field ``P``: "full", "vehicle"
+            or "diag", defaults to "full"
+        :type covar: str, optional
+        :param file: directory for an on-disk history, defaults to None
+        :type file: str, optional
+        :param chunk: number of records per on-disk chunk, defaults to 1000
+        :type chunk: int, optional
+        :raises ValueError: bad option
+
+        A history recorder is passed as the ``history`` option of an estimator
+        such as :class:`EKF` or :class:`ParticleFilter`, which appends a
+        namedtuple to it at every step.  The recorder behaves as a read-only
+        sequence of those namedtuples, so the estimator's ``get_*`` and
+        ``plot_*`` methods work against it.  The memory used is controlled by:
+
+        - ``fields``, fields that are not recorded are None, for example
+          ``fields=["t", "xest", "P"]``
+        - ``every``, only every ``every``'th step is recorded
+        - ``maxlen``, only the most recent ``maxlen`` records are kept, in a
+          ring buffer
+        - ``covar``, the covariance ``P`` is stored as the leading
+          :math:`3 \times 3` vehicle block ("vehicle") or as its diagonal
+          ("diag") in which case it is read back as a diagonal matrix.
+
+        If ``file`` is given the records are written to that directory as a
+        sequence of uncompressed npz files, each of ``chunk`` records.  Only
+        the current chunk is held in memory, and records are read back a chunk
+        at a time.  Each field must be a number, an array or None.
+
+        Example::
+
+            history = History(fields=["t", "xest", "P"], every=10, covar="vehicle")
+            ekf = EKF(robot=(robot, V), P0=P0, sensor=(sensor, W), history=history)
+            ekf.run(T=1000)
+            ekf.plot_ellipse()
+
+        :seealso: :class:`EKF` :class:`ParticleFilter`
+        """
+        if every < 1:
+            raise ValueError("every must be >= 1")
+        if covar not in ("full", "vehicle", "diag"):
+            raise ValueError("covar must be 'full', 'vehicle' or 'diag'")
+        if file is not None and maxlen is not None:
+            raise ValueError("maxlen cannot be used with an on-disk history")
+
+        self._fields = fields
+        self._every = every
+        self._maxlen = maxlen
+        self._covar = covar
+        self._file = file
+        self._chunk = chunk
+
+        if file is not None:
+            os.makedirs(file, exist_ok=True)
+
+        self.clear()
+
+    def __str__(self):
+        s = f"History: {len(self)} records"
+        if self._fields is not None:
+            s += ", fields: " + ", ".join(self._fields)
+        if self._every > 1:
+            s += f", every {self._every} steps"
+        if self._maxlen is not None:
+            s += f", maxlen={self._maxlen}"
+        if self._covar != "full":
+            s += f", covar={self._covar}"
+        if self._file is not None:
+            s += f", file={self._file}"
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    def clear(self):
+        """
+        Clear the history
+
+        All records are discarded, including any on-disk chunks.
+        """
+        self._nsteps = 0
+        self._type = None
+        self._records = deque(maxlen=self._maxlen)
+        self._steps = deque(maxlen=self._maxlen)
+
+        if self._file is not None:
+            for f in os.listdir(self._file):
+                if f.startswith("history_") and f.endswith(".npz"):
+                    os.remove(os.path.join(self._file, f))
+            self._nchunks = 0  # number of complete chunks on disk
+            self._cache = (None, None)  # most recently read chunk
+
+    def append(self, record):
+        """
+        Append a record to the history
+
+        :param record: record
+        :type record: namedtuple
+
+        The record is kept if the step is one to be recorded.  Fields that
+        are recorded are copied, so the caller may pass arrays that it will
+        later modify.
+        """
+        step = self._nsteps
+        self._nsteps += 1
+        if step % self._every != 0:
+            return
+
+        if self._type is None:
+            self._type = type(record)
+        values = []
+        for name, value in zip(record._fields, record):
+            if self._fields is not None and name not in self._fields:
+                value = None
+            elif name == "P" and value is not None:
+                if self._covar == "vehicle":
+                    value = value[:3, :3]
+                elif self._covar == "diag":
+                    value = np.diag(value)
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            values.append(value)
+
+        self._records.append(tuple(values))
+        self._steps.append(step)
+
+        if self._file is not None and len(self._records) == self._chunk:
+            self._write(self._nchunks, self._records)
+            self._nchunks += 1
+            self._records.clear()
+
+    def flush(self):
+        """
+        Write the current partial chunk to disk
+
+        For an on-disk history, the records not yet written are saved so that
+        the directory holds the complete history.
+        """
+        if self._file is not None and len(self._records) > 0:
+            self._write(self._nchunks, self._records)
+
+    @property
+    def index(self):
+        """
+        Step number of each record
+
+        :return: step numbers
+        :rtype: ndarray(n)
+
+        The step number, starting at zero, at which each record in the history
+        was appended.
+        """
+        return np.array(self._steps, dtype=int)
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __getitem__(self, k):
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("history index out of range")
+
+        if self._file is None:
+            return self._record(self._records[k])
+
+        ic, k = divmod(k, self._chunk)
+        if ic == self._nchunks:
+            return self._record(self._records[k])
+        return self._record(self._read(ic)[k])
+
+    def __iter__(self):
+        if self._file is not None:
+            for ic in range(self._nchunks):
+                for values in self._read(ic):
+                    yield self._record(values)
+        for values in list(self._records):
+            yield self._record(values)
+
+    def _record(self, values):
+        # convert stored values to the estimator's namedtuple
+        if self._covar == "diag":
+            values = list(values)
+            iP = self._type._fields.index("P") if "P" in self._type._fields else -1
+            if iP >= 0 and values[iP] is not None:
+                values[iP] = np.diag(values[iP])
+        return self._type(*values)
+
+    def _filename(self, ic):
+        return os.path.join(self._file, f"history_{ic:06d}.npz")
+
+    def _write(self, ic, records):
+        # each field is saved as its values concatenated, plus the number of
+        # dimensions (-1 for None) and the shape of each value
+        arrays = {}
+        for i, name in enumerate(self._type._fields):
+            values = [r[i] for r in records]
+            ndim = np.array([-1 if v is None else np.ndim(v) for v in values])
+            shape = np.zeros((len(values), max(ndim.max(), 0)), dtype=int)
+            data = []
+            for j, v in enumerate(values):
+                if v is not None:
+                    shape[j, : ndim[j]] = np.shape(v)
+                    data.append(np.ravel(v))
+            arrays[name + ".ndim"] = ndim
+            arrays[name + ".shape"] = shape
+            arrays[name + ".data"] = np.concatenate(data) if data else np.zeros(0)
+        np.savez(self._filename(ic), **arrays)
+
+    def _read(self, ic):
+        # read a chunk from disk, as a list of tuples of values
+        if self._cache[0] == ic:
+            return self._cache[1]
+
+        columns = []
+        with np.load(self._filename(ic)) as f:
+            for name in self._type._fields:
+                ndim = f[name + ".ndim"]
+                shape = f[name + ".shape"]
+                data = f[name + ".data"]
+                values = []
+                offset = 0
+                for j in range(len(ndim)):
+                    if ndim[j] < 0:
+                        values.append(None)
+                    elif ndim[j] == 0:
+                        values.append(data[offset].item())
+                        offset += 1
+                    else:
+                        s = shape[j, : ndim[j]]
+                        size = int(np.prod(s))
+                        values.append(data[offset : offset + size].reshape(s))
+                        offset += size
+                columns.append(values)
+
+        records = list(zip(*columns))
+        self._cache = (ic, records)
+        return records
@@ -5,6 +5,7 @@ import matplotlib.pyplot as plt
 import itertools
 from roboticstoolbox.mobile.PlannerBase import PlannerBase
 from roboticstoolbox.mobile.OccGrid import BinaryOccupancyGrid
+from roboticstoolbox.mobile.VertexIndex import LatticeIndex
 from collections import namedtuple
 
 
@@ -107,7 +108,8 @@ class LatticePlanner(PlannerBase):
     =====   ================
 
     If the configuration is already in the graph, the edge connects to that
-    existing vertex.  The vertex is named after the sequence of moves required
+    existing vertex, which is found by a hash table lookup on the discrete
+    lattice coordinates.  The vertex is named after the sequence of moves required
     to reach it from the root.  This means, that any configuration, ie.
     :math:`(x, y, \theta)` can be reached by multiple paths and potentially have
     multiple names.  The first name assigned to a vertex is permanent and is not
@@ -183,10 +185,12 @@ class LatticePlanner(PlannerBase):
             )
 
         self.graph = DGraph(metric="SE2")
+        self._index = LatticeIndex(self.root)
 
         # add root vertex to the graph, place it in the frontier
         v0 = LatticeVertex(pose=SE2(self.root))
         self.graph.add_vertex(v0, name="0")
+        self._index.add(v0.coord, v0)
         frontier = [v0]
 
         iteration = 0
@@ -209,7 +213,7 @@ class LatticePlanner(PlannerBase):
                         if verbose:
                             print("    is occupied")
                         continue
-                    vclose, d = self.graph.closest(xyt)
+                    vclose, d = self._index.closest(xyt)
 
                     if d > 0.01:
                         # vertex does not already exists
@@ -220,6 +224,7 @@ class LatticePlanner(PlannerBase):
                         # it = int(round(xyt[2]*2/np.pi))
                         # vnew = LatticeVertex(move, newpose, name=f"{ix:d},{iy:d},{it:d}")
                         self.graph.add_vertex(vnew)
+                        self._index.add(xyt, vnew)
                         if verbose:
                             print("    add to graph as", vnew.name)
 
@@ -283,10 +288,10 @@ class LatticePlanner(PlannerBase):
         :seealso: :meth:`plan`
         """
 
-        vs, ds = self.graph.closest(start)
+        vs, ds = self._index.closest(start)
         if ds > 0.001:
             raise ValueError("start configuration is not in the lattice")
-        vg, dg = self.graph.closest(goal)
+        vg, dg = self._index.closest(goal)
         if dg > 0.001:
             raise ValueError("goal configuration is not in the lattice")
 
@@ -325,8 +330,8 @@ class LatticePlanner(PlannerBase):
             if path is not None:
                 for p, n in zip(path[:-1], path[1:]):
                     # turn coordinaets back into vertices
-                    vp, _ = self.graph.closest(p)
-                    vn, _ = self.graph.closest(n)
+                    vp, _ = self._index.closest(p)
+                    vn, _ = self._index.closest(n)
                     e = vp.edgeto(vn)
 
                     # e.plot(color='b', linewidth=4)
@@ -348,8 +353,8 @@ class LatticePlanner(PlannerBase):
             if path is not None:
                 for p, n in zip(path[:-1], path[1:]):
                     # turn coordinaets back into vertices
-                    vp, _ = self.graph.closest(p)
-                    vn, _ = self.graph.closest(n)
+                    vp, _ = self._index.closest(p)
+                    vn, _ = self._index.closest(n)
                     e = vp.edgeto(vn)
 
                     # e.plot(color='b', linewidth=4)
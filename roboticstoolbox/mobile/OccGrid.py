@@ -6,6 +6,7 @@ from abc import ABC
 import spatialmath.base as smb
 
 from spatialmath.geom2d import Polygon2
+from matplotlib.path import Path
 
 
 class BaseMap(ABC):
@@ -36,6 +37,51 @@ class BaseMap(ABC):
             self.dy = workspace[3] - workspace[2]
         self._name = name
 
+    def iscollision_path(self, footprint, path):
+        r"""
+        Test for collision along a path
+
+        :param footprint: outline of the vehicle in its own frame
+        :type footprint: :class:`~spatialmath.geom2d.Polygon2` or ndarray(2,N)
+        :param path: vehicle configurations :math:`(x, y, \theta)`
+        :type path: array_like(M,3)
+        :return: collision
+        :rtype: bool
+
+        The ``footprint`` is transformed to each configuration along the
+        ``path`` in turn and tested for collision with the map, returning True
+        on the first collision.
+
+        :seealso: :meth:`iscollision`
+        """
+        for vertices in _footprints(footprint, path):
+            if self.iscollision(Polygon2(vertices.T)):
+                return True
+        return False
+
+
+def _bbox(vertices):
+    # bounding box [xmin, xmax, ymin, ymax] of vertices ndarray(N,2)
+    return np.r_[vertices.min(axis=0), vertices.max(axis=0)][[0, 2, 1, 3]]
+
+
+def _footprints(footprint, path):
+    # vertices of footprint transformed to each configuration in path,
+    # as an ndarray(M,N,2)
+    if isinstance(footprint, Polygon2):
+        footprint = footprint.vertices()
+    path = np.atleast_2d(path)
+    c = np.cos(path[:, 2])[:, np.newaxis]
+    s = np.sin(path[:, 2])[:, np.newaxis]
+    x, y = footprint
+    return np.stack(
+        (
+            c * x - s * y + path[:, 0:1],
+            s * x + c * y + path[:, 1:2],
+        ),
+        axis=2,
+    )
+
 
 class BaseOccupancyGrid(BaseMap):
     def __init__(self, grid=None, origin=(0, 0), value=0, cellsize=1, **kwargs):
@@ -75,6 +121,9 @@ class BaseOccupancyGrid(BaseMap):
             self._origin = np.r_[self._workspace[0], self._workspace[2]]
 
         self._cellsize = cellsize
+        self._pyramid = None
+        self._distance = None
+        self._feature = None
 
     def copy(self):
         """
@@ -219,7 +268,7 @@ class BaseOccupancyGrid(BaseMap):
         """
         Set region of map (superclass)
 
-        :param region: The region [xmin, ymin, xmax, ymax]
+        :param region: The region [xmin, xmax, ymin, ymax]
         :type region: array_like(4)
         :param value: value to set cells to
         :type value: int, bool, float
@@ -227,6 +276,223 @@ class BaseOccupancyGrid(BaseMap):
         bl = self.w2g([region[0], region[2]])
         tr = self.w2g([region[1], region[3]])
         self.grid[bl[1] : tr[1] + 1, bl[0] : tr[0] + 1] = value
+        self._changed(bl[1], tr[1], bl[0], tr[0])
+
+    def update(self, region=None):
+        """
+        Update after grid changes (superclass)
+
+        :param region: The region [xmin, xmax, ymin, ymax] that has changed, defaults to None
+        :type region: array_like(4), optional
+
+        Data derived from the grid, such as the :meth:`pyramid` and
+        :meth:`distancefield`, is updated automatically by :meth:`set`.  If the array returned by :meth:`grid`
+        is modified directly this method must be called.  If ``region`` is
+        None the whole grid is assumed to have changed.
+        """
+        if region is None:
+            self._pyramid = None
+            self._distance = None
+            self._feature = None
+        else:
+            bl = self.w2g([region[0], region[2]])
+            tr = self.w2g([region[1], region[3]])
+            self._changed(bl[1], tr[1], bl[0], tr[0])
+
+    def _changed(self, r0, r1, c0, c1):
+        # update derived data for a change to rows r0:r1 and columns c0:c1
+        # inclusive
+        h, w = self._grid.shape
+        r0, c0 = max(r0, 0), max(c0, 0)
+        r1, c1 = min(r1, h - 1), min(c1, w - 1)
+        if r0 > r1 or c0 > c1:
+            return
+
+        if self._pyramid is not None:
+            # only the window of each level covering the change is recomputed
+            below = None
+            i0, i1, j0, j1 = r0, r1, c0, c1
+            for level in self._pyramid:
+                i0, i1, j0, j1 = i0 // 2, i1 // 2, j0 // 2, j1 // 2
+                if below is None:
+                    window = self._grid[2 * i0 : 2 * i1 + 2, 2 * j0 : 2 * j1 + 2] > 0
+                else:
+                    window = below[2 * i0 : 2 * i1 + 2, 2 * j0 : 2 * j1 + 2]
+                level[i0 : i1 + 1, j0 : j1 + 1] = self._maxpool(window)
+                below = level
+
+        if self._distance is not None:
+            self._update_distance(r0, r1, c0, c1)
+
+    @staticmethod
+    def _maxpool(a):
+        # 2x2 max pooling, with cells beyond the edge of an odd sized array
+        # considered occupied
+        h, w = a.shape
+        p = np.ones((h + h % 2, w + w % 2), dtype=bool)
+        p[:h, :w] = a
+        return p.reshape((p.shape[0] // 2, 2, p.shape[1] // 2, 2)).any(axis=(1, 3))
+
+    @property
+    def pyramid(self):
+        """
+        Multi-resolution occupancy pyramid (superclass)
+
+        :return: occupancy at successively coarser resolutions
+        :rtype: list of ndarray of bool
+
+        Element ``k`` of the list is a boolean array where each cell covers a
+        square of :math:`2^{k+1}` cells on a side in the occupancy grid, and is
+        True if any of those cells are occupied or lie beyond the edge of the
+        grid.  The last element has a single cell.  The pyramid is used by
+        :meth:`raycast`, :meth:`lines_free` and :meth:`iscollision` to skip
+        over free regions of the grid at coarse resolution.
+
+        The pyramid is computed when first required and then kept up to date
+        by :meth:`set` and :meth:`update`.
+        """
+        if self._pyramid is None:
+            pyramid = []
+            level = self._grid > 0
+            while max(level.shape) > 1:
+                level = self._maxpool(level)
+                pyramid.append(level)
+            self._pyramid = pyramid
+        return self._pyramid
+
+    @property
+    def distancefield(self):
+        """
+        Obstacle distance field (superclass)
+
+        :return: distance from each cell to the nearest occupied cell
+        :rtype: ndarray(N,M)
+
+        Each element is the Euclidean distance, in world units, from the centre
+        of the cell to the centre of the nearest occupied cell.  It is zero for
+        occupied cells and infinite if no cell is occupied.
+
+        The distance field is computed when first required and then kept up
+        to date by :meth:`set` and :meth:`update`, recomputing only the cells
+        whose nearest obstacle may have changed.  It is used by
+        :meth:`~BinaryOccupancyGrid.inflate` and :meth:`costmap` so that
+        obstacles can be inflated by any radius at the cost of a comparison.
+
+        :seealso: :meth:`costmap` :func:`scipy.ndimage.distance_transform_edt`
+        """
+        return self._distancefield() * self._cellsize
+
+    def costmap(self, radius=0, scale=0, decay=1):
+        r"""
+        Graded costmap from occupancy grid (superclass)
+
+        :param radius: radius of the robot in world units, defaults to 0
+        :type radius: float, optional
+        :param scale: additional cost adjacent to inflated obstacles, defaults to 0
+        :type scale: float, optional
+        :param decay: rate at which additional cost decays with distance, defaults to 1
+        :type decay: float, optional
+        :return: traversal cost of each cell
+        :rtype: ndarray(N,M)
+
+        Cells within ``radius`` of an occupied cell, as for
+        :meth:`~BinaryOccupancyGrid.inflate`, have infinite cost.  Other cells
+        have a cost of
+
+        .. math::
+
+            1 + s e^{-\lambda (d - r)}
+
+        where :math:`d` is the distance to the nearest occupied cell, :math:`r`
+        is ``radius``, :math:`s` is ``scale`` and :math:`\lambda` is ``decay``,
+        so that paths are encouraged to keep clear of obstacles.  With the
+        default ``scale`` of zero the cost is one everywhere in free space.
+
+        The result can be passed as the costmap to planners such as
+        :class:`DstarPlanner` and :class:`DstarLitePlanner`.
+
+        :seealso: :meth:`distancefield`
+        """
+        d = self._distancefield()
+        r = round(radius / self._cellsize)
+        cost = 1 + scale * np.exp(-decay * (d - r) * self._cellsize)
+        cost[d <= r] = np.inf
+        return cost
+
+    def _distancefield(self):
+        # distance field in units of cells, and indices of the nearest
+        # occupied cell, computed on demand
+        if self._distance is None:
+            self._distance, self._feature = self._edt(self._grid > 0)
+        return self._distance
+
+    @staticmethod
+    def _edt(occupied):
+        # Euclidean distance transform to the True cells of occupied
+        if not occupied.any():
+            return np.full(occupied.shape, np.inf), np.full(
+                (2,) + occupied.shape, -1, dtype=np.int32
+            )
+        return sp.distance_transform_edt(~occupied, return_indices=True)
+
+    def _update_distance(self, r0, r1, c0, c1):
+        # update the distance field for a change to rows r0:r1 and columns
+        # c0:c1 inclusive.  A cell is unaffected if its nearest obstacle lies
+        # outside the changed region, and is no further away than the
+        # region, so only the other cells are recomputed.
+        d = self._distance
+        h, w = d.shape
+        dmax = d.max()
+        if not np.isfinite(dmax):
+            # there were no obstacles
+            self._distance = None
+            return
+
+        # cells affected by the change are within dmax of the region
+        m = int(np.ceil(dmax))
+        wr0, wr1 = max(r0 - m, 0), min(r1 + m, h - 1)
+        wc0, wc1 = max(c0 - m, 0), min(c1 + m, w - 1)
+        window = np.s_[wr0 : wr1 + 1, wc0 : wc1 + 1]
+        rows, cols = np.ogrid[wr0 : wr1 + 1, wc0 : wc1 + 1]
+        dr = np.maximum(np.maximum(r0 - rows, rows - r1), 0)
+        dc = np.maximum(np.maximum(c0 - cols, cols - c1), 0)
+        fr = self._feature[0][window]
+        fc = self._feature[1][window]
+        affected = (np.sqrt(dr**2 + dc**2) < d[window]) | (
+            (fr >= r0) & (fr <= r1) & (fc >= c0) & (fc <= c1)
+        )
+        i, j = np.nonzero(affected)
+        if len(i) == 0:
+            return
+        i += wr0
+        j += wc0
+
+        # recompute over a window about the affected cells, enlarging it until
+        # no obstacle outside the window could be closer than those found
+        ar0, ar1, ac0, ac1 = i.min(), i.max(), j.min(), j.max()
+        m = int(np.ceil(d[i, j].max())) + 1
+        while True:
+            wr0, wr1 = max(ar0 - m, 0), min(ar1 + m, h - 1)
+            wc0, wc1 = max(ac0 - m, 0), min(ac1 + m, w - 1)
+            dw, fw = self._edt(self._grid[wr0 : wr1 + 1, wc0 : wc1 + 1] > 0)
+            dw = dw[i - wr0, j - wc0]
+
+            limit = np.full(dw.shape, np.inf)
+            if wr0 > 0:
+                limit = np.minimum(limit, i - wr0 + 1)
+            if wr1 < h - 1:
+                limit = np.minimum(limit, wr1 + 1 - i)
+            if wc0 > 0:
+                limit = np.minimum(limit, j - wc0 + 1)
+            if wc1 < w - 1:
+                limit = np.minimum(limit, wc1 + 1 - j)
+            if np.all(dw <= limit):
+                break
+            m *= 2
+
+        d[i, j] = dw
+        self._feature[0][i, j] = fw[0][i - wr0, j - wc0] + wr0
+        self._feature[1][i, j] = fw[1][i - wr0, j - wc0] + wc0
 
     def g2w(self, p):
         """
@@ -321,6 +587,256 @@ class BaseOccupancyGrid(BaseMap):
         z = np.ravel_multi_index(np.vstack((y, x)), self.grid.shape)
         return z
 
+    def isoccupied_many(self, P, bounds=False):
+        """
+        Test if coordinates are occupied (superclass)
+
+        :param P: world coordinates, one per row
+        :type P: ndarray(N,2)
+        :param bounds: also return mask of coordinates within the grid, defaults to False
+        :type bounds: bool, optional
+        :return: occupancy status of corresponding grid cells
+        :rtype: ndarray(N) of bool, or 2-tuple of ndarray(N) of bool
+
+        The coordinates are converted to grid coordinates as for
+        :meth:`w2g`.  A cell is occupied if its value is greater than zero,
+        and coordinates outside the bounds of the occupancy grid are considered
+        to be occupied.  If ``bounds`` is True a second array is returned
+        which is True for coordinates within the bounds of the grid.
+
+        :seealso: :meth:`w2g` :meth:`lines_free`
+        """
+        c, r = self.w2g(np.array(P, dtype=float).reshape((-1, 2))).T
+        h, w = self._grid.shape
+        inside = (c >= 0) & (c < w) & (r >= 0) & (r < h)
+        occupied = np.ones(c.shape, dtype=bool)
+        occupied[inside] = self._grid[r[inside], c[inside]] > 0
+        if bounds:
+            return occupied, inside
+        else:
+            return occupied
+
+    def _traverse(self, u, d, length, grid=None):
+        # Amanatides-Woo DDA traversal of the cells crossed by rays from grid
+        # coordinates u in unit directions d, for a distance of length in grid
+        # units.  Cell (c, r) spans [c - 0.5, c + 0.5) x [r - 0.5, r + 0.5).
+        # Returns the distance along each ray at which it enters the first
+        # occupied cell, inf if none, and a mask of the rays that left the grid.
+        if grid is None:
+            grid = self._grid
+        n = u.shape[0]
+        u = u + 0.5
+        i = np.floor(u).astype(int)
+        step = np.where(d >= 0, 1, -1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tdelta = np.abs(1 / d)
+            tmax = np.where(d > 0, (i + 1 - u) / d, (i - u) / d)
+        tmax[d == 0] = np.inf
+
+        h, w = grid.shape
+        t = np.zeros(n)
+        hit = np.full(n, np.inf)
+        outside = np.zeros(n, dtype=bool)
+        active = np.arange(n)
+        while active.size > 0:
+            c, r = i[active].T
+            inside = (c >= 0) & (c < w) & (r >= 0) & (r < h)
+            outside[active[~inside]] = True
+            active, c, r = active[inside], c[inside], r[inside]
+
+            occupied = grid[r, c] > 0
+            hit[active[occupied]] = t[active[occupied]]
+            active = active[~occupied]
+
+            # step to the next cell along the axis with the nearest boundary
+            k = np.argmin(tmax[active], axis=1)
+            t[active] = tmax[active, k]
+            i[active, k] += step[active, k]
+            tmax[active, k] += tdelta[active, k]
+            active = active[t[active] <= length[active]]
+
+        return hit, outside
+
+    def _ray_cells(self, u1, u2):
+        # Amanatides-Woo DDA traversal of the cells crossed by the segments
+        # from grid coordinates u1 to u2, as for _traverse.  Returns the raveled
+        # indices of the cells within the grid that are crossed before the
+        # cell containing u2, there are repeats if the segments cross.
+        u1 = u1 + 0.5
+        d = u2 + 0.5 - u1
+        i = np.floor(u1).astype(int)
+        nsteps = np.abs(np.floor(u2 + 0.5).astype(int) - i).sum(axis=1)
+        step = np.where(d >= 0, 1, -1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tdelta = np.abs(1 / d)
+            tmax = np.where(d > 0, (i + 1 - u1) / d, (i - u1) / d)
+        tmax[d == 0] = np.inf
+
+        h, w = self._grid.shape
+        cells = []
+        active = np.flatnonzero(nsteps > 0)
+        for s in range(nsteps.max(initial=0)):
+            c, r = i[active].T
+            inside = (c >= 0) & (c < w) & (r >= 0) & (r < h)
+            cells.append(r[inside] * w + c[inside])
+
+            # step to the next cell along the axis with the nearest boundary
+            k = np.argmin(tmax[active], axis=1)
+            i[active, k] += step[active, k]
+            tmax[active, k] += tdelta[active, k]
+            active = active[nsteps[active] > s + 1]
+
+        return np.concatenate(cells) if cells else np.zeros((0,), dtype=int)
+
+    def _traverse_pyramid(self, u, d, length):
+        # as for _traverse but first traverse the coarse levels of the pyramid
+        # from the top down, rays that are free at any level are done and the
+        # others are advanced to the first occupied cell before descending
+        u = u.copy()
+        length = length.copy()
+        hit = np.full(u.shape[0], np.inf)
+        outside = np.zeros(u.shape[0], dtype=bool)
+        advance = np.zeros(u.shape[0])
+        todo = np.arange(u.shape[0])
+        for k in reversed(range(len(self.pyramid))):
+            s = 2 ** (k + 1)
+            h, o = self._traverse(
+                (u[todo] + 0.5) / s - 0.5, d[todo], length[todo] / s, self.pyramid[k]
+            )
+            outside[todo[o]] = True
+            todo = todo[~np.isinf(h) & ~o]
+            h = h[~np.isinf(h) & ~o] * s
+            advance[todo] += h
+            u[todo] += d[todo] * h[:, np.newaxis]
+            length[todo] -= h
+
+        h, o = self._traverse(u[todo], d[todo], length[todo])
+        hit[todo] = advance[todo] + h
+        outside[todo] = o
+        return hit, outside
+
+    def raycast(self, origins, angles, maxrange=None):
+        """
+        Range to obstacles along rays (superclass)
+
+        :param origins: world coordinates of ray origins, one per row
+        :type origins: array_like(2) or ndarray(N,2)
+        :param angles: ray directions in radians
+        :type angles: float or array_like(N)
+        :param maxrange: maximum range, defaults to None
+        :type maxrange: float, optional
+        :return: range to the first occupied cell along each ray
+        :rtype: ndarray(N)
+
+        All the rays are traced through the grid together, using the
+        Amanatides-Woo voxel traversal algorithm.  A cell is occupied if its
+        value is greater than zero.  The range is the distance from the origin
+        to the boundary of the first occupied cell that the ray enters, and is
+        zero if the origin lies in an occupied cell.  The range is ``nan`` if
+        the ray leaves the grid, or travels further than ``maxrange``, without
+        entering an occupied cell.
+
+        A single origin, or a single angle, is broadcast over the rays.
+
+        :seealso: :meth:`lines_free`
+        """
+        origins = np.array(origins, dtype=float).reshape((-1, 2))
+        angles = np.array(angles, dtype=float).ravel()
+        n = max(origins.shape[0], angles.shape[0])
+        origins = np.broadcast_to(origins, (n, 2))
+        angles = np.broadcast_to(angles, (n,))
+
+        if maxrange is None:
+            length = np.full(n, np.inf)
+        else:
+            length = np.full(n, maxrange / self._cellsize)
+
+        u = (origins - self._origin) / self._cellsize
+        d = np.column_stack((np.cos(angles), np.sin(angles)))
+        hit, _ = self._traverse_pyramid(u, d, length)
+
+        range = hit * self._cellsize
+        range[np.isinf(hit)] = np.nan
+        return range
+
+    def lines_free(self, P1, P2):
+        """
+        Test if line segments are obstacle free (superclass)
+
+        :param P1: world coordinates of segment start points, one per row
+        :type P1: ndarray(N,2)
+        :param P2: world coordinates of segment end points, one per row
+        :type P2: ndarray(N,2)
+        :return: obstacle free status of each segment
+        :rtype: ndarray(N) of bool
+
+        A segment is free if every grid cell that it passes through has a
+        value of zero or less, and it lies entirely within the bounds of the
+        grid.  All the segments are traced through the grid together.
+
+        :seealso: :meth:`raycast` :meth:`isoccupied_many`
+        """
+        u1 = (
+            np.array(P1, dtype=float).reshape((-1, 2)) - self._origin
+        ) / self._cellsize
+        u2 = (
+            np.array(P2, dtype=float).reshape((-1, 2)) - self._origin
+        ) / self._cellsize
+        length = np.linalg.norm(u2 - u1, axis=1)
+        d = np.zeros(u1.shape)
+        d[:, 0] = 1
+        k = length > 0
+        d[k] = (u2 - u1)[k] / length[k, np.newaxis]
+
+        hit, outside = self._traverse_pyramid(u1, d, length)
+        return np.isinf(hit) & ~outside
+
+    def iscollision(self, polygon):
+        """
+        Test for collision (superclass)
+
+        :param polygon: a polygon
+        :type polygon: :class:`~spatialmath.geom2d.Polygon2` or ndarray(2,N)
+        :return: collision
+        :rtype: bool
+
+        The ``polygon`` collides if it overlaps any occupied cell, or extends
+        beyond the bounds of the grid.  The cells within its bounding box are
+        tested at successively finer levels of the :meth:`pyramid`, and the
+        test ends as soon as they are all free.  Otherwise the occupied cells
+        are tested for overlap with the polygon, ie. their centre lies inside
+        the polygon or an edge of the polygon passes through them.
+
+        This allows an occupancy grid to be used as the map for
+        :class:`~roboticstoolbox.mobile.RRTPlanner`.
+
+        :seealso: :meth:`pyramid` :meth:`lines_free` :meth:`PolygonMap.iscollision`
+        """
+        if not isinstance(polygon, Polygon2):
+            polygon = Polygon2(polygon)
+        vertices = polygon.vertices().T
+
+        u = (vertices - self._origin) / self._cellsize
+        c0, r0 = np.floor(u.min(axis=0) + 0.5).astype(int)
+        c1, r1 = np.floor(u.max(axis=0) + 0.5).astype(int)
+        h, w = self._grid.shape
+        if c0 < 0 or r0 < 0 or c1 >= w or r1 >= h:
+            return True
+
+        for k in reversed(range(len(self.pyramid))):
+            s = 2 ** (k + 1)
+            if not self.pyramid[k][r0 // s : r1 // s + 1, c0 // s : c1 // s + 1].any():
+                return False
+
+        r, c = np.nonzero(self._grid[r0 : r1 + 1, c0 : c1 + 1] > 0)
+        if len(r) == 0:
+            return False
+        centres = np.column_stack((c + c0, r + r0)) * self._cellsize + self._origin
+        if np.any(polygon.contains(centres.T)):
+            return True
+
+        return not self.lines_free(vertices, np.roll(vertices, -1, axis=0)).all()
+
     @property
     def ravel(self):
         """
@@ -413,21 +929,43 @@ class BinaryOccupancyGrid(BaseOccupancyGrid):
         :param radius: radius of circular structuring element in world units
         :type radius: float
 
-        A circular structuring element is created and used to dilate the
-        stored occupancy grid.
+        Cells within ``radius`` of an occupied cell, which is equivalent to
+        dilation by a circular structuring element, are set to occupied.  The
+        stored occupancy grid is modified.
 
         Successive calls to ``inflate`` will compound the inflation.
 
-        :seealso: :func:`scipy.ndimage.binary_dilation`
+        :seealso: :meth:`inflated` :meth:`distancefield`
         """
-        # Generate a circular structuring element
-        r = round(radius / self._cellsize)
-        Y, X = np.meshgrid(np.arange(-r, r + 1), np.arange(-r, r + 1))
-        SE = X**2 + Y**2 <= r**2
-        SE = SE.astype(int)
+        self._grid = self._inflation(radius)
+        self.update()
 
-        # do the inflation using SciPy
-        self._grid = sp.binary_dilation(self._grid, SE)
+    def inflated(self, radius):
+        """
+        Inflated copy of occupancy grid
+
+        :param radius: radius of circular structuring element in world units
+        :type radius: float
+        :return: occupancy grid with inflated obstacles
+        :rtype: BinaryOccupancyGrid
+
+        As for :meth:`inflate` but the stored occupancy grid is not modified.
+        The distance field of this grid is reused, so inflated grids for
+        several different radii can be obtained cheaply.
+
+        :seealso: :meth:`inflate` :meth:`distancefield`
+        """
+        return self.__class__(
+            self._inflation(radius),
+            cellsize=self._cellsize,
+            origin=self._origin,
+            name=self._name,
+        )
+
+    def _inflation(self, radius):
+        # cells within radius, rounded to a whole number of cells, of an
+        # occupied cell
+        return self._distancefield() <= round(radius / self._cellsize)
 
 
 class OccupancyGrid(BaseOccupancyGrid):
@@ -486,10 +1024,17 @@ class PolygonMap(BaseMap):
         ==============  =======  =======
 
         Workspace is used only to set plot bounds.
+
+        The bounding box of each obstacle is kept so that collision tests
+        need only consider obstacles whose bounding box overlaps that of the
+        polygon being tested.
         """
         super().__init__(workspace=workspace)
 
-        self.polygons = polygons
+        self.polygons = []
+        self._bbox = np.empty((0, 4))
+        for polygon in polygons:
+            self.add(polygon)
 
     def add(self, polygon):
         """
@@ -499,12 +1044,10 @@ class PolygonMap(BaseMap):
         :type polygon: :class:`~spatialmath.geom2d.Polygon2` or ndarray(2,N)
         """
 
-        if isinstance(polygon, Polygon2):
-            self.polygons.append(polygon)  # lgtm [py/modification-of-default-value]
-        else:
-            self.polygons.append(
-                Polygon2(polygon)
-            )  # lgtm [py/modification-of-default-value]
+        if not isinstance(polygon, Polygon2):
+            polygon = Polygon2(polygon)
+        self.polygons.append(polygon)
+        self._bbox = np.vstack((self._bbox, _bbox(polygon.vertices().T)))
 
     def iscollision(self, polygon):
         """
@@ -518,9 +1061,71 @@ class PolygonMap(BaseMap):
         The ``polygon`` is tested against polygons in the map, and returns True
         on the first collision.
 
-        :seealso: :meth:`add` :class:`~spatialmath.geom2d.Polygon2`
+        :seealso: :meth:`add` :meth:`iscollision_path` :class:`~spatialmath.geom2d.Polygon2`
         """
-        return polygon.intersects(self.polygons)
+        if not isinstance(polygon, Polygon2):
+            polygon = Polygon2(polygon)
+        for i in self._overlapping(_bbox(polygon.vertices().T)):
+            if polygon.path.intersects_path(self.polygons[i].path, filled=True):
+                return True
+        return False
+
+    def iscollision_path(self, footprint, path):
+        r"""
+        Test for collision along a path
+
+        :param footprint: outline of the vehicle in its own frame
+        :type footprint: :class:`~spatialmath.geom2d.Polygon2` or ndarray(2,N)
+        :param path: vehicle configurations :math:`(x, y, \theta)`
+        :type path: array_like(M,3)
+        :return: collision
+        :rtype: bool
+
+        The ``footprint`` is transformed to each configuration along the
+        ``path`` in turn and tested for collision with the obstacles, returning
+        True on the first collision.  The transformation, and the comparison
+        of bounding boxes, is performed for all configurations at once and
+        only configurations whose bounding box overlaps that of an obstacle
+        are tested exactly.
+
+        Example::
+
+            footprint = vehicle.polygon((0, 0, 0))
+            map.iscollision_path(footprint, path)
+
+        :seealso: :meth:`iscollision`
+        """
+        V = _footprints(footprint, path)
+        bbox = np.column_stack(
+            (
+                V[..., 0].min(axis=1),
+                V[..., 0].max(axis=1),
+                V[..., 1].min(axis=1),
+                V[..., 1].max(axis=1),
+            )
+        )
+        overlap = self._overlaps(bbox)
+        for k in np.flatnonzero(overlap.any(axis=1)):
+            vpath = Path(np.vstack((V[k], V[k, 0])), closed=True)
+            for i in np.flatnonzero(overlap[k]):
+                if vpath.intersects_path(self.polygons[i].path, filled=True):
+                    return True
+        return False
+
+    def _overlaps(self, bbox):
+        # overlap of bounding boxes bbox (M,4) with those of the obstacles,
+        # as an ndarray(M,N) of bool
+        bbox = np.atleast_2d(bbox)[:, np.newaxis, :]
+        return (
+            (bbox[..., 0] <= self._bbox[:, 1])
+            & (bbox[..., 1] >= self._bbox[:, 0])
+            & (bbox[..., 2] <= self._bbox[:, 3])
+            & (bbox[..., 3] >= self._bbox[:, 2])
+        )
+
+    def _overlapping(self, bbox):
+        # indices of obstacles whose bounding box overlaps bbox
+        return np.flatnonzero(self._overlaps(bbox)[0])
 
     def plot(self, block=None):
         smb.plotvol2(self.workspace)
@@ -543,8 +1148,9 @@ class PolygonMap(BaseMap):
         The point is tested for enclosure by polygons in the map, and returns True
         on the first enclosure.
         """
-        for polygon in self.polygons:
-            if polygon.contains(p):
+        p = smb.getvector(p, 2)
+        for i in self._overlapping(np.r_[p[0], p[0], p[1], p[1]]):
+            if self.polygons[i].contains(p):
                 return True
 
         return False
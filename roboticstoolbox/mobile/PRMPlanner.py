@@ -13,6 +13,7 @@ from spatialmath.base.vectors import *
 # from spatialmath.pose2d import SE2
 # from spatialmath.base import animate
 from scipy.ndimage import *
+from scipy.spatial import cKDTree
 from matplotlib import cm, pyplot as plt
 from roboticstoolbox.mobile.PlannerBase import PlannerBase
 from pgraph import UGraph
@@ -32,6 +33,9 @@ class PRMPlanner(PlannerBase):
         roadmap if it is closer than this distance to an existing vertex,
         defaults to None
     :type dist_thresh: float, optional
+    :param k: maximum number of neighbours a new point is connected to,
+        defaults to None (all within ``dist_thresh``)
+    :type k: int, optional
     :param Planner: probabilistic roadmap path planner
     :param kwargs: common planner options, see :class:`PlannerBase`
 
@@ -64,13 +68,18 @@ class PRMPlanner(PlannerBase):
     :seealso: :class:`PlannerBase`
     """
 
-    def __init__(self, occgrid=None, npoints=100, dist_thresh=None, **kwargs):
+    def __init__(self, occgrid=None, npoints=100, dist_thresh=None, k=None, **kwargs):
         super().__init__(occgrid, ndims=2, **kwargs)
 
         if dist_thresh is None:
-            self._dist_thresh = 0.3 * self.occgrid.maxdim
+            dist_thresh = 0.3 * self.occgrid.maxdim
+        self._dist_thresh = dist_thresh
 
         self._npoints = npoints
+        self._k = k
+        self._coords = np.zeros((0, 2))
+        self._vertices = []
+        self._tree = None
         # self._npoints0 = npoints
         self._dist_thresh0 = self.dist_thresh
         self._graph = None
@@ -129,70 +138,71 @@ class PRMPlanner(PlannerBase):
         return self._graph
 
     def _create_roadmap(self, npoints, dist_thresh, animate=None):
-        # a = Animate(animate, fps=5)
-        self.progress_start(npoints)
-
-        x = None
-        y = None
-        for j in range(npoints):
-            # find a random point in freespace
-            while True:
-                # pick a random unoccupied point
-                x = self.random.uniform(self.occgrid.xmin, self.occgrid.xmax)
-                y = self.random.uniform(self.occgrid.ymin, self.occgrid.ymax)
-                if not self.occgrid.isoccupied((x, y)):
-                    break
-
-            # add it as a vertex to the graph
-            vnew = self.graph.add_vertex([x, y])
-
-        # compute distance between vertices
-        for vertex in self.graph:
-            # find distance from vertex to all other vertices
-            distances = []
-            for othervertex in self.graph:
-                # skip self
-                if vertex is othervertex:
-                    continue
-                # add (distance, vertex) tuples to list
-                distances.append((vertex.distance(othervertex), othervertex))
-
-            # sort into ascending distance
-            distances.sort(key=lambda x: x[0])
-
-            # create edges to vertex if permissible
-            for distance, othervertex in distances:
-                # test if below distance threshold
-                if dist_thresh is not None and distance > dist_thresh:
-                    break  # sorted into ascending order, so we are done
-
-                # test if obstacle free path connecting them
-                if self._test_path(vertex, othervertex):
-                    # add an edge
-                    self.graph.add_edge(vertex, othervertex, cost=distance)
+        # add npoints random free points to the roadmap and connect them to
+        # the existing and other new vertices
+        nold = len(self._vertices)
+        coords = self._sample_free(npoints)
+        self._vertices.extend([self.graph.add_vertex(p) for p in coords])
+        self._coords = np.vstack((self._coords, coords))
+        self._tree = cKDTree(self._coords)
+
+        # candidate edges, each pair once with at least one new vertex
+        pairs = self._neighbours(nold, dist_thresh, self._k)
+
+        self.progress_start(len(pairs) // 1000 + 1)
+        for chunk in np.array_split(pairs, len(pairs) // 1000 + 1):
+            free = self.occgrid.lines_free(
+                self._coords[chunk[:, 0]], self._coords[chunk[:, 1]]
+            )
+            d = np.linalg.norm(
+                self._coords[chunk[:, 0]] - self._coords[chunk[:, 1]], axis=1
+            )
+            for (i, j), dij in zip(chunk[free], d[free]):
+                self.graph.add_edge(self._vertices[i], self._vertices[j], cost=dij)
             self.progress_next()
-
         self.progress_end()
-        # if animate is not None:
-        #     self.plot()
-        #     if not np.empty(movie):
-        #         a.add()
-
-    def _test_path(self, v1, v2, npoints=None):
-        # vector from v1 to v2
-        dir = v2.coord - v1.coord
 
-        # figure the number of points, essentially the line length
-        # TODO: should delegate this test to the OccGrid object and do it
-        # world units
-        if npoints is None:
-            npoints = int(round(np.linalg.norm(dir)))
+    def _sample_free(self, npoints):
+        # random points in free space, drawn in batches
+        points = np.zeros((0, 2))
+        low = (self.occgrid.xmin, self.occgrid.ymin)
+        high = (self.occgrid.xmax, self.occgrid.ymax)
+        while points.shape[0] < npoints:
+            p = self.random.uniform(low, high, size=(npoints, 2))
+            points = np.vstack((points, p[~self.occgrid.isoccupied_many(p)]))
+        return points[:npoints]
+
+    def _neighbours(self, nold, dist_thresh, k=None):
+        # vertex index pairs (i, j), i < j, closer than dist_thresh where j is
+        # a vertex added after the first nold vertices.  If k is given only
+        # the k nearest neighbours of each new vertex are considered
+        n = self._coords.shape[0]
+        new = self._coords[nold:]
+        if dist_thresh is None:
+            dist_thresh = np.inf
+
+        if k is None:
+            if nold == 0 and np.isfinite(dist_thresh):
+                return self._tree.query_pairs(dist_thresh, output_type="ndarray")
+            near = self._tree.query_ball_point(new, dist_thresh)
+            i = np.concatenate(
+                [np.array(v, dtype=int) for v in near] + [np.zeros(0, int)]
+            )
+            j = np.repeat(np.arange(nold, n), [len(v) for v in near])
+        else:
+            k = min(k + 1, n)
+            _, near = self._tree.query(new, k, distance_upper_bound=dist_thresh)
+            near = np.reshape(near, (new.shape[0], k))
+            j = np.repeat(np.arange(nold, n), k)
+            i = near.ravel()
+
+        pairs = np.column_stack((np.minimum(i, j), np.maximum(i, j)))
+        pairs = pairs[(i != j) & (i < n)]
+        return np.unique(pairs, axis=0).reshape((-1, 2))
 
-        # test each point along the line from v1 to v2
-        for s in np.linspace(0, 1, npoints):
-            if self.occgrid.isoccupied(v1.coord + s * dir):
-                return False
-        return True
+    def _test_path(self, v1, v2, npoints=None):
+        # test if the straight line between two vertices is obstacle free
+        return self.occgrid.lines_free(v1.coord, v2.coord)[0]
 
     def plan(self, npoints=None, dist_thresh=None, animate=None):
         """
@@ -212,6 +222,12 @@ class PRMPlanner(PlannerBase):
         created between points if the distance between them is less than
         ``dist_thresh``.
 
+        The points are sampled in batches and the neighbours of every point
+        are found with a KD-tree, limited to the ``k`` nearest if ``k`` was
+        given to the constructor.  All candidate edges are then tested for
+        obstacles together, by tracing every grid cell that they pass through
+        using :meth:`~roboticstoolbox.mobile.OccGrid.BaseOccupancyGrid.lines_free`.
+
         The roadmap is a pgraph :obj:`~pgraph.PGraph.UGraph`
         :class:`~pgraph.UGraph`
         :class:`~pgraph.PGraph.UGraph`
@@ -229,10 +245,37 @@ class PRMPlanner(PlannerBase):
 
         self._graph = UGraph()
         self._v_path = np.array([])
+        self._coords = np.zeros((0, 2))
+        self._vertices = []
 
         self.random_init()  # reset the random number generator
         self._create_roadmap(npoints, dist_thresh, animate)
 
+    def grow(self, npoints, dist_thresh=None):
+        """
+        Add points to the PRM roadmap
+
+        :param npoints: number of random points to add
+        :type npoints: int
+        :param dist_thresh: distance threshold, defaults to ``dist_thresh``
+            given to constructor
+        :type dist_thresh: float, optional
+
+        The roadmap created by :meth:`plan` is extended with ``npoints`` more
+        random points from the free space.  Only edges that involve a new
+        point are tested so the existing roadmap is not rebuilt, and the
+        random number generator continues from its current state.
+
+        :seealso: :meth:`plan`
+        """
+        if self.graph is None:
+            raise RuntimeError("no plan computed")
+
+        if dist_thresh is None:
+            dist_thresh = self.dist_thresh
+
+        self._create_roadmap(npoints, dist_thresh)
+
     def query(self, start, goal, **kwargs):
         """
         Find a path from start to goal using planner
@@ -259,8 +302,9 @@ class PRMPlanner(PlannerBase):
         super().query(start=start, goal=goal, next=False, **kwargs)
 
         # find roadmap vertices closest to start and goal
-        vstart, _ = self.graph.closest(self.start)
-        vgoal, _ = self.graph.closest(self.goal)
+        _, (istart, igoal) = self._tree.query([self.start, self.goal])
+        vstart = self._vertices[istart]
+        vgoal = self._vertices[igoal]
 
         # find A* path through the roadmap
         out = self.graph.path_Astar(vstart, vgoal)
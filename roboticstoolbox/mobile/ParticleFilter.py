@@ -18,6 +18,8 @@ from matplotlib import animation
 
 import spatialmath.base as smb
 
+from roboticstoolbox.mobile.History import History
+
 """
 Monte-carlo based localisation for estimating vehicle pose based on
 odometry and observations of known landmarks.
@@ -40,8 +42,11 @@ class ParticleFilter:
         animate=False,
         history=True,
         workspace=None,
+        resample="systematic",
+        ess=None,
+        kld=None,
     ):
-        """
+        r"""
         Particle filter
 
         :param robot: robot motion model
@@ -61,9 +66,18 @@ class ParticleFilter:
         :param verbose: display extra debug information, defaults to False
         :type verbose: bool, optional
         :param history: retain step-by-step history, defaults to True
-        :type history: bool, optional
+        :type history: bool or :class:`History`, optional
         :param workspace: dimension of workspace, see :func:`~spatialmath.base.graphics.expand_dims`
         :type workspace: scalar, array_like(2), array_like(4)
+        :param resample: resampling method "systematic", "stratified" or
+            "multinomial", defaults to "systematic"
+        :type resample: str, optional
+        :param ess: resample only when the effective sample size is less than
+            this fraction of the number of particles, defaults to None
+        :type ess: float, optional
+        :param kld: adapt the number of particles by KLD-sampling, defaults to None
+        :type kld: bool or dict, optional
+        :raises ValueError: unknown resampling method
 
         This class implements a Monte-Carlo estimator or particle filter for
         vehicle state, based on odometry, a landmark map, and landmark
@@ -85,6 +99,43 @@ class ParticleFilter:
 
         Particles are initially distributed uniform randomly over this area.
 
+        Particle weights are kept as logarithms, and at every step with an
+        observation the particles are resampled in proportion to their weights:
+
+        - "systematic" uses a single random offset for :math:`N` equally spaced
+          points on the cumulative weight, it has the lowest variance
+        - "stratified" uses one random point in each of :math:`N` equal
+          intervals of the cumulative weight
+        - "multinomial" uses :math:`N` independent random points.
+
+        If ``ess`` is given resampling only occurs when the effective sample size
+        :math:`1 / \sum_i w_i^2` falls below ``ess`` times the number of
+        particles, otherwise the weights accumulate and the estimate is the
+        weighted mean of the particles.
+
+        If ``kld`` is given the number of particles is adapted at each
+        resampling so that, with probability :math:`1-\delta`, the
+        Kullback-Leibler divergence between the particle and true
+        distributions is less than :math:`\epsilon` [Fox 2003].  Particles are
+        drawn until their number exceeds a bound that grows with the number of
+        occupied bins of a grid over the state space.  ``kld`` is True, or a
+        dict with any of the keys:
+
+        ============  =================================================  ===================
+        key           meaning                                            default
+        ============  =================================================  ===================
+        ``epsilon``   bound on the KL divergence :math:`\epsilon`        0.05
+        ``delta``     probability :math:`\delta`                         0.01
+        ``binsize``   grid size for :math:`(x, y, \theta)`               (0.5, 0.5, 0.175)
+        ``nmin``      minimum number of particles                        100
+        ============  =================================================  ===================
+
+        and ``nparticles`` is the maximum number of particles.
+
+        If the sensor returns all visible landmarks at each step, see the
+        ``batch`` option of :class:`RangeBearingSensor`, the weight of each
+        particle is the product of its likelihoods for each landmark.
+
         Example::
 
             V = np.diag([0.02, np.radians(0.5)]) ** 2
@@ -110,6 +161,10 @@ class ParticleFilter:
 
         .. note:: Set ``seed=0`` to get different behaviour from run to run.
 
+        :References:
+            - Adapting the Sample Size in Particle Filters Through KLD-Sampling,
+              D. Fox, International Journal of Robotics Research, 22(12), 2003.
+
         :seealso: :meth:`run`
         """
         self._robot = robot
@@ -117,10 +172,26 @@ class ParticleFilter:
         self.R = R
         self.L = L
         self.nparticles = nparticles
+        self._nparticles = nparticles  # initial, or maximum, number of particles
         self._animate = animate
 
+        if resample not in ("systematic", "stratified", "multinomial"):
+            raise ValueError(f"unknown resampling method {resample}")
+        self._resample = resample
+        self._ess = ess
+        if kld is True:
+            kld = {}
+        if kld is not None:
+            kld = {
+                "epsilon": 0.05,
+                "delta": 0.01,
+                "binsize": (0.5, 0.5, 0.175),
+                "nmin": 100,
+                **kld,
+            }
+        self._kld = kld
+
         # self.dim = sensor.map.dim
-        self._history = []
         self.x = ()
         self.weight = ()
         self.w0 = 0.05
@@ -130,7 +201,11 @@ class ParticleFilter:
         self._random = np.random.default_rng(seed)
         self._seed = seed
 
-        self._keep_history = history  #  keep history
+        # history recorder, a list that stays empty if not keeping history
+        if history is True:
+            history = History()
+        self._keep_history = isinstance(history, History)  #  keep history
+        self._history = history if self._keep_history else []
         self._htuple = namedtuple("PFlog", "t odo xest std weights")
 
         if workspace is not None:
@@ -209,14 +284,16 @@ class ParticleFilter:
         Get EKF simulation history
 
         :return: simulation history
-        :rtype: list of namedtuples
+        :rtype: :class:`History` of namedtuples
 
         At each simulation timestep a namedtuple of is appended to the history
         list.  It contains, for that time step, estimated state and covariance,
-        and sensor observation.
+        and sensor observation.  What is kept is determined by the
+        :class:`History` passed to the constructor, for a large number of
+        particles the ``weights`` field can be excluded.
 
         :seealso: :meth:`get_t` :meth:`get_xy` :meth:`get_std`
-            :meth:`get_Pnorm`
+            :meth:`get_Pnorm` :class:`History`
         """
         return self._history
 
@@ -270,13 +347,15 @@ class ParticleFilter:
         self.sensor.init()
 
         # clear the history
-        self._history = []
+        if self._keep_history:
+            self._history.clear()
 
         # create a new private random number generator
         if self._seed is not None:
             self._random = np.random.default_rng(self._seed)
 
         self._t = 0
+        self.nparticles = self._nparticles
 
         # initialize particles
         if x0 is None:
@@ -307,6 +386,7 @@ class ParticleFilter:
             )
 
         self.weight = np.ones((self.nparticles,))
+        self._logw = np.zeros((self.nparticles,))
 
     def run(self, T=10, x0=None):
         """
@@ -360,7 +440,8 @@ class ParticleFilter:
         for i in range(round(T / self.robot.dt)):
             self._step()
             # time.sleep(0.2)
-            plt.pause(0.2)
+            if self._animate:
+                plt.pause(0.2)
             # plt.draw()
             # anim.add()
         # anim.close()
@@ -507,14 +588,17 @@ class ParticleFilter:
 
             self._select()
 
-        # our estimate is simply the mean of the particles
-        x_est = self.x.mean(axis=0)
-        std_est = self.x.std(axis=0)
+        # our estimate is the weighted mean of the particles, the weights are
+        # equal after resampling
+        w = np.exp(self._logw - self._logw.max())
+        w /= w.sum()
+        x_est = w @ self.x
+        std_est = np.sqrt(w @ (self.x - x_est) ** 2)
 
         # std is more complex for angles, need to account for 2pi wrap
-        std_est[2] = np.sqrt(np.sum(smb.angdiff(self.x[:, 2], x_est[2]) ** 2)) / (
-            self.nparticles - 1
-        )
+        std_est[2] = np.sqrt(
+            self.nparticles * (w @ smb.angdiff(self.x[:, 2], x_est[2]) ** 2)
+        ) / (self.nparticles - 1)
 
         # display the updated particles
         # set(self.h, 'Xdata', self.x(:,1), 'Ydata', self.x(:,2), 'Zdata', self.x(:,3))
@@ -527,9 +611,7 @@ class ParticleFilter:
         #     self.anim.add()
 
         if self._keep_history:
-            hist = self._htuple(
-                self.robot._t, odo.copy(), x_est, std_est, self.weight.copy()
-            )
+            hist = self._htuple(self.robot._t, odo, x_est, std_est, self.weight)
             self._history.append(hist)
 
     def plot_pdf(self):
@@ -599,16 +681,36 @@ class ParticleFilter:
         # Vectorized code:
 
         invL = np.linalg.inv(self.L)
-        z_pred = self.sensor.h(self.x, lm_id)
-        z_pred[:, 0] = z[0] - z_pred[:, 0]
-        z_pred[:, 1] = smb.angdiff(z[1], z_pred[:, 1])
-
-        LL = -0.5 * np.r_[invL[0, 0], invL[1, 1], 2 * invL[0, 1]]
-        e = (
-            np.c_[z_pred[:, 0] ** 2, z_pred[:, 1] ** 2, z_pred[:, 0] * z_pred[:, 1]]
-            @ LL
-        )
-        self.weight = np.exp(e) + self.w0
+
+        if np.ndim(z) == 2:
+            # a batch of readings of k landmarks, the innovation is computed
+            # for all particles and landmarks as an ndarray(N,k,2), and the
+            # particle weight is the product of the per-landmark likelihoods
+            z_pred = np.stack([self.sensor.h(self.x, id) for id in lm_id], axis=1)
+            innov = np.empty(z_pred.shape)
+            innov[..., 0] = z[:, 0] - z_pred[..., 0]
+            innov[..., 1] = np.mod(z[:, 1] - z_pred[..., 1] + np.pi, 2 * np.pi) - np.pi
+
+            e = -0.5 * np.einsum("nki,ij,nkj->nk", innov, invL, innov)
+            loglik = np.logaddexp(e, np.log(self.w0)).sum(axis=1)
+        else:
+            z_pred = self.sensor.h(self.x, lm_id)
+            z_pred[:, 0] = z[0] - z_pred[:, 0]
+            z_pred[:, 1] = smb.angdiff(z[1], z_pred[:, 1])
+
+            LL = -0.5 * np.r_[invL[0, 0], invL[1, 1], 2 * invL[0, 1]]
+            e = (
+                np.c_[z_pred[:, 0] ** 2, z_pred[:, 1] ** 2, z_pred[:, 0] * z_pred[:, 1]]
+                @ LL
+            )
+            # log of exp(e) + w0
+            loglik = np.logaddexp(e, np.log(self.w0))
+
+        # accumulate the log weights, and normalize so the largest is zero
+        self._logw += loglik
+        self._logw -= self._logw.max()
+        self.weight = np.exp(self._logw)
+        self.weight /= self.weight.sum()
 
     def _select(self):
         # step 4
@@ -616,24 +718,62 @@ class ParticleFilter:
         #
         # particles with large weights will occupy a greater percentage of the
         # y axis in a cummulative plot
-        cdf = np.cumsum(self.weight) / self.weight.sum()
-
-        # so randomly (uniform) choosing y values is more likely to correspond to
-        # better particles...
-        iselect = self.random.uniform(0, 1, size=(self.nparticles,))
-
-        # find the particle that corresponds to each y value (just a look up)
-        interpfun = sp.interpolate.interp1d(
-            cdf,
-            np.arange(self.nparticles),
-            assume_sorted=True,
-            kind="nearest",
-            fill_value="extrapolate",
-        )
-        inextgen = interpfun(iselect).astype(int)
-
-        # copy selected particles for next generation..
+        if self._ess is not None:
+            # only resample if the effective sample size is small
+            if 1.0 / np.sum(self.weight**2) >= self._ess * self.nparticles:
+                return
+
+        cdf = np.cumsum(self.weight)
+        cdf /= cdf[-1]
+
+        # so choosing y values is more likely to correspond to better
+        # particles, find the particle that corresponds to each y value
+        n = self._nparticles if self._kld is not None else self.nparticles
+        inextgen = np.searchsorted(cdf, self._uniform(n), side="right")
+        inextgen = np.minimum(inextgen, len(cdf) - 1)
+
+        if self._kld is not None:
+            inextgen = inextgen[self.random.permutation(n)]
+            inextgen = inextgen[: self._kld_size(self.x[inextgen, :])]
+
+        # copy selected particles for next generation, their weights are now
+        # equal
         self.x = self.x[inextgen, :]
+        self.nparticles = len(inextgen)
+        self._logw = np.zeros((self.nparticles,))
+        self.weight = np.full((self.nparticles,), 1 / self.nparticles)
+
+    def _uniform(self, n):
+        # n sorted points in [0, 1) for the chosen resampling method
+        if self._resample == "systematic":
+            return (np.arange(n) + self.random.uniform()) / n
+        elif self._resample == "stratified":
+            return (np.arange(n) + self.random.uniform(size=(n,))) / n
+        else:
+            return np.sort(self.random.uniform(size=(n,)))
+
+    def _kld_size(self, x):
+        # the number of the particles x, in order, to keep for KLD-sampling.
+        # Find the number of distinct bins occupied by the first n particles,
+        # and the smallest n that exceeds the bound for that many bins
+        bins = np.floor(x / self._kld["binsize"]).astype(np.int64)
+        bins -= bins.min(axis=0)
+        size = bins.max(axis=0) + 1
+        key = (bins[:, 0] * size[1] + bins[:, 1]) * size[2] + bins[:, 2]
+        _, first = np.unique(key, return_index=True)
+        isnew = np.zeros((len(x),), dtype=bool)
+        isnew[first] = True
+        k = np.maximum(np.cumsum(isnew) - 1, 1)  # number of bins - 1
+
+        a = 2 / (9 * k)
+        z = sp.stats.norm.ppf(1 - self._kld["delta"])
+        nbound = k / (2 * self._kld["epsilon"]) * (1 - a + np.sqrt(a) * z) ** 3
+
+        n = np.arange(1, len(x) + 1)
+        enough = (n >= nbound) & (n >= self._kld["nmin"])
+        if not np.any(enough):
+            return len(x)
+        return np.argmax(enough) + 1
 
     def get_t(self):
         """
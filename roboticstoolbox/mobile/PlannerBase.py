@@ -109,8 +109,8 @@ class PlannerBase(ABC):
                 self._occgrid = occgrid  # original occgrid for reference
 
             if inflate > 0:
-                self._occgrid0 = self._occgrid.copy()
-                self._occgrid.inflate(inflate)
+                self._occgrid0 = self._occgrid
+                self._occgrid = self._occgrid.inflated(inflate)
             else:
                 self._occgrid0 = self._occgrid
 
@@ -8,10 +8,20 @@ import matplotlib.pyplot as plt
 import numpy as np
 import scipy as sp
 import zipfile
-import time
 import math
 from pathlib import Path
 from progress.bar import FillingCirclesBar
+from scipy.spatial import cKDTree
+import multiprocessing as mp
+from warnings import warn
+
+# pose graph and options shared with forked scanmap workers
+_scanmap_state = {}
+
+
+def _scanmap_chunk(span):
+    pg, args = _scanmap_state["args"]
+    return pg._scanmap_chunk(span, *args)
 
 
 class PGVertex(pgraph.UVertex):
@@ -100,7 +110,7 @@ class PoseGraph:
     #     center
     #     cellsize
 
-    def __init__(self, filename, lidar=False, verbose=False):
+    def __init__(self, filename, lidar=False, verbose=False, cache=False):
         """
         Pose graph optimization for SLAM
 
@@ -110,8 +120,20 @@ class PoseGraph:
         :type lidar: bool, optional
         :param verbose: show details of processing, defaults to False
         :type verbose: bool, optional
+        :param cache: cache the parsed file, defaults to False
+        :type cache: bool, optional
         :raises RuntimeError: file syntax error
 
+        The file is parsed in bulk into arrays of vertex coordinates, edge
+        means and information matrices, and lidar scans.  The :attr:`graph`
+        of :class:`PGVertex` and :class:`PGEdge` objects is created only when
+        it is first used, its vertex coordinates are views of the array
+        that is updated by :meth:`optimize`.
+
+        If ``cache`` is True the arrays are saved in an uncompressed file
+        with the extension ``.npz`` appended, next to the file, and loaded from
+        there in future if it is newer than the file.
+
         :references:
 
             - Robotics, Vision & Control for Python, §6.5, P. Corke, Springer 2023.
@@ -128,177 +150,275 @@ class PoseGraph:
         # vertex numbers start at 0
 
         self.lidar = lidar
-
-        self.graph = pgraph.UGraph(verbose=verbose)
+        self._verbose = verbose
+        self._graph = None
+        self._references = {}  # scan matching references, by vertex index
 
         path = Path(rtb.rtb_path_to_datafile(filename))
+        cachefile = path.with_name(path.name + ".npz")
+
+        data = None
+        if (
+            cache
+            and cachefile.exists()
+            and cachefile.stat().st_mtime >= path.stat().st_mtime
+        ):
+            with np.load(cachefile) as f:
+                if f["lidar"] or not lidar:
+                    data = dict(f)
+        if data is None:
+            data = self._parse(path, filename, lidar)
+            if cache:
+                try:
+                    np.savez(cachefile, lidar=lidar, **data)
+                except OSError:
+                    # the data directory is not writable
+                    pass
+
+        self._names = data["names"]  # vertex names
+        self._landmark = data["landmark"]  # vertex is a landmark
+        self._x = data["x"]  # vertex coordinates, one row per vertex
+        self._ei = data["ei"]  # index of start vertex, one per edge
+        self._ej = data["ej"]  # index of end vertex, one per edge
+        self._emean = data["emean"]  # edge mean, one row per edge
+        self._einfo = data["einfo"]  # edge information matrices
+
+        if data["toro"]:
+            filetype = "TORO/LAGO"
+        else:
+            filetype = "g2o"
+        print(
+            f"loaded {filetype} format file: {len(self._x)} vertices,"
+            f" {len(self._ei)} edges"
+        )
 
-        if path.suffix == ".zip":
-            zf = zipfile.ZipFile(path, "r")
-            opener = zf.open
-            path = path.stem
+        # lidar scans, one row per scan, and the scan index of each vertex
+        if lidar and "scans" in data:
+            self._scans = data["scans"]
         else:
-            opener = open
+            self._scans = np.zeros((0,), dtype=int)
+        self._scanrow = np.full((len(self._x),), -1)
+        self._scanrow[self._scans] = np.arange(len(self._scans))
+        if lidar and len(self._scans) > 0:
+            self._ranges = data["ranges"]
+            self._times = data["times"]
+
+            angmin, fov, incr, maxrange = data["lidarmeta"]
+            nbeams = self._ranges.shape[1]
+            self._theta = np.arange(0, nbeams) * incr + angmin
+            self._angmin = angmin
+            self._angmax = angmin + fov
+            self._maxrange = maxrange
+
+            fov = np.degrees([self._angmin, self._angmax])
+            print(
+                f"  {len(self._scans)} lidar scans: {nbeams} beams, fov {fov[0]:.1f}° to"
+                f" {fov[1]:.1f}°, max range {self._maxrange}"
+            )
 
-        with opener(path, "r") as f:
+    @staticmethod
+    def _parse(path, filename, lidar):
+        # parse the file into a dict of arrays
 
-            toroformat = False
-            nlidar = 0
+        if path.suffix == ".zip":
+            with zipfile.ZipFile(path, "r") as zf:
+                text = zf.read(path.stem)
+        else:
+            with open(path, "rb") as f:
+                text = f.read()
+        lines = text.decode().splitlines()
+
+        # group the records by type, keeping their line numbers
+        records = {}
+        for lineno, line in enumerate(lines):
+            # is it a comment?
+            if line.startswith("#") or not line.strip():
+                continue
+            tokens = line.split(None, 1)
+            linenos, rest = records.setdefault(tokens[0], ([], []))
+            linenos.append(lineno)
+            rest.append(tokens[1] if len(tokens) > 1 else "")
+
+        for type, (linenos, _) in records.items():
+            if type not in (
+                "VERTEX_SE2",
+                "VERTEX_XY",
+                "EDGE_SE2",
+                "VERTEX2",
+                "EDGE2",
+                "ROBOTLASER1",
+            ):
+                raise RuntimeError(
+                    f"Unexpected line  {lines[linenos[0]]} in {filename}"
+                )
 
-            # indices into ROBOTLASER1 record for the 3x3 info matrix in column major
-            # order
-            # IXX IXY IXT IYY IYT ITT
-            #   6   7   8   9  10  11
-            #   0   1   2   3   4   5
-            g2o = [0, 1, 2, 1, 3, 4, 2, 4, 5]
-            # IXX IXY IYY ITT IXT IYT
-            #   6   7   8   9  10  11
-            #   0   1   2   3   4   5
-            toro = [0, 1, 4, 1, 2, 5, 4, 5, 3]
+        def columns(type, ncols):
+            # the numeric fields of all records of this type, one row per
+            # record, and their line numbers
+            linenos, rest = records.get(type, ([], []))
+            data = np.fromstring(" ".join(rest), sep=" ")
+            if data.size != len(rest) * ncols:
+                raise RuntimeError(f"bad {type} record in {filename}")
+            return data.reshape((len(rest), ncols)), np.array(linenos, dtype=int)
+
+        # vertices, VERTEX2 is the TORO format record
+        #   id X Y THETA
+        #   id X Y            landmark
+        se2, se2_lines = columns("VERTEX_SE2", 4)
+        toro, toro_lines = columns("VERTEX2", 4)
+        xy, xy_lines = columns("VERTEX_XY", 3)
+
+        vlines = np.r_[se2_lines, toro_lines, xy_lines]
+        order = np.argsort(vlines, kind="stable")
+        vlines = vlines[order]
+        vid = np.r_[se2[:, 0], toro[:, 0], xy[:, 0]][order]
+        x = np.zeros((len(vid), 3))
+        x[: len(se2) + len(toro), :] = np.r_[se2[:, 1:], toro[:, 1:]]
+        x[len(se2) + len(toro) :, :2] = xy[:, 1:]
+        x = x[order]
+        landmark = (np.arange(len(vid)) >= len(se2) + len(toro))[order]
+
+        # the names are the vertex id strings
+        rest = [
+            r.split(None, 1)[0]
+            for type in ("VERTEX_SE2", "VERTEX2", "VERTEX_XY")
+            for r in records.get(type, ([], []))[1]
+        ]
+        names = np.array(rest, dtype=str)[order]
+
+        # edges, EDGE2 is the TORO format record
+        #   startvertex_id endvertex_id X Y THETA followed by the info matrix
+        #   g2o:  IXX IXY IXT IYY IYT ITT
+        #   TORO: IXX IXY IYY ITT IXT IYT
+        # converted to the 3x3 info matrix in column major order
+        g2o = [0, 1, 2, 1, 3, 4, 2, 4, 5]
+        toro_info = [0, 1, 4, 1, 2, 5, 4, 5, 3]
+        edge_se2, edge_se2_lines = columns("EDGE_SE2", 11)
+        edge2, edge2_lines = columns("EDGE2", 11)
+
+        order = np.argsort(np.r_[edge_se2_lines, edge2_lines], kind="stable")
+        edges = np.r_[edge_se2, edge2][order]
+        einfo = np.r_[edge_se2[:, 5:][:, g2o], edge2[:, 5:][:, toro_info]].reshape(
+            (-1, 3, 3)
+        )[order]
+
+        # convert vertex ids to vertex indices
+        sorter = np.argsort(vid, kind="stable")
+        ends = []
+        for id in (edges[:, 0], edges[:, 1]):
+            k = np.minimum(np.searchsorted(vid, id, sorter=sorter), len(vid) - 1)
+            if len(id) > 0 and (len(vid) == 0 or np.any(vid[sorter[k]] != id)):
+                raise RuntimeError(f"edge to unknown vertex in {filename}")
+            ends.append(sorter[k])
+
+        data = dict(
+            names=names,
+            landmark=landmark,
+            x=x,
+            ei=ends[0],
+            ej=ends[1],
+            emean=edges[:, 2:5],
+            einfo=einfo,
+            toro=len(toro) + len(edge2) > 0,
+        )
 
-            # we keep an array self. = vindex(gi) to map g2o vertex index to PGraph vertex index
+        if lidar and "ROBOTLASER1" in records:
+            # lidar records are associated with the immediately
+            # preceding VERTEX record
+            #
+            # not quite sure what all the fields are
+            # 1 ?
+            # 2 min scan angle
+            # 3 scan range
+            # 4 angular increment
+            # 5 maximum range possible
+            # ?
+            # 8 N = number of beams
+            # 9 to 9+N lidar range data
+            # ?
+            # 9+N+12 timestamp (*nix timestamp)
+            # 9+N+13 lidar type (str)
+            #
+            # the last two fields, lidar type and logger timestamp, are
+            # dropped so the rest are numeric
+            linenos, rest = records["ROBOTLASER1"]
+            records["ROBOTLASER1"] = (linenos, [r.rsplit(None, 2)[0] for r in rest])
+            nbeams = int(rest[0].split(None, 8)[7])
+            laser, laser_lines = columns("ROBOTLASER1", nbeams + 21)
+
+            scans = np.searchsorted(vlines, laser_lines) - 1
+            if np.any(scans < 0):
+                raise RuntimeError(f"ROBOTLASER1 record before a vertex in {filename}")
+
+            data.update(
+                scans=scans,
+                ranges=laser[:, 8 : 8 + nbeams],
+                times=laser[:, 20 + nbeams],
+                lidarmeta=laser[0, 1:5],
+            )
 
-            self.vindex = {}
-            firstlidar = True
-            PGVertex.nvertices = 0  # reset vertex counter in PGVertex class
-            for line in f:
-                # for zip file, we get data as bytes not str
-                if isinstance(line, bytes):
-                    line = line.decode()
-
-                # is it a comment?
-                if line.startswith("#"):
-                    continue
-
-                tokens = line.split()
-
-                # g2o format records
-                if tokens[0] == "VERTEX_SE2":
-                    coord = np.array([float(x) for x in tokens[2:5]])
-                    id = tokens[1]
-
-                    v = PGVertex("vertex", coord=coord, name=id)
-                    self.graph.add_vertex(v)
-
-                elif tokens[0] == "VERTEX_XY":
-                    coord = np.array([float(x) for x in tokens[2:4]])
-                    id = tokens[1]
-
-                    v = PGVertex("landmark", coord=coord, name=id)
-                    self.graph.add_vertex(v)
-
-                elif tokens[0] == "EDGE_SE2":
-                    v1 = tokens[1]
-                    v2 = tokens[2]
-
-                    # create the edge data as a structure
-                    #  X  Y  T
-                    #  3  4  5
-                    mean = np.array([float(x) for x in tokens[3:6]])
-
-                    # IXX IXY IXT IYY IYT ITT
-                    #   6   7   8   9  10  11
-                    d = np.array([float(x) for x in tokens[6:12]])
-                    info = d[g2o].reshape((3, 3))
-
-                    # create the edge
-                    v1 = self.graph[v1]
-                    v2 = self.graph[v2]
-                    e = PGEdge(v1, v2, mean, info)
-                    v1.connect(v2, edge=e)
-
-                ## TORO format records
-                # https://openslam-org.github.io/toro.html
-                elif tokens[0] == "VERTEX2":
-                    toroformat = True
-
-                    coord = np.array([float(x) for x in tokens[2:5]])
-                    id = tokens[1]
-
-                    v = PGVertex("vertex", coord=coord, name=id)
-                    self.graph.add_vertex(v)
-
-                elif tokens[0] == "EDGE2":
-                    toroformat = True
-
-                    v1 = tokens[1]
-                    v2 = tokens[2]
-
-                    # create the edge data as a structure
-                    #  X  Y  T
-                    #  3  4  5
-                    mean = np.array([float(x) for x in tokens[3:6]])
-
-                    # IXX IXY IYY ITT IXT IYT
-                    #   6   7   8   9  10  11
-                    d = np.array([float(x) for x in tokens[6:12]])
-                    info = d[toro].reshape((3, 3))
-
-                    # create the edge
-                    v1 = self.graph[v1]
-                    v2 = self.graph[v2]
-                    e = PGEdge(v1, v2, mean, info)
-                    v1.connect(v2, edge=e)
-
-                elif tokens[0] == "ROBOTLASER1":
-                    if not lidar:
-                        continue
-
-                    # lidar records are associated with the immediately
-                    # preceding VERTEX record
-                    #
-                    # not quite sure what all the fields are
-                    # 1 ?
-                    # 2 min scan angle
-                    # 3 scan range
-                    # 4 angular increment
-                    # 5 maximum range possible
-                    # ?
-                    # 8 N = number of beams
-                    # 9 to 9+N lidar range data
-                    # ?
-                    # 9+N+12 timestamp (*nix timestamp)
-                    # 9+N+13 lidar type (str)
-
-                    if firstlidar:
-                        nbeams = int(tokens[8])
-                        lidarmeta = tokens[2:6]
-                        firstlidar = False
-
-                    # add attributes to the most recent vertex created
-                    v.theta = np.arange(0, nbeams) * float(tokens[4]) + float(tokens[2])
-                    v.range = np.array([float(x) for x in tokens[9 : nbeams + 9]])
-                    v.time = float(tokens[21 + nbeams])
-                    self.vindex[v.index] = v
-                    nlidar += 1
-                else:
-                    raise RuntimeError(f"Unexpected line  {line} in {filename}")
+        return data
 
-            if toroformat:
-                filetype = "TORO/LAGO"
-            else:
-                filetype = "g2o"
-            print(
-                f"loaded {filetype} format file: {self.graph.n} vertices,"
-                f" {self.graph.ne} edges"
-            )
+    @property
+    def graph(self):
+        """
+        Pose graph
 
-            if nlidar > 0:
-                lidarmeta = [float(x) for x in lidarmeta]
+        :return: pose graph
+        :rtype: :class:`pgraph.UGraph`
 
-                self._angmin = lidarmeta[0]
-                self._angmax = sum(lidarmeta[0:2])
-                self._maxrange = lidarmeta[3]
+        The graph is created when first used.  Each :class:`PGVertex` has a
+        ``coord`` attribute which is a view of the array of vertex
+        coordinates, and vertices with a lidar scan have ``range``, ``theta``
+        and ``time`` attributes.  Each :class:`PGEdge` has ``mean`` and
+        ``info`` attributes.
+        """
+        if self._graph is None:
+            graph = pgraph.UGraph(verbose=self._verbose)
 
-                fov = np.degrees([self._angmin, self._angmax])
-                print(
-                    f"  {nlidar} lidar scans: {nbeams} beams, fov {fov[0]:.1f}° to"
-                    f" {fov[1]:.1f}°, max range {self._maxrange}"
-                )
+            PGVertex.nvertices = 0  # reset vertex counter in PGVertex class
+            vertices = []
+            for i, (name, landmark) in enumerate(zip(self._names, self._landmark)):
+                if landmark:
+                    v = PGVertex("landmark", name=str(name))
+                    v.coord = self._x[i, :2]
+                else:
+                    v = PGVertex("vertex", name=str(name))
+                    v.coord = self._x[i]
+                graph.add_vertex(v)
+                vertices.append(v)
+
+                if self._scanrow[i] >= 0:
+                    v.theta = self._theta
+                    v.range = self._ranges[self._scanrow[i]]
+                    v.time = self._times[self._scanrow[i]]
+
+            for i, j, mean, info in zip(self._ei, self._ej, self._emean, self._einfo):
+                v1 = vertices[i]
+                v2 = vertices[j]
+                e = PGEdge(v1, v2, mean, info)
+                v1.connect(v2, edge=e)
+
+            self._graph = graph
+            self._vertices = vertices
+        return self._graph
+
+    @property
+    def vindex(self):
+        # dict that maps vertex index to the vertices with a lidar scan
+        self.graph  # create the graph if required
+        return {i: self._vertices[i] for i in self._scans}
+
+    def _row(self, i):
+        # row of the scan arrays for vertex i
+        k = self._scanrow[i]
+        if k < 0:
+            raise KeyError(f"vertex {i} has no lidar scan")
+        return k
 
     def scan(self, i):
-        v = self.vindex[i]
-        return v.range, v.theta
+        k = self._row(i)
+        return self._ranges[k], self._theta
 
     def scanxy(self, i):
 
@@ -317,10 +437,11 @@ class PoseGraph:
             plt.pause(1)
 
     def pose(self, i):
-        return self.vindex[i].coord
+        return self._x[i]
 
     def time(self, i):
-        return self.vindex[i].time
+        k = self._row(i)
+        return self._times[k]
 
     def plot(self, **kwargs):
         if not "vopt" in kwargs:
@@ -334,53 +455,341 @@ class PoseGraph:
         plt.ylabel("y")
         plt.grid(True)
 
-    def scanmatch(self, s1, s2):
-        p1 = self.scanxy(s1)
-        p2 = self.scanxy(s2)
-        T = smb.ICP2d(p1, p2)
-        return SE2(T)
-
-    def scanmap(self, occgrid, maxrange=None):
-        # note about maxrange timing
-
-        bar = FillingCirclesBar(
-            "Converting", max=self.graph.n, suffix="%(percent).1f%% - %(eta)ds"
-        )
+    def scanmatch(
+        self, s1, s2, T=None, method="line", maxiter=30, tol=1e-5, maxdist=1.0
+    ):
+        """
+        Match two lidar scans
+
+        :param s1: index of reference vertex
+        :type s1: int
+        :param s2: index of vertex to match
+        :type s2: int
+        :param T: initial estimate of relative pose, defaults to the relative
+            pose of the vertices
+        :type T: :class:`SE2` or array_like(3), optional
+        :param method: "line" for point-to-line or "point" for point-to-point
+            ICP, defaults to "line"
+        :type method: str, optional
+        :param maxiter: maximum number of iterations, defaults to 30
+        :type maxiter: int, optional
+        :param tol: stop when the pose update is less than this, defaults to
+            1e-5
+        :type tol: float, optional
+        :param maxdist: reject correspondences further apart than this,
+            defaults to 1.0
+        :type maxdist: float, optional
+        :raises ValueError: bad method
+        :return: pose of vertex ``s2`` relative to vertex ``s1``
+        :rtype: :class:`SE2`
+
+        The points of scan ``s2`` are aligned with those of scan ``s1`` by
+        iterated closest point (ICP).  Correspondences are found using a
+        KD-tree over the points of the reference scan, which is built once
+        and kept for later matches.  For point-to-line ICP the error is the
+        distance of each point from the line through its closest reference
+        point, with a normal estimated from its neighbours.  Iteration stops
+        early when the update is less than ``tol``.
+
+        :seealso: :meth:`add_loopclosures`
+        """
+        x = self._icp(s1, s2, T, method, maxiter, tol, maxdist)[0]
+        return SE2(x)
 
-        grid1d = occgrid.ravel
-        for i in range(0, self.graph.n, 5):
+    def loopclosure_candidates(self, radius=3, mingap=100, maxangle=np.pi / 2):
+        """
+        Find candidate loop closures
+
+        :param radius: maximum distance between vertices, defaults to 3
+        :type radius: float, optional
+        :param mingap: minimum difference in vertex index, defaults to 100
+        :type mingap: int, optional
+        :param maxangle: maximum difference in heading, defaults to pi/2
+        :type maxangle: float, optional
+        :return: vertex indices of candidate pairs, one per row
+        :rtype: ndarray(N,2)
+
+        The positions of the vertices with lidar scans are held in a KD-tree,
+        and pairs of vertices within ``radius`` of each other are found.  Pairs
+        that are close in sequence, have very different headings, or are
+        already joined by an edge are excluded.  Each vertex is paired with
+        only the closest of the remaining earlier vertices.
+
+        :seealso: :meth:`add_loopclosures`
+        """
+        tree = cKDTree(self._x[self._scans, :2])
+        pairs = self._scans[tree.query_pairs(radius, output_type="ndarray")]
+        pairs = np.sort(pairs.reshape((-1, 2)), axis=1)
+
+        i, j = pairs.T
+        keep = j - i >= mingap
+        keep &= np.abs(smb.wrap_mpi_pi(self._x[i, 2] - self._x[j, 2])) <= maxangle
+
+        n = len(self._x)
+        edges = np.r_[self._ei * n + self._ej, self._ej * n + self._ei]
+        keep &= ~np.isin(i * n + j, edges)
+        pairs = pairs[keep]
+
+        # keep the closest earlier vertex to each vertex
+        i, j = pairs.T
+        d = np.linalg.norm(self._x[i, :2] - self._x[j, :2], axis=1)
+        pairs = pairs[np.lexsort((d, j))]
+        _, first = np.unique(pairs[:, 1], return_index=True)
+        return pairs[first]
+
+    def add_loopclosures(
+        self, pairs=None, maxrms=0.05, minfraction=0.7, info=None, **kwargs
+    ):
+        """
+        Add loop closure edges from scan matching
+
+        :param pairs: vertex indices to match, one pair per row, defaults to
+            the result of :meth:`loopclosure_candidates`
+        :type pairs: array_like(N,2), optional
+        :param maxrms: maximum RMS error of an accepted match, defaults to 0.05
+        :type maxrms: float, optional
+        :param minfraction: minimum fraction of points matched, defaults to 0.7
+        :type minfraction: float, optional
+        :param info: information matrix of the new edges, defaults to an
+            estimate from the match
+        :type info: ndarray(3,3), optional
+        :param kwargs: options passed to :meth:`scanmatch`
+        :return: vertex indices of the pairs added, one per row
+        :rtype: ndarray(M,2)
+
+        Each pair of scans is matched, starting from the current relative pose
+        of the vertices, and accepted if the RMS error and fraction of
+        points matched meet the thresholds.  An edge is added for each
+        accepted match, which is used by :meth:`optimize`.  The default
+        information matrix is the Gauss-Newton approximation from the match,
+        scaled by the inverse of its mean squared error.
+
+        :seealso: :meth:`loopclosure_candidates` :meth:`scanmatch`
+        """
+        if pairs is None:
+            pairs = self.loopclosure_candidates()
+        pairs = np.array(pairs, dtype=int).reshape((-1, 2))
+
+        added = []
+        means = []
+        infos = []
+        for i, j in pairs:
+            x, H, rms, fraction = self._icp(i, j, **kwargs)
+            if rms <= maxrms and fraction >= minfraction:
+                added.append((i, j))
+                means.append(x)
+                infos.append(H / max(rms, 1e-3) ** 2 if info is None else info)
+        added = np.array(added, dtype=int).reshape((-1, 2))
+        if len(added) == 0:
+            return added
+
+        self._ei = np.r_[self._ei, added[:, 0]]
+        self._ej = np.r_[self._ej, added[:, 1]]
+        self._emean = np.r_[self._emean, means]
+        self._einfo = np.r_[self._einfo, infos]
+
+        if self._graph is not None:
+            for (i, j), mean, info in zip(added, means, infos):
+                v1 = self._vertices[i]
+                v2 = self._vertices[j]
+                e = PGEdge(v1, v2, mean, info)
+                v1.connect(v2, edge=e)
+
+        return added
+
+    def _scanpoints(self, i):
+        # points of the scan with a return, ndarray(N,2)
+        xy = self.scanxy(i).T
+        return xy[~np.isnan(xy[:, 0])]
+
+    def _reference(self, i):
+        # KD-tree, points and unit normals of a reference scan, computed once
+        if i not in self._references:
+            q = self._scanpoints(i)
+            tree = cKDTree(q)
+
+            # the normal is the minor axis of the covariance of each point's
+            # nearest neighbours
+            _, k = tree.query(q, k=min(5, len(q)))
+            d = q[k] - q[k].mean(axis=1, keepdims=True)
+            C = np.einsum("nki,nkj->nij", d, d)
+            alpha = 0.5 * np.arctan2(2 * C[:, 0, 1], C[:, 0, 0] - C[:, 1, 1])
+            normals = np.c_[-np.sin(alpha), np.cos(alpha)]
+
+            self._references[i] = (tree, q, normals)
+        return self._references[i]
+
+    def _icp(self, s1, s2, T=None, method="line", maxiter=30, tol=1e-5, maxdist=1.0):
+        # ICP of scan s2 to scan s1, returns the relative pose (x, y, theta),
+        # the Gauss-Newton approximation to the Hessian of the squared error,
+        # the RMS error and the fraction of points that have a correspondence
+        if method not in ("line", "point"):
+            raise ValueError("method must be 'line' or 'point'")
+
+        if T is None:
+            # the relative pose is the error of an edge with zero mean
+            x = _linear_factors(
+                self._x[[s1]], self._x[[s2]], np.zeros((1, 3)), jacobian=False
+            )[0][0]
+        elif isinstance(T, SE2):
+            x = T.xyt()
+        else:
+            x = np.array(T, dtype=float)
+
+        tree, q, normals = self._reference(s1)
+        p = self._scanpoints(s2)
+
+        H = np.zeros((3, 3))
+        rms = np.inf
+        fraction = 0
+        for _ in range(maxiter):
+            c, s = np.cos(x[2]), np.sin(x[2])
+            rp = p @ np.array([[c, s], [-s, c]])  # rotated points
+            d, k = tree.query(rp + x[:2], distance_upper_bound=maxdist)
+            matched = np.isfinite(d)
+            fraction = matched.mean()
+            if matched.sum() < 3:
+                break
 
-            xy = self.scanxy(i)
-            r, theta = self.scan(i)
-            if maxrange is not None:
-                toofar = np.where(r > maxrange)[0]
-                xy = np.delete(xy, toofar, axis=1)
-            xyt = self.vindex[i].coord
+            rp = rp[matched]
+            k = k[matched]
+            dp = rp + x[:2] - q[k]
+            drp = np.c_[-rp[:, 1], rp[:, 0]]  # derivative wrt theta
 
-            xy = SE2(xyt) * xy
+            if method == "line":
+                n = normals[k]
+                e = (dp * n).sum(axis=1)
+                J = np.c_[n, (drp * n).sum(axis=1)]
+            else:
+                e = dp.ravel()
+                J = np.zeros((len(rp), 2, 3))
+                J[:, 0, 0] = 1
+                J[:, 1, 1] = 1
+                J[:, :, 2] = drp
+                J = J.reshape((-1, 3))
+
+            H = J.T @ J
+            rms = np.sqrt(np.mean(e**2))
+            dx = -np.linalg.lstsq(H, J.T @ e, rcond=None)[0]
+            x = x + dx
+            if np.all(np.abs(dx) < tol):
+                break
 
-            # start of each ray
-            p1 = occgrid.w2g(xyt[:2])
+        x[2] = np.mod(x[2] + np.pi, 2 * np.pi) - np.pi
+        return x, H, rms, fraction
+
+    def scanmap(
+        self,
+        occgrid,
+        maxrange=None,
+        every=5,
+        hit=0.85,
+        miss=-0.4,
+        nproc=1,
+        chunksize=100,
+    ):
+        """
+        Occupancy grid from lidar scans
+
+        :param occgrid: occupancy grid of floats, updated in place
+        :type occgrid: :class:`OccupancyGrid`
+        :param maxrange: ignore returns beyond this range, defaults to None
+        :type maxrange: float, optional
+        :param every: use every ``every``'th scan, defaults to 5
+        :type every: int, optional
+        :param hit: log-odds increment for the cell containing a return,
+            defaults to 0.85
+        :type hit: float, optional
+        :param miss: log-odds increment for a cell crossed by a ray, defaults
+            to -0.4
+        :type miss: float, optional
+        :param nproc: number of worker processes, defaults to 1
+        :type nproc: int, optional
+        :param chunksize: number of scans processed together, defaults to 100
+        :type chunksize: int, optional
+
+        The lidar returns, at the optimized vertex poses, are accumulated into
+        the grid in log-odds form: positive values are occupied and negative
+        values are free.  Each ray is traced from the vertex to the return
+        using the Amanatides-Woo voxel traversal algorithm, all the rays of a
+        chunk of scans together.  Returns at the maximum range of the lidar
+        are ignored, and only the parts of rays within the grid contribute.
+
+        If ``nproc`` is greater than one the chunks are processed by forked
+        worker processes and their partial grids are summed.
+
+        :seealso: :meth:`plot_occgrid` :class:`OccupancyGrid`
+        """
+        scans = self._scans[::every]
+        spans = [
+            (i, min(i + chunksize, len(scans))) for i in range(0, len(scans), chunksize)
+        ]
+        args = (occgrid, scans, maxrange, hit, miss)
 
-            for p2 in occgrid.w2g(xy.T):
+        bar = FillingCirclesBar(
+            "Converting", max=len(spans), suffix="%(percent).1f%% - %(eta)ds"
+        )
 
-                # all cells along the ray
+        grid1d = occgrid.ravel
+        if nproc > 1 and len(spans) > 1:
+            if "fork" in mp.get_all_start_methods():
+                # workers inherit the pose graph and grid from this process when
+                # they are forked
+                _scanmap_state["args"] = (self, args)
                 try:
-                    k = occgrid._line(p1, p2)
-                except ValueError:
-                    # silently ignore rays to points outside the grid map
-                    continue
+                    with mp.get_context("fork").Pool(nproc) as pool:
+                        for cells, value in pool.imap_unordered(_scanmap_chunk, spans):
+                            np.add.at(grid1d, cells, value)
+                            bar.next()
+                finally:
+                    _scanmap_state.clear()
+            else:  # pragma nocover
+                warn("fork is not available, building the map serially")
+                nproc = 1
+
+        if nproc <= 1 or len(spans) <= 1:
+            for span in spans:
+                cells, value = self._scanmap_chunk(span, *args)
+                np.add.at(grid1d, cells, value)
+                bar.next()
 
-                # increment cells along the ray, these are free space
-                grid1d[k[:-1]] += 1
-                # decrement target cell
-                grid1d[k[-1]] -= 1
+        bar.finish()
 
-            bar.next()
+    def _scanmap_chunk(self, span, occgrid, scans, maxrange, hit, miss):
+        # log-odds update for the scans in span, as the indices of the cells
+        # updated and their values
+        k = scans[span[0] : span[1]]
+        rows = self._scanrow[k]
+        r = self._ranges[rows]
+        x = self._x[k]
+
+        # one row per valid return, returns at the maximum range are ignored
+        valid = r < self._maxrange
+        if maxrange is not None:
+            valid &= r <= maxrange
+        r = r[valid]
+        theta = (x[:, 2, np.newaxis] + self._theta)[valid]
+        start = np.repeat(x[:, :2], valid.sum(axis=1), axis=0)
+
+        # start and end of each ray in grid coordinates
+        u1 = (start - occgrid._origin) / occgrid._cellsize
+        u2 = (
+            u1
+            + (r / occgrid._cellsize)[:, np.newaxis]
+            * np.c_[np.cos(theta), np.sin(theta)]
+        )
 
-        grid1d[grid1d < 0] = -1
-        grid1d[grid1d > 0] = 1
-        bar.finish()
+        free = occgrid._ray_cells(u1, u2)
+        col, row = np.round(u2).astype(int).T
+        h, w = occgrid.grid.shape
+        inside = (col >= 0) & (col < w) & (row >= 0) & (row < h)
+        occupied = row[inside] * w + col[inside]
+
+        cells, index = np.unique(np.r_[free, occupied], return_inverse=True)
+        value = np.bincount(
+            index, weights=np.r_[np.full(len(free), miss), np.full(len(occupied), hit)]
+        )
+        return cells, value
 
     def w2g(self, w):
         return np.round((w - self._centre) / self._cellsize) + self._ngrid / 2
@@ -413,10 +822,67 @@ class PoseGraph:
     #  "A Tutorial on Graph-Based SLAM,” in IEEE Intelligent Transportation Systems Magazine,
     #  vol. 2, no. 4, pp. 31-43, winter 2010, doi: 10.1109/MITS.2010.939925.
 
-    def optimize(self, iterations=10, animate=False, retain=True, **kwargs):
+    def optimize(
+        self,
+        iterations=10,
+        animate=False,
+        retain=True,
+        method="gn",
+        kernel=None,
+        delta=1.0,
+        verbose=False,
+        **kwargs,
+    ):
+        r"""
+        Optimize the pose graph
+
+        :param iterations: maximum number of iterations, defaults to 10
+        :type iterations: int, optional
+        :param animate: plot the graph at each iteration, defaults to False
+        :type animate: bool, optional
+        :param retain: retain the plot of each iteration, defaults to True
+        :type retain: bool, optional
+        :param method: "gn" for Gauss-Newton or "lm" for Levenberg-Marquardt,
+            defaults to "gn"
+        :type method: str, optional
+        :param kernel: robust kernel "huber" or "cauchy", defaults to None
+        :type kernel: str, optional
+        :param delta: width of the robust kernel, defaults to 1.0
+        :type delta: float, optional
+        :param verbose: print the cost at each iteration, defaults to False
+        :type verbose: bool, optional
+        :param kwargs: options passed to the graph plot method
+        :raises ValueError: unknown method or kernel
+        :return: final cost
+        :rtype: float
+
+        The cost is :math:`\sum_k \rho(\vec{e}_k^{\top} \mat{\Omega}_k \vec{e}_k)`
+        where :math:`\vec{e}_k` is the error of edge :math:`k`, :math:`\mat{\Omega}_k`
+        its information matrix and :math:`\rho(s)=s` or a robust kernel which
+        reduces the influence of edges with a large error, such as incorrect
+        loop closures:
+
+        - "huber", :math:`\rho(s) = s` for :math:`s \le \delta^2` else
+          :math:`2 \delta \sqrt{s} - \delta^2`
+        - "cauchy", :math:`\rho(s) = \delta^2 \log(1 + s / \delta^2)`
+
+        The normal equations are assembled directly in sparse form from the
+        Jacobians of all edges, computed at once, and solved by a sparse
+        factorization.  The sparsity pattern and fill-reducing ordering are
+        computed once and reused at every iteration.
+
+        Levenberg-Marquardt adds a damping term to the diagonal and only takes
+        steps that reduce the cost.  Iteration stops when the relative decrease
+        in cost is less than :math:`10^{-9}`.
+
+        :seealso: :meth:`linearize_and_solve`
+        """
+        if method not in ("gn", "lm"):
+            raise ValueError(f"unknown method {method}")
 
         eprev = math.inf
         eo = {}
+        lam = None
 
         if animate and retain:
             colors = plt.cm.Greys(np.linspace(0.3, 1, iterations))
@@ -426,8 +892,10 @@ class PoseGraph:
             # else:
             #     eo = {}
 
+        x, system = self._setup()
         for i in range(iterations):
             if animate:
+                self._update_vertices(x)
                 if retain:
                     if i == 0:
                         ax = smb.axes_logic(None, 2)
@@ -443,83 +911,280 @@ class PoseGraph:
                 )
                 plt.pause(0.5)
 
-            energy = self.linearize_and_solve()
+            if method == "gn":
+                energy, dx = self._linearize_and_solve(x, system, kernel, delta)
+                if verbose:
+                    print(f"iteration {i}: cost {energy:g}")
+                if energy >= eprev * (1 - 1e-9):
+                    break
+                x = self._increment(x, dx)
+                eprev = energy
 
-            if energy >= eprev:
-                break
-            eprev = energy
-
-    def linearize_and_solve(self):
-        t0 = time.time()
-
-        g = self.graph
-
-        # H and b are respectively the system matrix and the system vector
-        H = np.zeros((g.n * 3, g.n * 3))
-        b = np.zeros((g.n * 3, 1))
-        # this loop constructs the global system by accumulating in H and b the contributions
-        # of all edges (see lecture)
-
-        etotal = 0
-        for edge in g.edges():
-            e, A, B = edge.linear_factors()
-            omega = edge.info
-
-            # compute the blocks of H^k
-            bi = -A.T @ omega @ e
-            bj = -B.T @ omega @ e
-            Hii = A.T @ omega @ A
-            Hij = A.T @ omega @ B
-            Hjj = B.T @ omega @ B
-
-            v = edge.endpoints
-            i = v[0].index
-            j = v[1].index
-
-            islice = slice(i * 3, (i + 1) * 3)
-            jslice = slice(j * 3, (j + 1) * 3)
-
-            # accumulate the blocks in H and b
-            try:
-                H[islice, islice] += Hii
-                H[jslice, jslice] += Hjj
-                H[islice, jslice] += Hij
-                H[jslice, islice] += Hij.T
-
-                b[islice, 0] += bi
-                b[jslice, 0] += bj
-            except ValueError:
-                print("linearize_and_solve failed")
-                print(v)
-                print(H.shape, b.shape, Hii.shape, Hjj.shape, Hij.shape)
-                print(islice, jslice)
-
-            etotal += np.inner(e, e)
-
-        # note that the system (H b) is obtained only from
-        # relative constraints. H is not full rank.
-        # we solve the problem by anchoring the position of
-        # the the first vertex.
-        # this can be expressed by adding the equation
-        #  deltax(1:3,1) = 0
-        # which is equivalent to the following
-
-        H[0:3, 0:3] += np.eye(3)
-
-        SH = sp.sparse.csr_matrix(H)
-        deltax = sp.sparse.linalg.spsolve(SH, b)  # SH \ b
-
-        # split the increments in nice 3x1 vectors and sum them up to the original matrix
-        for vertex in g:
-            i = vertex.index * 3
-            vertex.coord += deltax[i : i + 3]
-            # normalize the angles between -PI and PI
-            vertex.coord[2] = smb.angdiff(vertex.coord[2])
-
-        dt = time.time() - t0
-        print(f"done in {dt*1e3:0.2f} msec.  Total cost {etotal:g}")
-
-        return etotal
+            else:
+                energy, lam, x = self._lm_step(x, system, kernel, delta, lam)
+                if verbose:
+                    print(f"iteration {i}: cost {energy:g}, lambda {lam:g}")
+                if energy >= eprev * (1 - 1e-9):
+                    break
+                eprev = energy
+
+        self._update_vertices(x)
+        return self._cost(x, kernel, delta)
+
+    def linearize_and_solve(self, kernel=None, delta=1.0):
+        """
+        Single Gauss-Newton iteration
+
+        :param kernel: robust kernel "huber" or "cauchy", defaults to None
+        :type kernel: str, optional
+        :param delta: width of the robust kernel, defaults to 1.0
+        :type delta: float, optional
+        :return: cost before the iteration
+        :rtype: float
+
+        The vertex coordinates are updated.
+
+        :seealso: :meth:`optimize`
+        """
+        x, system = self._setup()
+        energy, dx = self._linearize_and_solve(x, system, kernel, delta)
+        self._update_vertices(self._increment(x, dx))
+        return energy
+
+    def _setup(self):
+        # a copy of the vertex coordinates, and the sparse system
+        return self._x.copy(), _BlockSystem(len(self._x), self._ei, self._ej)
+
+    def _update_vertices(self, x):
+        # update the vertex coordinates, the graph vertices are views
+        self._x[:] = x
+
+    @staticmethod
+    def _increment(x, dx):
+        x = x + dx.reshape((-1, 3))
+        # normalize the angles between -PI and PI
+        x[:, 2] = smb.wrap_mpi_pi(x[:, 2])
+        return x
+
+    def _weights(self, e, kernel, delta):
+        # per-edge chi-squared error s = e' Omega e, the robust cost rho(s)
+        # and its derivative which weights the edge in the normal equations
+        s = np.einsum("ki,kij,kj->k", e, self._einfo, e)
+        if kernel is None:
+            return s, np.ones(s.shape)
+        elif kernel == "huber":
+            d2 = delta**2
+            rs = np.sqrt(s)
+            inlier = s <= d2
+            rho = np.where(inlier, s, 2 * delta * rs - d2)
+            w = np.where(inlier, 1.0, delta / np.where(inlier, 1.0, rs))
+            return rho, w
+        elif kernel == "cauchy":
+            d2 = delta**2
+            return d2 * np.log1p(s / d2), 1 / (1 + s / d2)
+        else:
+            raise ValueError(f"unknown kernel {kernel}")
+
+    def _cost(self, x, kernel, delta):
+        e, _, _ = _linear_factors(x[self._ei], x[self._ej], self._emean, jacobian=False)
+        rho, _ = self._weights(e, kernel, delta)
+        return rho.sum()
+
+    def _linearize(self, x, kernel, delta):
+        # the cost, and the blocks of the normal equations for every edge
+        e, A, B = _linear_factors(x[self._ei], x[self._ej], self._emean)
+        rho, w = self._weights(e, kernel, delta)
+        omega = w[:, np.newaxis, np.newaxis] * self._einfo
+
+        At = A.transpose((0, 2, 1))
+        Bt = B.transpose((0, 2, 1))
+        AtO = At @ omega
+        BtO = Bt @ omega
+        Hii = AtO @ A
+        Hjj = BtO @ B
+        Hij = AtO @ B
+        Oe = (omega @ e[:, :, np.newaxis])[:, :, 0]
+        bi = -(At @ Oe[:, :, np.newaxis])[:, :, 0]
+        bj = -(Bt @ Oe[:, :, np.newaxis])[:, :, 0]
+        return rho.sum(), (Hii, Hjj, Hij), (bi, bj)
+
+    def _linearize_and_solve(self, x, system, kernel, delta):
+        energy, Hblocks, bblocks = self._linearize(x, kernel, delta)
+
+        # note that the system (H b) is obtained only from relative
+        # constraints. H is not full rank. we solve the problem by anchoring
+        # the position of the first vertex, with the equation
+        # deltax(1:3,1) = 0
+        H = system.H(*Hblocks)
+        b = system.b(*bblocks)
+        return energy, system.solve(H, b)
+
+    def _lm_step(self, x, system, kernel, delta, lam):
+        # Levenberg-Marquardt step, the damping lam is increased until the
+        # step reduces the cost
+        energy, Hblocks, bblocks = self._linearize(x, kernel, delta)
+        H = system.H(*Hblocks)
+        b = system.b(*bblocks)
+        Hdiag = H.data[system.diag]
+        if lam is None:
+            lam = 1e-5 * Hdiag.max()
+
+        for _ in range(20):
+            H.data[system.diag] = Hdiag + lam
+            xnew = self._increment(x, system.solve(H, b))
+            enew = self._cost(xnew, kernel, delta)
+            if enew < energy:
+                return enew, lam / 10, xnew
+            lam *= 10
+        return energy, lam, x
+
+
+class _BlockSystem:
+    # Symmetric sparse system of 3x3 blocks whose sparsity pattern is fixed by
+    # the edges (i, j) of the graph.  The edge blocks are summed into the CSC
+    # data array by a precomputed index, and the rows and columns are
+    # permuted by a fill-reducing ordering that is computed once
+    def __init__(self, n, i, j):
+        self.n = n
+        self._i = i
+        self._j = j
+
+        # the ordering depends only on the structure of H, find it for a
+        # diagonally dominant matrix with that structure
+        self._pattern(np.arange(3 * n))
+        data = np.ones((self._nnz,))
+        data[self.diag] = 3 * n
+        lu = sp.sparse.linalg.splu(
+            sp.sparse.csc_matrix(
+                (data, self._indices, self._indptr), shape=(3 * n, 3 * n)
+            ),
+            permc_spec="MMD_AT_PLUS_A",
+            diag_pivot_thresh=0,
+            options=dict(SymmetricMode=True),
+        )
+        self._perm = lu.perm_c
+        self._pattern(self._perm)
+
+    def _pattern(self, perm):
+        # perm[k] is the permuted index of state k
+        n3 = 3 * self.n
+
+        # block row and column of the blocks ii, jj, ij, ji of every edge and
+        # the block of the first vertex, which is anchored
+        brow = np.r_[self._i, self._j, self._i, self._j, 0]
+        bcol = np.r_[self._i, self._j, self._j, self._i, 0]
+        r = np.repeat(np.arange(3), 3)
+        c = np.tile(np.arange(3), 3)
+        rows = perm[(3 * brow[:, np.newaxis] + r).ravel()]
+        cols = perm[(3 * bcol[:, np.newaxis] + c).ravel()]
+
+        # the unique column-major keys are the CSC entries, in order
+        keys, self._index = np.unique(cols * n3 + rows, return_inverse=True)
+        indices = keys % n3
+        indptr = np.searchsorted(keys // n3, np.arange(n3 + 1))
+        self._indices = indices.astype(np.int32)
+        self._indptr = indptr.astype(np.int32)
+        self._nnz = len(keys)
+        self.diag = np.flatnonzero(indices == keys // n3)  # diagonal of H.data
+
+        # entries in the rows and columns of the first vertex, and its
+        # diagonal
+        anchor = perm[0:3]
+        self._anchor = anchor
+        self._fixed = np.flatnonzero(
+            np.isin(indices, anchor) | np.isin(keys // n3, anchor)
+        )
+        self._fixed_diag = np.intersect1d(self._fixed, self.diag)
+
+        self._brows = perm[
+            (3 * np.r_[self._i, self._j][:, np.newaxis] + np.arange(3)).ravel()
+        ]
+
+    def H(self, Hii, Hjj, Hij):
+        # sum the blocks into the sparse matrix
+        values = np.concatenate(
+            (
+                Hii.ravel(),
+                Hjj.ravel(),
+                Hij.ravel(),
+                Hij.transpose((0, 2, 1)).ravel(),
+                np.eye(3).ravel(),
+            )
+        )
+        data = np.bincount(self._index, weights=values, minlength=self._nnz)
+
+        # anchor the first vertex, its increment is zero
+        data[self._fixed] = 0
+        data[self._fixed_diag] = 1
+        n3 = 3 * self.n
+        return sp.sparse.csc_matrix((data, self._indices, self._indptr), shape=(n3, n3))
+
+    def b(self, bi, bj):
+        # sum the vector blocks
+        b = np.bincount(
+            self._brows, weights=np.r_[bi.ravel(), bj.ravel()], minlength=3 * self.n
+        )
+        b[self._anchor] = 0
+        return b
+
+    def solve(self, H, b):
+        # solve H dx = b, and return dx in the original state order
+        lu = sp.sparse.linalg.splu(
+            H,
+            permc_spec="NATURAL",
+            diag_pivot_thresh=0,
+            options=dict(SymmetricMode=True),
+        )
+        return lu.solve(b)[self._perm]
+
+
+def _linear_factors(xi, xj, z, jacobian=True):
+    # vectorized form of PGEdge.linear_factors for the edges from vertices xi
+    # to xj with means z, all ndarray(m,3).  Returns the error ndarray(m,3)
+    # and the Jacobians A and B, ndarray(m,3,3)
+    ci = np.cos(xi[:, 2])
+    si = np.sin(xi[:, 2])
+    cz = np.cos(z[:, 2])
+    sz = np.sin(z[:, 2])
+    dt = xj[:, :2] - xi[:, :2]
+
+    # the displacement from xi to xj, in the frame of xi, relative to z
+    fx = ci * dt[:, 0] + si * dt[:, 1] - z[:, 0]
+    fy = -si * dt[:, 0] + ci * dt[:, 1] - z[:, 1]
+    e = np.c_[
+        cz * fx + sz * fy,
+        -sz * fx + cz * fy,
+        smb.wrap_mpi_pi(xj[:, 2] - xi[:, 2] - z[:, 2]),
+    ]
+    if not jacobian:
+        return e, None, None
+
+    m = len(xi)
+    A = np.zeros((m, 3, 3))
+    A[:, 0, 0] = -ci
+    A[:, 0, 1] = -si
+    A[:, 0, 2] = -si * dt[:, 0] + ci * dt[:, 1]
+    A[:, 1, 0] = si
+    A[:, 1, 1] = -ci
+    A[:, 1, 2] = -ci * dt[:, 0] - si * dt[:, 1]
+    A[:, 2, 2] = -1
+
+    B = np.zeros((m, 3, 3))
+    B[:, 0, 0] = ci
+    B[:, 0, 1] = si
+    B[:, 1, 0] = -si
+    B[:, 1, 1] = ci
+    B[:, 2, 2] = 1
+
+    # rotate into the frame of z
+    Rz = np.zeros((m, 3, 3))
+    Rz[:, 0, 0] = cz
+    Rz[:, 0, 1] = sz
+    Rz[:, 1, 0] = -sz
+    Rz[:, 1, 1] = cz
+    Rz[:, 2, 2] = 1
+
+    return e, Rz @ A, Rz @ B
 
 
 if __name__ == "__main__":
@@ -19,6 +19,7 @@ import matplotlib.pyplot as plt
 from spatialmath import Polygon2, SE2, base
 from roboticstoolbox.mobile.PlannerBase import PlannerBase
 from roboticstoolbox.mobile.DubinsPlanner import DubinsPlanner
+from roboticstoolbox.mobile.VertexIndex import VertexIndex
 
 # from roboticstoolbox.mobile.OccupancyGrid import OccupancyGrid
 from pgraph import DGraph
@@ -28,8 +29,8 @@ class RRTPlanner(PlannerBase):
     r"""
     Rapidly exploring tree planner
 
-    :param map: occupancy grid
-    :type map: :class:`PolygonMap`
+    :param map: obstacle map
+    :type map: :class:`PolygonMap` or :class:`BinaryOccupancyGrid`
     :param vehicle: vehicle kinematic model
     :type vehicle: :class:`VehicleBase` subclass
     :param curvature: maximum path curvature, defaults to 1.0
@@ -109,8 +110,13 @@ class RRTPlanner(PlannerBase):
         self.map = map
 
         self.g = DGraph(metric="SE2")
+        self._index = VertexIndex(ndims=3, metric="SE2")
 
         self.vehicle = vehicle
+        if vehicle is not None:
+            # vehicle outline at the origin, transformed to each configuration
+            # tested for collision
+            self._footprint = vehicle.polygon((0, 0, 0))
         if curvature is None:
             if vehicle is not None:
                 curvature = vehicle.curvature_max
@@ -142,7 +148,10 @@ class RRTPlanner(PlannerBase):
 
         For every new point added, a Dubins path is computed to the nearest
         vertex already in the graph.  Each configuration on that path, with
-        spacing of ``stepsize``, is tested for obstacle intersection.
+        spacing of ``stepsize``, is tested for obstacle intersection using
+        a single call to the map's ``iscollision_path`` method.  The
+        nearest vertex is found using a KD-tree over the vertex configurations
+        with the graph's SE(2) distance metric.
 
         The configurations tested are displayed (translation only) if ``showsamples`` is
         True.  The valid configurations are displayed as vehicle polygones if ``showvalid``
@@ -158,6 +167,7 @@ class RRTPlanner(PlannerBase):
 
         v = self.g.add_vertex(coord=goal)
         v.path = None
+        self._index.add(goal, v)
 
         if showsamples or showvalid:
             self.map.plot()
@@ -172,27 +182,21 @@ class RRTPlanner(PlannerBase):
                 if animate:
                     plt.pause(0.02)
 
-            vnearest, d = self.g.closest(random_point)
+            vnearest, d = self._index.closest(random_point)
 
             if d > 6:
                 continue
+            if self.dubins.length(random_point, vnearest.coord) > 6:
+                # print('too long')
+                continue
             path, pstatus = self.dubins.query(random_point, vnearest.coord)
             if path is None:
                 continue
 
-            collision = False
-            for config in path:
-                if self.map.iscollision(self.vehicle.polygon(config)):
-                    collision = True
-                    break
-            if collision:
+            if self.map.iscollision_path(self._footprint, path):
                 # print('collision')
                 continue
 
-            if pstatus.length > 6:
-                # print('too long')
-                continue
-
             # we have a valid configuration to add to the graph
             count += 1
             self.progress_next()
@@ -201,6 +205,7 @@ class RRTPlanner(PlannerBase):
             vnew = self.g.add_vertex(random_point)
             self.g.add_edge(vnew, vnearest, cost=pstatus.length)
             vnew.path = path
+            self._index.add(random_point, vnew)
 
             if showvalid:
                 self.vehicle.polygon(random_point).plot(color="b", alpha=0.1)
@@ -237,7 +242,7 @@ class RRTPlanner(PlannerBase):
 
         """
         self._start = start
-        vstart, d = self.g.closest(start)
+        vstart, d = self._index.closest(start)
 
         vpath, cost, _ = self.g.path_UCS(vstart, self.g[0])
 
@@ -316,9 +321,9 @@ class RRTPlanner(PlannerBase):
         :rtype: bool
 
         Transforms the vehicle polygon and tests for intersection against
-        the polygonal obstacle map.
+        the obstacle map.
         """
-        return self.map.iscollision(self.vehicle.polygon(q))
+        return self.map.iscollision_path(self._footprint, q)
 
 
 if __name__ == "__main__":
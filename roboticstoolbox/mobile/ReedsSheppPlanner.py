@@ -1,6 +1,8 @@
 import math
 from collections import namedtuple
+from functools import lru_cache
 from roboticstoolbox.mobile.PlannerBase import PlannerBase
+from roboticstoolbox.mobile.DubinsPlanner import generate_local_course, _wrap_0_2pi
 import matplotlib.pyplot as plt
 import numpy as np
 from spatialmath import *
@@ -258,103 +260,6 @@ def generate_path(q0, q1, max_curvature):
     return paths
 
 
-def interpolate(
-    ind,
-    length,
-    mode,
-    max_curvature,
-    origin_x,
-    origin_y,
-    origin_yaw,
-    path_x,
-    path_y,
-    path_yaw,
-    directions,
-):
-    if mode == "S":
-        path_x[ind] = origin_x + length / max_curvature * math.cos(origin_yaw)
-        path_y[ind] = origin_y + length / max_curvature * math.sin(origin_yaw)
-        path_yaw[ind] = origin_yaw
-    else:  # curve
-        ldx = math.sin(length) / max_curvature
-        ldy = 0.0
-        if mode == "L":  # left turn
-            ldy = (1.0 - math.cos(length)) / max_curvature
-        elif mode == "R":  # right turn
-            ldy = (1.0 - math.cos(length)) / -max_curvature
-        gdx = math.cos(-origin_yaw) * ldx + math.sin(-origin_yaw) * ldy
-        gdy = -math.sin(-origin_yaw) * ldx + math.cos(-origin_yaw) * ldy
-        path_x[ind] = origin_x + gdx
-        path_y[ind] = origin_y + gdy
-
-    if mode == "L":  # left turn
-        path_yaw[ind] = origin_yaw + length
-    elif mode == "R":  # right turn
-        path_yaw[ind] = origin_yaw - length
-
-    if length > 0.0:
-        directions[ind] = 1
-    else:
-        directions[ind] = -1
-
-    return path_x, path_y, path_yaw, directions
-
-
-def generate_local_course(total_length, lengths, mode, max_curvature, step_size):
-    n_point = math.trunc(total_length / step_size) + len(lengths) + 4
-
-    px = [0.0 for _ in range(n_point)]
-    py = [0.0 for _ in range(n_point)]
-    pyaw = [0.0 for _ in range(n_point)]
-    directions = [0.0 for _ in range(n_point)]
-    ind = 1
-
-    if lengths[0] > 0.0:
-        directions[0] = 1
-    else:
-        directions[0] = -1
-
-    ll = 0.0
-
-    for (m, l, i) in zip(mode, lengths, range(len(mode))):
-        if l > 0.0:
-            d = step_size
-        else:
-            d = -step_size
-
-        # set origin state
-        ox, oy, oyaw = px[ind], py[ind], pyaw[ind]
-
-        ind -= 1
-        if i >= 1 and (lengths[i - 1] * lengths[i]) > 0:
-            pd = -d - ll
-        else:
-            pd = d - ll
-
-        while abs(pd) <= abs(l):
-            ind += 1
-            px, py, pyaw, directions = interpolate(
-                ind, pd, m, max_curvature, ox, oy, oyaw, px, py, pyaw, directions
-            )
-            pd += d
-
-        ll = l - pd - d  # calc remain length
-
-        ind += 1
-        px, py, pyaw, directions = interpolate(
-            ind, l, m, max_curvature, ox, oy, oyaw, px, py, pyaw, directions
-        )
-
-    # remove unused data
-    while abs(px[-1]) < 1e-10:
-        px.pop()
-        py.pop()
-        pyaw.pop()
-        directions.pop()
-
-    return px, py, pyaw, directions
-
-
 def pi_2_pi(angle):
     return (angle + math.pi) % (2 * math.pi) - math.pi
 
@@ -370,6 +275,8 @@ def calc_paths(sx, sy, syaw, gx, gy, gyaw, maxc, step_size):
         x, y, yaw, directions = generate_local_course(
             path.L, path.lengths, path.ctypes, maxc, step_size * maxc
         )
+        while abs(x[-1]) < 1e-10:
+            x, y, yaw, directions = x[:-1], y[:-1], yaw[:-1], directions[:-1]
 
         # convert global coordinate
         path.x = [
@@ -388,28 +295,174 @@ def calc_paths(sx, sy, syaw, gx, gy, gyaw, maxc, step_size):
     return paths
 
 
-def reeds_shepp_path_planning(start, goal, maxc, step_size):
-
-    s_x, s_y, s_yaw = start
-    g_x, g_y, g_yaw = goal
-
-    paths = calc_paths(s_x, s_y, s_yaw, g_x, g_y, g_yaw, maxc, step_size)
-
+@lru_cache(maxsize=1024)
+def _local_path(x, y, phi, maxc, step_size):
+    # shortest path from the origin, memoized for repeated relative
+    # configurations
+    paths = generate_path([0.0, 0.0, 0.0], [x, y, phi], maxc)
     if not paths:
         return None
 
+    # choose the shortest path, the last of equal length, and interpolate only
+    # that one
     minL = float("Inf")
     best_path_index = -1
     for i, _ in enumerate(paths):
         if paths[i].L <= minL:
             minL = paths[i].L
             best_path_index = i
-
     bpath = paths[best_path_index]
 
+    x, y, yaw, directions = generate_local_course(
+        bpath.L, bpath.lengths, bpath.ctypes, maxc, step_size * maxc
+    )
+    course = np.c_[x, y, yaw, directions]
+    while abs(course[-1, 0]) < 1e-10:
+        course = course[:-1]
+    course.flags.writeable = False
+    return tuple(bpath.ctypes), tuple(bpath.lengths), bpath.L, course
+
+
+def reeds_shepp_path_planning(start, goal, maxc, step_size):
+
+    s_x, s_y, s_yaw = start
+    g_x, g_y, g_yaw = goal
+
+    # goal relative to start, the path for a repeated relative configuration
+    # is found in the cache
+    dx = g_x - s_x
+    dy = g_y - s_y
+    c = math.cos(s_yaw)
+    s = math.sin(s_yaw)
+    local = _local_path(
+        c * dx + s * dy,
+        -s * dx + c * dy,
+        g_yaw - s_yaw,
+        maxc,
+        step_size,
+    )
+    if local is None:
+        return None
+    ctypes, lengths, L, course = local
+
+    # convert global coordinate
+    bpath = _Path()
+    bpath.ctypes = list(ctypes)
+    bpath.x = c * course[:, 0] - s * course[:, 1] + s_x
+    bpath.y = s * course[:, 0] + c * course[:, 1] + s_y
+    bpath.yaw = pi_2_pi(course[:, 2] + s_yaw)
+    bpath.directions = course[:, 3]
+    bpath.lengths = [length / maxc for length in lengths]
+    bpath.L = L / maxc
+
     return bpath
 
 
+def _polar(x, y):
+    return np.sqrt(x**2 + y**2), np.arctan2(y, x)
+
+
+def _straight_left_straight(x, y, phi):
+    # as straight_left_straight for arrays, returns flag, t, u, v
+    phi = _wrap_0_2pi(phi)
+    xd = -y / np.tan(phi) + x
+    t = xd - np.tan(phi / 2.0)
+    u = phi
+    v = np.sign(y) * np.sqrt((x - xd) ** 2 + y**2) - np.tan(phi / 2.0)
+    return (y != 0.0) & (0.0 < phi) & (phi < math.pi * 0.99), t, u, v
+
+
+def _left_straight_left(x, y, phi):
+    u, t = _polar(x - np.sin(phi), y - 1.0 + np.cos(phi))
+    v = _wrap_0_2pi(phi - t)
+    return t >= 0.0, t, u, v
+
+
+def _left_straight_right(x, y, phi):
+    u1, t1 = _polar(x + np.sin(phi), y - 1.0 - np.cos(phi))
+    u1 = u1**2
+    u = np.sqrt(np.maximum(u1 - 4.0, 0))
+    theta = np.arctan2(2.0, u)
+    t = _wrap_0_2pi(t1 + theta)
+    v = _wrap_0_2pi(t - phi)
+    return u1 >= 4.0, t, u, v
+
+
+def _left_right_left(x, y, phi):
+    u1, t1 = _polar(x - np.sin(phi), y - 1.0 + np.cos(phi))
+    u = -2.0 * np.arcsin(np.minimum(0.25 * u1, 1))
+    t = _wrap_0_2pi(t1 + 0.5 * u + math.pi)
+    v = _wrap_0_2pi(phi - t + u)
+    return u1 <= 4.0, t, u, v
+
+
+def path_length(start, goal, maxc):
+    r"""
+    Length of Reeds-Shepp paths
+
+    :param start: start configurations :math:`(x, y, \theta)`
+    :type start: array_like(3) or ndarray(N,3)
+    :param goal: goal configurations :math:`(x, y, \theta)`
+    :type goal: array_like(3) or ndarray(N,3)
+    :param maxc: maximum path curvature
+    :type maxc: float
+    :return: length of the shortest path between each start and goal
+    :rtype: ndarray(N)
+
+    The lengths are computed for all pairs of configurations at once, without
+    computing points along the paths.  The same set of candidate paths is
+    considered as by :func:`generate_path`.  Either argument can be a single
+    configuration which is paired with every configuration of the other.
+    """
+    start = np.atleast_2d(start)
+    goal = np.atleast_2d(goal)
+
+    dx = goal[:, 0] - start[:, 0]
+    dy = goal[:, 1] - start[:, 1]
+    phi = goal[:, 2] - start[:, 2]
+    c = np.cos(start[:, 2])
+    s = np.sin(start[:, 2])
+    x = (c * dx + s * dy) * maxc
+    y = (-s * dx + c * dy) * maxc
+    xb = x * np.cos(phi) + y * np.sin(phi)
+    yb = x * np.sin(phi) - y * np.cos(phi)
+
+    # candidate paths in the order of generate_path, with the index of their
+    # segment types
+    candidates = [
+        (_straight_left_straight, x, y, phi, 0),  # SLS
+        (_straight_left_straight, x, -y, -phi, 1),  # SRS
+        (_left_straight_left, x, y, phi, 2),  # LSL
+        (_left_straight_left, -x, y, -phi, 2),
+        (_left_straight_left, x, -y, -phi, 3),  # RSR
+        (_left_straight_left, -x, -y, phi, 3),
+        (_left_straight_right, x, y, phi, 4),  # LSR
+        (_left_straight_right, -x, y, -phi, 4),
+        (_left_straight_right, x, -y, -phi, 5),  # RSL
+        (_left_straight_right, -x, -y, phi, 5),
+        (_left_right_left, x, y, phi, 6),  # LRL
+        (_left_right_left, -x, y, -phi, 6),
+        (_left_right_left, x, -y, -phi, 7),  # RLR
+        (_left_right_left, -x, -y, phi, 7),
+        (_left_right_left, xb, yb, phi, 6),
+        (_left_right_left, -xb, yb, -phi, 6),
+        (_left_right_left, xb, -yb, -phi, 7),
+        (_left_right_left, -xb, -yb, phi, 7),
+    ]
+
+    # shortest path of each type, a path is not added if one of the same type
+    # is already present, as for set_path
+    Lmin = np.full((8, len(x)), np.inf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for word, x_, y_, phi_, k in candidates:
+            flag, t, u, v = word(x_, y_, phi_)
+            L = np.abs(t) + np.abs(u) + np.abs(v)
+            add = flag & ~(Lmin[k] - L <= 0.01) & (L >= 0.01)
+            Lmin[k] = np.where(add, np.minimum(Lmin[k], L), Lmin[k])
+
+    return Lmin.min(axis=0) / maxc
+
+
 # ====================== RTB wrapper ============================= #
 
 # Copyright (c) 2022 Peter Corke: https://github.com/petercorke/robotics-toolbox-python
@@ -468,6 +521,15 @@ class ReedsSheppPlanner(PlannerBase):
             super().__str__()
             + f"\n  curvature={self.curvature}, stepsize={self.stepsize}"
         )
+        return s
+
+    @property
+    def curvature(self):
+        return self._curvature
+
+    @property
+    def stepsize(self):
+        return self._stepsize
 
     def query(self, start, goal, **kwargs):
         r"""
@@ -525,6 +587,37 @@ class ReedsSheppPlanner(PlannerBase):
             bpath.directions,
         )
 
+    def length(self, start, goal):
+        r"""
+        Length of paths between configurations
+
+        :param start: start configuration :math:`(x, y, \theta)`
+        :type start: array_like(3) or ndarray(N,3)
+        :param goal: goal configuration :math:`(x, y, \theta)`
+        :type goal: array_like(3) or ndarray(N,3)
+        :return: path length
+        :rtype: float or ndarray(N)
+
+        Returns the length of the path that :meth:`query` would find, without
+        computing the points along it.  If ``start`` and ``goal`` are arrays
+        the lengths of all the paths are computed at once, and either can be
+        a single configuration.  This is useful as a distance metric for
+        finding nearby configurations.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> from roboticstoolbox import ReedsSheppPlanner
+            >>> from math import pi
+            >>> reedsshepp = ReedsSheppPlanner(curvature=1.0)
+            >>> reedsshepp.length(start=(0, 0, pi/2), goal=[(1, 0, pi/2), (0, 2, pi/2)])
+        """
+        L = path_length(start, goal, self._curvature)
+        if np.ndim(start) == 1 and np.ndim(goal) == 1:
+            return L[0]
+        return L
+
 
 if __name__ == "__main__":
     from math import pi
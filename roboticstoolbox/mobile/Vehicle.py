@@ -349,24 +349,39 @@ class VehicleBase(ABC):
         Apply velocity and acceleration limits (superclass)
 
         :param v: desired velocity
-        :type v: float
+        :type v: float or ndarray(N)
         :param v_prev: previous velocity, reference to list
-        :type v_prev: list with single element
+        :type v_prev: list with single element, or ndarray(N)
         :return: allowed velocity
-        :rtype: float
+        :rtype: float or ndarray(N)
 
         Determine allowable velocity given desired velocity, speed and
         acceleration limits.
 
+        For a fleet of vehicles ``v`` is an array of velocities, one per
+        vehicle, and ``v_prev`` is an array of their previous velocities.
+
         .. note:: This function requires previous velocity, ``v_prev`` to enable
             acceleration limiting.  This is passed as a reference to a mutable value,
-            a single-element list. This is reset to zero at the start of each simulation.
+            a single-element list or an array which is updated in place. This is
+            reset to zero at the start of each simulation.
         """
+        if isinstance(v, np.ndarray) and v.ndim == 1:
+            # v is a set of vehicle velocities, do vectorized form
+            if self._accel_max is not None:
+                dv = self._accel_max * self._dt
+                v = np.clip(v, v_prev - dv, v_prev + dv)
+            v_prev[:] = v
+
+            if self._speed_max is not None:
+                v = np.clip(v, -self._speed_max, self._speed_max)
+            return v
+
         # acceleration limit
         vp = v_prev[0]
         if self._accel_max is not None:
             if (v - vp) / self._dt > self._accel_max:
-                v = vp + self._accelmax * self._dt
+                v = vp + self._accel_max * self._dt
             elif (v - vp) / self._dt < -self._accel_max:
                 v = vp - self._accel_max * self._dt
         v_prev[0] = v
@@ -1040,13 +1055,13 @@ class Bicycle(VehicleBase):
         Time derivative of state
 
         :param x: vehicle state :math:`(x, y, \theta)`
-        :type x: array_like(3)
+        :type x: array_like(3), ndarray(n,3)
         :param u: control input :math:`(v, \gamma)`
-        :type u: array_like(2)
+        :type u: array_like(2), ndarray(n,2)
         :param limits: limits are applied to input, default True
         :type limits: bool
         :return: state derivative :math:`(\dot{x}, \dot{y}, \dot{\theta})`
-        :rtype: ndarray(3)
+        :rtype: ndarray(3), ndarray(n,3)
 
         Returns the time derivative of state (3x1) at the state ``x`` with velocity :math:`v`
         and steered wheel angle :math:`\gamma`
@@ -1059,14 +1074,26 @@ class Bicycle(VehicleBase):
         If ``limits`` is True then speed, acceleration and steer-angle limits are
         applied to ``u``.
 
+        For a fleet of vehicles ``x`` and ``u`` are 2D arrays with one state and
+        control input per row, and the derivatives are returned one per row.
+
         :seealso: :meth:`f`
         """
+        if limits:
+            u = self.u_limited(u)
+
+        if isinstance(x, np.ndarray) and x.ndim == 2:
+            # x is Nx3 set of vehicle states, do vectorized form
+            theta = x[:, 2]
+            v, gamma = u.T
+            return (
+                v[:, np.newaxis]
+                * np.c_[np.cos(theta), np.sin(theta), np.tan(gamma) / self.l]
+            )
 
         # unpack some variables
         theta = x[2]
 
-        if limits:
-            u = self.u_limited(u)
         v = u[0]
         gamma = u[1]
 
@@ -1077,15 +1104,21 @@ class Bicycle(VehicleBase):
         Apply vehicle velocity, acceleration and steering limits
 
         :param u: Desired vehicle inputs :math:`(v, \gamma)`
-        :type u: array_like(2)
+        :type u: array_like(2), ndarray(n,2)
         :return: Allowable vehicle inputs :math:`(v, \gamma)`
-        :rtype: ndarray(2)
+        :rtype: ndarray(2), ndarray(n,2)
 
         Velocity and acceleration limits are applied to :math:`v` and
-        steered wheel angle limits are applied to :math:`\gamma`.
+        steered wheel angle limits are applied to :math:`\gamma`.  For a fleet
+        of vehicles ``u`` has one row per vehicle.
         """
         # limit speed and steer angle
         ulim = np.array(u)
+        if ulim.ndim == 2:
+            ulim[:, 0] = self.limits_va(ulim[:, 0], self._v_prev)
+            ulim[:, 1] = np.clip(ulim[:, 1], -self._steer_max, self._steer_max)
+            return ulim
+
         ulim[0] = self.limits_va(u[0], self._v_prev)
         ulim[1] = np.clip(u[1], -self._steer_max, self._steer_max)
 
@@ -1138,13 +1171,13 @@ class Unicycle(VehicleBase):
         Time derivative of state
 
         :param x: vehicle state :math:`(x, y, \theta)`
-        :type x: array_like(3)
+        :type x: array_like(3), ndarray(n,3)
         :param u: control input :math:`(v, \omega)`
-        :type u: array_like(2)
+        :type u: array_like(2), ndarray(n,2)
         :param limits: limits are applied to input, default True
         :type limits: bool
         :return: state derivative :math:`(\dot{x}, \dot{y}, \dot{\theta})`
-        :rtype: ndarray(3)
+        :rtype: ndarray(3), ndarray(n,3)
 
         Returns the time derivative of state (3x1) at the state ``x`` with velocity :math:`v`
         and turn rate :math:`\omega`
@@ -1157,10 +1190,20 @@ class Unicycle(VehicleBase):
         If ``limits`` is True then speed, acceleration and steer-angle limits are
         applied to ``u``.
 
+        For a fleet of vehicles ``x`` and ``u`` are 2D arrays with one state and
+        control input per row, and the derivatives are returned one per row.
+
         :seealso: :meth:`f`
         """
         if limits:
             u = self.u_limited(u)
+
+        if isinstance(x, np.ndarray) and x.ndim == 2:
+            # x is Nx3 set of vehicle states, do vectorized form
+            theta = x[:, 2]
+            v, vdiff = u.T
+            return np.c_[v * np.cos(theta), v * np.sin(theta), vdiff / self._W]
+
         # unpack some variables
         theta = x[2]
         v = u[0]
@@ -1173,16 +1216,22 @@ class Unicycle(VehicleBase):
         Apply vehicle velocity, acceleration and steering limits
 
         :param u: Desired vehicle inputs :math:`(v, \omega)`
-        :type u: array_like(2)
+        :type u: array_like(2), ndarray(n,2)
         :return: Allowable vehicle inputs :math:`(v, \omega)`
-        :rtype: ndarray(2)
+        :rtype: ndarray(2), ndarray(n,2)
 
         Velocity and acceleration limits are applied to :math:`v` and
-        turn rate limits are applied to :math:`\omega`.
+        turn rate limits are applied to :math:`\omega`.  For a fleet of
+        vehicles ``u`` has one row per vehicle.
         """
 
         # limit speed and steer angle
         ulim = np.array(u)
+        if ulim.ndim == 2:
+            ulim[:, 0] = self.limits_va(ulim[:, 0], self._v_prev)
+            ulim[:, 1] = np.clip(ulim[:, 1], -self._steer_max, self._steer_max)
+            return ulim
+
         ulim[0] = self.limits_va(u[0], self._v_prev)
         ulim[1] = np.maximum(-self._steer_max, np.minimum(self._steer_max, u[1]))
 
@@ -1222,44 +1271,49 @@ class DiffSteer(Unicycle):
         s = super().__str__()
         return s
 
-    def init(self):
-        super().init()
+    def init(self, *args, **kwargs):
+        super().init(*args, **kwargs)
         self._v_prev_L = [0]
         self._v_prev_R = [0]
 
-
     def u_limited(self, u):
         """
         Apply vehicle velocity and acceleration limits
 
         :param u: Desired vehicle inputs :math:`(v_L, v_R)`
-        :type u: array_like(2)
+        :type u: array_like(2), ndarray(n,2)
         :return: Allowable vehicle inputs :math:`(v_L, v_R)`
-        :rtype: ndarray(2)
+        :rtype: ndarray(2), ndarray(n,2)
 
         Velocity and acceleration limits are applied to :math:`v` and
-        turn rate limits are applied to :math:`\omega`.
+        turn rate limits are applied to :math:`\omega`.  For a fleet of
+        vehicles ``u`` has one row per vehicle.
         """
 
         # limit speed and acceleration of each wheel/track
         ulim = np.array(u)
+        if ulim.ndim == 2:
+            ulim[:, 0] = self.limits_va(ulim[:, 0], self._v_prev_L)
+            ulim[:, 1] = self.limits_va(ulim[:, 1], self._v_prev_R)
+            return ulim
+
         ulim[0] = self.limits_va(u[0], self._v_prev_L)
         ulim[1] = self.limits_va(u[1], self._v_prev_R)
 
         return ulim
-    
+
     def deriv(self, x, u, limits=True):
         r"""
         Time derivative of state
 
         :param x: vehicle state :math:`(x, y, \theta)`
-        :type x: array_like(3)
+        :type x: array_like(3), ndarray(n,3)
         :param u: Desired vehicle inputs :math:`(v_L, v_R)`
-        :type u: array_like(2)
+        :type u: array_like(2), ndarray(n,2)
         :param limits: limits are applied to input, default True
         :type limits: bool
         :return: state derivative :math:`(\dot{x}, \dot{y}, \dot{\theta})`
-        :rtype: ndarray(3)
+        :rtype: ndarray(3), ndarray(n,3)
 
         Returns the time derivative of state (3x1) at the state ``x`` with left and
         right wheel speeds ``u``.
@@ -1276,10 +1330,22 @@ class DiffSteer(Unicycle):
         If ``limits`` is True then speed and acceleration limits are applied to the
         wheel speeds ``u``.
 
+        For a fleet of vehicles ``x`` and ``u`` are 2D arrays with one state and
+        control input per row, and the derivatives are returned one per row.
+
         :seealso: :meth:`f`
         """
         if limits:
             u = self.u_limited(u)
+
+        if isinstance(x, np.ndarray) and x.ndim == 2:
+            # x is Nx3 set of vehicle states, do vectorized form
+            theta = x[:, 2]
+            vleft, vright = u.T
+            v = (vright + vleft) / 2.0
+            vdiff = vright - vleft
+            return np.c_[v * np.cos(theta), v * np.sin(theta), vdiff / self._W]
+
         # unpack some variables
         theta = x[2]
         vleft = u[0]
@@ -1292,7 +1358,7 @@ class DiffSteer(Unicycle):
         return np.r_[v * cos(theta), v * sin(theta), vdiff / self._W]
 
 
-    
+
 if __name__ == "__main__":
 
     from roboticstoolbox import RandomPath
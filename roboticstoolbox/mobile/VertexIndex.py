@@ -0,0 +1,182 @@
+"""
+Spatial indices for nearest vertex queries in planner graphs
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class VertexIndex:
+    def __init__(self, ndims=2, metric="L2"):
+        r"""
+        Nearest vertex index for a growing graph
+
+        :param ndims: dimension of vertex coordinates, defaults to 2
+        :type ndims: int, optional
+        :param metric: distance metric, "L2" or "SE2", defaults to "L2"
+        :type metric: str, optional
+
+        Vertices are held in a KD-tree plus a buffer of recently added
+        vertices which is searched exhaustively.  When the buffer holds more
+        than :math:`\sqrt{N \log N}` vertices, where :math:`N` is the number
+        in the tree, the tree is rebuilt over all vertices.  This balances the
+        cost of rebuilding against the cost of scanning the buffer, and
+        growing a tree of :math:`N` vertices with a query per vertex costs
+        :math:`O(N^{1.5})` rather than the :math:`O(N^2)` of a linear scan per
+        query.
+
+        For the "SE2" metric the coordinates are :math:`(x, y, \theta)` and the
+        distance is :math:`\sqrt{x^2 + y^2 + \bar{\theta}^2}` where
+        :math:`\bar{\theta}` is the angular difference wrapped to the interval
+        :math:`[-\pi, \pi)`, the same as the pgraph "SE2" metric.  The tree is
+        built with a periodic boundary in :math:`\theta`.
+
+        :seealso: :meth:`pgraph.PGraph.closest`
+        """
+        if metric == "SE2":
+            if ndims != 3:
+                raise ValueError("SE2 metric requires 3D coordinates")
+            self._boxsize = np.r_[0, 0, 2 * np.pi]
+        elif metric == "L2":
+            self._boxsize = None
+        else:
+            raise ValueError("unknown metric")
+
+        self._metric = metric
+        self._ndims = ndims
+        self._coords = np.zeros((0, ndims))
+        self._vertices = []
+        self._tree = None
+        self._ntree = 0
+
+    def __len__(self):
+        return len(self._vertices)
+
+    def _wrap(self, coords):
+        # map coordinates to the domain of the tree
+        coords = np.array(coords, dtype=float).reshape((-1, self._ndims))
+        if self._metric == "SE2":
+            coords[:, 2] = np.mod(coords[:, 2] + np.pi, 2 * np.pi)
+        return coords
+
+    def _distance(self, coords, p):
+        # distance from each row of coords to the point p
+        d = coords - p
+        if self._metric == "SE2":
+            d[:, 2] = np.mod(d[:, 2] + np.pi, 2 * np.pi) - np.pi
+        return np.linalg.norm(d, axis=1)
+
+    def add(self, coord, vertex):
+        """
+        Add a vertex to the index
+
+        :param coord: vertex coordinate
+        :type coord: array_like(ndims)
+        :param vertex: the vertex
+        :type vertex: any
+        """
+        n = len(self._vertices)
+        if n == self._coords.shape[0]:
+            # grow the coordinate buffer by doubling
+            self._coords = np.vstack(
+                (self._coords, np.zeros((max(n, 64), self._ndims)))
+            )
+        self._coords[n] = self._wrap(coord)
+        self._vertices.append(vertex)
+
+        nbuffer = n + 1 - self._ntree
+        if nbuffer > max(64, np.sqrt(self._ntree * np.log2(self._ntree + 1))):
+            self._tree = cKDTree(self._coords[: n + 1], boxsize=self._boxsize)
+            self._ntree = n + 1
+
+    def closest(self, coord):
+        """
+        Vertex closest to point
+
+        :param coord: coordinates of a point
+        :type coord: array_like(ndims)
+        :return: closest vertex and its distance
+        :rtype: tuple
+
+        Returns ``(None, inf)`` if the index is empty.
+        """
+        p = self._wrap(coord)[0]
+
+        vmin, dmin = None, np.inf
+        if self._ntree > 0:
+            dmin, vmin = self._tree.query(p)
+
+        # search the vertices added since the tree was built
+        if len(self._vertices) > self._ntree:
+            d = self._distance(self._coords[self._ntree : len(self._vertices)], p)
+            k = np.argmin(d)
+            if d[k] < dmin:
+                dmin, vmin = d[k], self._ntree + k
+
+        if vmin is None:
+            return None, np.inf
+        return self._vertices[vmin], float(dmin)
+
+
+class LatticeIndex:
+    def __init__(self, root=(0, 0, 0)):
+        r"""
+        Exact vertex index for a lattice
+
+        :param root: configuration of the lattice root, defaults to (0, 0, 0)
+        :type root: array_like(3), optional
+
+        Lattice vertices lie on integer positions, with headings that are
+        multiples of :math:`\pi/2`, relative to the root configuration.  The
+        vertices are held in a dictionary keyed on these discrete
+        coordinates so that insertion and lookup are :math:`O(1)`.
+        """
+        self._root = np.array(root, dtype=float)
+        c, s = np.cos(self._root[2]), np.sin(self._root[2])
+        self._Rinv = np.array([[c, s], [-s, c]])
+        self._table = {}
+
+    def __len__(self):
+        return len(self._table)
+
+    def key(self, xyt):
+        """
+        Discrete lattice coordinate
+
+        :param xyt: configuration :math:`(x, y, \theta)`
+        :type xyt: array_like(3)
+        :return: lattice coordinate (ix, iy, itheta) relative to the root
+        :rtype: tuple of int
+        """
+        xy = self._Rinv @ (np.r_[xyt[0], xyt[1]] - self._root[:2])
+        it = round((xyt[2] - self._root[2]) * 2 / np.pi) % 4
+        return (int(round(xy[0])), int(round(xy[1])), int(it))
+
+    def add(self, xyt, vertex):
+        """
+        Add a vertex to the index
+
+        :param xyt: vertex configuration :math:`(x, y, \theta)`
+        :type xyt: array_like(3)
+        :param vertex: the vertex
+        :type vertex: any
+        """
+        self._table[self.key(xyt)] = vertex
+
+    def closest(self, xyt):
+        """
+        Vertex at the nearest lattice point
+
+        :param xyt: configuration :math:`(x, y, \theta)`
+        :type xyt: array_like(3)
+        :return: vertex and its SE(2) distance from ``xyt``, or
+            ``(None, inf)`` if the lattice point has no vertex
+        :rtype: tuple
+        """
+        vertex = self._table.get(self.key(xyt))
+        if vertex is None:
+            return None, np.inf
+
+        d = np.r_[vertex.coord] - np.r_[xyt]
+        d[2] = (d[2] + np.pi) % (2 * np.pi) - np.pi
+        return vertex, np.linalg.norm(d)
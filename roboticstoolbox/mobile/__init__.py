@@ -1,11 +1,12 @@
 # motion models
 from roboticstoolbox.mobile.Vehicle import VehicleBase, Bicycle, Unicycle, DiffSteer
-
+from roboticstoolbox.mobile.Fleet import Fleet
 
 # planners
 from roboticstoolbox.mobile.PlannerBase import PlannerBase
 from roboticstoolbox.mobile.DistanceTransformPlanner import DistanceTransformPlanner
 from roboticstoolbox.mobile.DstarPlanner import DstarPlanner
+from roboticstoolbox.mobile.DstarLitePlanner import DstarLitePlanner
 from roboticstoolbox.mobile.PRMPlanner import PRMPlanner
 from roboticstoolbox.mobile.LatticePlanner import LatticePlanner
 from roboticstoolbox.mobile.DubinsPlanner import DubinsPlanner
@@ -35,6 +36,8 @@ from roboticstoolbox.mobile.Animations import (
 
 from roboticstoolbox.mobile.PoseGraph import *
 from roboticstoolbox.mobile.EKF import EKF
+from roboticstoolbox.mobile.EIF import EIF
+from roboticstoolbox.mobile.History import History
 from roboticstoolbox.mobile.ParticleFilter import ParticleFilter
 
 __all__ = [
@@ -42,6 +45,7 @@ __all__ = [
     "Bicycle",
     "Unicycle",
     "DiffSteer",
+    "Fleet",
     "VehicleAnimationBase",
     "VehicleMarker",
     "VehiclePolygon",
@@ -49,6 +53,7 @@ __all__ = [
     "Bug2",
     "DistanceTransformPlanner",
     "DstarPlanner",
+    "DstarLitePlanner",
     "DubinsPlanner",
     "LatticePlanner",
     "ReedsSheppPlanner",
@@ -67,7 +72,9 @@ __all__ = [
     "PlannerBase",
     "RRTPlanner",
     "EKF",
+    "EIF",
     "ParticleFilter",
+    "History",
 ]
 
 
@@ -1,6 +1,7 @@
 from abc import ABC
 import numpy as np
 import scipy as sp
+from scipy.spatial import cKDTree
 from math import pi, sin, cos
 import matplotlib.pyplot as plt
 from spatialmath import base
@@ -80,6 +81,7 @@ class LandmarkMap:
             raise ValueError("bad type for map")
 
         self._verbose = verbose
+        self._tree = None
 
     def __str__(self):
         # s = M.char() is a string showing map parameters in
@@ -135,6 +137,29 @@ class LandmarkMap:
         """
         return self._map[:, k]
 
+    def within(self, p, radius):
+        """
+        Landmarks within a distance of a point
+
+        :param p: coordinate :math:`(x,y)` of the point
+        :type p: array_like(2)
+        :param radius: distance from the point
+        :type radius: float
+        :return: ids of the landmarks, in ascending order
+        :rtype: ndarray(k)
+
+        The landmarks are held in a KD-tree, built when first needed, so the
+        cost of the query depends on the number of landmarks returned rather
+        than the number in the map.
+
+        :seealso: :meth:`~roboticstoolbox.mobile.sensors.RangeBearingSensor.visible`
+        """
+        if self._tree is None:
+            self._tree = cKDTree(self._map.T)
+        ids = np.array(self._tree.query_ball_point(base.getvector(p, 2), radius))
+        ids.sort()
+        return ids.astype(int)
+
     def plot(self, labels=False, block=None, **kwargs):
         """
         Plot landmark map
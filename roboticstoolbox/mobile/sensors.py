@@ -208,6 +208,7 @@ class SensorBase(ABC):
 # covar can be 2x2 or (2,)
 # .W property
 class RangeBearingSensor(SensorBase):
+
     def __init__(
         self,
         robot,
@@ -219,9 +220,9 @@ class RangeBearingSensor(SensorBase):
         angle=None,
         plot=False,
         seed=0,
+        batch=False,
         **kwargs,
     ):
-
         r"""
         Range and bearing angle sensor
 
@@ -241,6 +242,8 @@ class RangeBearingSensor(SensorBase):
         :type plot: bool, optional
         :param seed: random number seed, defaults to 0
         :type seed: int, optional
+        :param batch: each reading returns all visible landmarks, defaults to False
+        :type batch: bool, optional
         :param kwargs: arguments passed to :class:`SensorBase`
 
         Sensor object that returns the range and bearing angle :math:`(r,
@@ -256,6 +259,10 @@ class RangeBearingSensor(SensorBase):
         time :meth:`reading` is called, based on the current configuration of
         the ``robot``.
 
+        By default each reading is of a single visible landmark, chosen at
+        random.  If ``batch`` is True each reading is of all the visible
+        landmarks, see :meth:`reading`.
+
         .. runblock:: pycon
 
             >>> from roboticstoolbox import Bicycle, LandmarkMap, RangeBearingSensor
@@ -300,6 +307,7 @@ class RangeBearingSensor(SensorBase):
             self._theta_range = [-angle, angle]
 
         self._animate = plot
+        self._batch = batch
         self._landmarklog = []
 
         self._random = np.random.default_rng(seed)
@@ -345,18 +353,33 @@ class RangeBearingSensor(SensorBase):
         """
         return self._covar
 
+    @property
+    def batch(self):
+        """
+        Get batch reading mode
+
+        :return: each reading returns all visible landmarks
+        :rtype: bool
+
+        :seealso: :meth:`reading`
+        """
+        return self._batch
+
     def reading(self):
         r"""
         Choose landmark and return observation
 
         :return: range and bearing angle to a landmark, and landmark id
-        :rtype: ndarray(2), int
+        :rtype: ndarray(2), int or ndarray(k,2), ndarray(k)
 
         Returns an observation of a random visible landmark (range, bearing) and
         the ``id`` of that landmark. The landmark is chosen randomly from the
         set of all visible landmarks, those within the angular field of view and
         range limit.
 
+        If the constructor argument ``batch`` is set then return observations of
+        all :math:`k` visible landmarks, one per row, and an array of their ids.
+
         If constructor argument ``every`` is set then only return a valid
         reading on every ``every`` calls.
 
@@ -428,18 +451,34 @@ class RangeBearingSensor(SensorBase):
         #         hg = get(h, 'Parent')
         #         plot_poly(h, self.robot.x)
 
-        zk = self.visible()
-        if len(zk) > 1:
+        if self._batch:
+            z, lm_id = self._visible()
+            if len(lm_id) == 0:
+                if self.verbose:
+                    print("Sensor:: no features\n")
+                self._landmarklog.append(-1)
+                return (None, None)
+            if self.verbose:
+                for zi, id in zip(z, lm_id):
+                    print(f"Sensor:: feature {id}: ({zi[0]}, {zi[1]})")
+            self._landmarklog.append(lm_id)
+
+            # add independent noise with covariance W to each reading
+            z += self._random.multivariate_normal((0, 0), self._W, size=len(lm_id))
+            return z, lm_id
+
+        zk, ids = self._visible()
+        if len(ids) > 1:
             # more than 1 visible landmark, pick a random one
-            i = self._random.integers(len(zk))
-            z = zk[i][0]
-            lm_id = zk[i][1]
+            i = self._random.integers(len(ids))
+            z = zk[i]
+            lm_id = int(ids[i])
             if self.verbose:
                 print(f"Sensor:: feature {lm_id}: ({z[0]}, {z[1]})")
-        elif len(zk) == 1:
+        elif len(ids) == 1:
             # just 1 visible landmark
-            z = zk[0][0]
-            lm_id = zk[0][1]
+            z = zk[0]
+            lm_id = int(ids[0])
             if self.verbose:
                 print(f"Sensor:: feature {lm_id}: ({z[0]}, {z[1]})")
         else:
@@ -464,32 +503,47 @@ class RangeBearingSensor(SensorBase):
 
     def visible(self):
         """
-        List of all visible landmarks
+        All visible landmarks
 
-        :return: list of visible landmarks
-        :rtype: list of int
+        :return: range and bearing to the visible landmarks, and their ids
+        :rtype: ndarray(k,2), ndarray(k)
 
-        Return a list of the id of all landmarks that are visible, that is, it
-        lies with the sensing range and field of view of the sensor at the
+        Return the range and bearing to all landmarks that are visible, one
+        per row, and their ids in ascending order.  A landmark is visible if
+        it lies within the sensing range and field of view of the sensor at the
         robot's current configuration.
 
-        :seealso: :meth:`isvisible` :meth:`h`
+        If the sensor has a maximum range, only the landmarks within that range
+        are found, using the spatial index of the map, and the cost does not
+        depend on the size of the map.
+
+        :seealso: :meth:`isvisible` :meth:`h` :meth:`LandmarkMap.within`
         """
-        # get range/bearing to all landmarks
-        z = self.h(self.robot.x)
-        zk = [(z, k) for k, z in enumerate(z)]
-        # a list of tuples, each tuple is ((range, bearing), k)
+        return self._visible()
+
+    def _visible(self):
+        # range/bearing to all visible landmarks as an ndarray(k,2), and their
+        # ids as an ndarray(k)
+        x, y, t = self.robot.x
+        if self._r_range is not None:
+            ids = self.map.within((x, y), self._r_range[1])
+        else:
+            ids = np.arange(len(self.map))
+        dx = self.map.landmarks[0, ids] - x
+        dy = self.map.landmarks[1, ids] - y
+        z = np.c_[np.sqrt(dx**2 + dy**2), base.angdiff(np.arctan2(dy, dx), t)]
+        visible = np.full((z.shape[0],), True)
 
         if self._r_range is not None:
-            zk = filter(lambda zk: self._r_range[0] <= zk[0][0] <= self._r_range[1], zk)
+            visible &= (self._r_range[0] <= z[:, 0]) & (z[:, 0] <= self._r_range[1])
 
         if self._theta_range is not None:
             # find all within angular range as well
-            zk = filter(
-                lambda zk: self._theta_range[0] <= zk[0][1] <= self._theta_range[1], zk
+            visible &= (self._theta_range[0] <= z[:, 1]) & (
+                z[:, 1] <= self._theta_range[1]
             )
 
-        return list(zk)
+        return z[visible], ids[visible]
 
     def isvisible(self, id):
         """
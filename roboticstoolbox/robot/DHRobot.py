@@ -917,6 +917,122 @@ class DHRobot(Robot):
 
         return ets
 
+    def _link_A(self, q):
+        """
+        Link transforms for many configurations
+
+        :param q: joint configurations
+        :type q: ndarray(m,n)
+        :raises TypeError: a kinematic parameter or joint coordinate is
+            not numeric
+        :return: link transforms, element ``[i,j]`` is the pose of link frame
+            {j+1} relative to link frame {j} at configuration ``q[i,:]``
+        :rtype: ndarray(m,n,4,4)
+
+        Vectorized equivalent of :meth:`DHLink.A` for all links at once.
+        """
+        a, d, alpha, theta, offset, sigma, flip = np.array(
+            [
+                [L.a, L.d, L.alpha, L.theta, L.offset, L.sigma, L.ets[-1].isflip]
+                for L in self.links
+            ],
+            dtype=float,
+        ).T
+        q = np.array(q, dtype=float)
+
+        q = (1 - 2 * flip) * q + offset
+        if any(sigma):
+            st = np.sin(np.where(sigma, theta, q))
+            ct = np.cos(np.where(sigma, theta, q))
+            d = np.where(sigma, q, d)
+        else:
+            st = np.sin(q)
+            ct = np.cos(q)
+        sa = np.sin(alpha)
+        ca = np.cos(alpha)
+
+        A = np.zeros(q.shape + (4, 4))
+        if self.mdh == 0:
+            # standard DH
+            A[..., 0, 0] = ct
+            A[..., 0, 1] = -st * ca
+            A[..., 0, 2] = st * sa
+            A[..., 0, 3] = a * ct
+            A[..., 1, 0] = st
+            A[..., 1, 1] = ct * ca
+            A[..., 1, 2] = -ct * sa
+            A[..., 1, 3] = a * st
+            A[..., 2, 1] = sa
+            A[..., 2, 2] = ca
+            A[..., 2, 3] = d
+        else:
+            # modified DH
+            A[..., 0, 0] = ct
+            A[..., 0, 1] = -st
+            A[..., 0, 3] = a
+            A[..., 1, 0] = st * ca
+            A[..., 1, 1] = ct * ca
+            A[..., 1, 2] = -sa
+            A[..., 1, 3] = -sa * d
+            A[..., 2, 0] = st * sa
+            A[..., 2, 1] = ct * sa
+            A[..., 2, 2] = ca
+            A[..., 2, 3] = ca * d
+        A[..., 3, 3] = 1.0
+        return A
+
+    def eval(self, q, frames=False):
+        """
+        Forward kinematics as an array
+
+        :param q: The joint configuration
+        :type q: ndarray(n) or ndarray(m,n)
+        :param frames: return the pose of every link frame, defaults to False
+        :type frames: bool, optional
+        :raises TypeError: the robot or ``q`` is symbolic
+        :return: Forward kinematics as SE(3) matrices
+        :rtype: ndarray(4,4), ndarray(m,4,4), ndarray(n+1,4,4) or
+            ndarray(m,n+1,4,4)
+
+        - ``robot.eval(q)`` is the end-effector pose as an SE(3) matrix,
+          including the base and tool transforms.
+        - ``robot.eval(q, frames=True)`` are the poses of link frames {0} to
+          {n}, ie. the base transform followed by the pose of each link frame.
+          The tool transform is not applied.
+
+        If ``q`` is a 2D array, the rows are interpreted as a trajectory and
+        the result has a leading dimension of ``m``.  All link transforms are
+        evaluated at once using broadcast sine and cosine, and chained with
+        batched matrix products, which is much faster than :meth:`fkine` for
+        long trajectories as no ``SE3`` objects are created.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> puma = rtb.models.DH.Puma560()
+            >>> puma.eval([0, 0, 0, 0, 0, 0])
+
+        :seealso: :meth:`fkine`, :meth:`fkine_all`
+        """
+        q = np.array(q)
+        single = q.ndim < 2
+        A = self._link_A(getmatrix(q, (None, self.n)))
+
+        if frames:
+            T = np.empty((A.shape[0], self.n + 1, 4, 4))
+            T[:, 0] = self._T
+            for j in range(self.n):
+                T[:, j + 1] = T[:, j] @ A[:, j]
+        else:
+            T = np.broadcast_to(self._T, A.shape[:1] + (4, 4))
+            for j in range(self.n):
+                T = T @ A[:, j]
+            T = T @ self._tool
+
+        return T[0] if single else T
+
     def fkine(self, q, **kwargs):
         """
         Forward kinematics
@@ -950,6 +1066,13 @@ class DHRobot(Robot):
               kinematics are computed.
         """
 
+        try:
+            T = self.eval(getmatrix(q, (None, self.n)))
+            return SE3([Tk for Tk in T], check=False)
+        except TypeError:
+            # symbolic model or joint coordinates
+            pass
+
         if np.array_equal(self.base.A, np.eye(4)):
             base = None
         else:
@@ -997,8 +1120,17 @@ class DHRobot(Robot):
             - Kinematic Derivatives using the Elementary Transform
               Sequence, J. Haviland and P. Corke
         """
-        T = self.base
         q = getvector(q)
+
+        try:
+            T = self.eval(q, frames=True)
+            T[-1] = T[-1] @ self._tool
+            return SE3([Tk for Tk in T], check=False)
+        except TypeError:
+            # symbolic model or joint coordinates
+            pass
+
+        T = self.base
         Tj = T
 
         for q, L in zip(q, self.links):
@@ -1055,6 +1187,13 @@ class DHRobot(Robot):
         if q is None:
             q = self.q
 
+        try:
+            T = self.eval(getvector(q, self.n), frames=True)
+            return SE3([Tk for Tk in T], check=False)
+        except TypeError:
+            # symbolic model or joint coordinates
+            pass
+
         Tj = self.base.copy()
         Tall = Tj
 
@@ -1102,10 +1241,16 @@ class DHRobot(Robot):
 
         U = self.tool.A
 
+        try:
+            A = self._link_A(q[np.newaxis, :])[0]
+        except TypeError:
+            # symbolic model or joint coordinates
+            A = [L[j].A(q[j]).A for j in range(n)]
+
         for j in range(n - 1, -1, -1):
             if self.mdh == 0:
                 # standard DH convention
-                U = L[j].A(q[j]).A @ U  # type: ignore
+                U = A[j] @ U  # type: ignore
 
             if not L[j].sigma:
                 # revolute axis
@@ -1122,11 +1267,12 @@ class DHRobot(Robot):
                 d = U[2, :3]  # nz oz az
                 delta = np.zeros((3,))
 
-            J[:, j] = np.r_[d, delta]
+            J[:3, j] = d
+            J[3:, j] = delta
 
             if self.mdh != 0:
                 # modified DH convention
-                U = L[j].A(q[j]).A @ U  # type: ignore
+                U = A[j] @ U  # type: ignore
 
         # return top or bottom half if asked
         if half is not None:
@@ -1179,8 +1325,13 @@ class DHRobot(Robot):
         q = getvector(q, self.n)
 
         if T is None:
-            T = self.fkine(q)
-        T = T.A
+            try:
+                T = self.eval(q)
+            except TypeError:
+                # symbolic model or joint coordinates
+                T = self.fkine(q).A
+        else:
+            T = T.A
 
         # compute Jacobian in EE frame and transform to world frame
         J0 = tr2jac(T) @ self.jacobe(q)
@@ -1197,6 +1348,48 @@ class DHRobot(Robot):
                 raise ValueError("bad half specified")
         return J0
 
+    def _jacob0_batch(self, q, end=None, start=None):
+        """
+        Base-frame Jacobians for many configurations
+
+        :param q: joint configurations
+        :type q: ndarray(m,n)
+        :return: Jacobians
+        :rtype: ndarray(m,6,n)
+
+        Vectorized equivalent of :meth:`jacob0` for the rows of ``q``, the
+        columns are computed from the joint axes and origins of the link
+        frames given by :meth:`eval`.  ``end`` and ``start`` are ignored, as
+        for :meth:`ets`.
+        """
+        T = self.eval(q, frames=True)
+        pe = (T[:, -1] @ self._tool)[:, :3, 3]
+
+        # joint j moves about the z-axis of frame {j} for standard DH and
+        # frame {j+1} for modified DH
+        if self.mdh:
+            T = T[:, 1:]
+        else:
+            T = T[:, :-1]
+        z = T[..., :3, 2]
+        o = T[..., :3, 3]
+
+        J = np.empty((q.shape[0], 6, self.n))
+        J[:, :3] = np.swapaxes(np.cross(z, pe[:, np.newaxis] - o), 1, 2)
+        J[:, 3:] = np.swapaxes(z, 1, 2)
+
+        for j, link in enumerate(self.links):
+            if link.isprismatic:
+                J[:, :3, j] = J[:, 3:, j]
+                J[:, 3:, j] = 0
+            if link.ets[-1].isflip:
+                J[:, :, j] = -J[:, :, j]
+        return J
+
+    def _fkine_batch(self, q, end=None, start=None):
+        # end-effector poses for the rows of q, base and tool included
+        return self.eval(q).reshape((-1, 4, 4))
+
     def jacob0_analytical(self, q, representation=None, T=None):
         r"""
         Manipulator Jacobian in world frame
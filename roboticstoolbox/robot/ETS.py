@@ -52,6 +52,69 @@ else:  # pragma: nocover
     c_property = property
 
 
+def _manipulability(
+    J: NDArray,
+    method: str,
+    axes: List[bool],
+    M: Union[NDArray, None] = None,
+) -> NDArray:
+    """
+    Manipulability measure for a stack of Jacobians
+
+    Parameters
+    ----------
+    J
+        base-frame Jacobians, ndarray(m,6,n)
+    method
+        "yoshikawa", "invcondition", "minsingular" or "asada"
+    axes
+        task space axes to consider, list of 6 bools
+    M
+        joint-space inertia matrices, ndarray(m,n,n), required for "asada"
+
+    Returns
+    -------
+    w
+        manipulability of each Jacobian, ndarray(m)
+
+    Notes
+    -----
+    The determinants, singular values and eigenvalues are computed for the
+    whole stack in one call rather than one Jacobian at a time.
+
+    """
+
+    Ja = J[:, axes, :]
+
+    if method == "yoshikawa":
+        if Ja.shape[1] == Ja.shape[2]:
+            # simplified case for square matrix
+            return np.abs(det(Ja))
+        else:
+            return np.sqrt(np.abs(det(Ja @ np.swapaxes(Ja, 1, 2))))
+
+    elif method == "invcondition":
+        s = svd(Ja, compute_uv=False)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.nan_to_num(s[:, -1] / s[:, 0])
+
+    elif method == "minsingular":
+        # return last/smallest singular value of J
+        return svd(Ja, compute_uv=False)[:, -1]
+
+    elif method == "asada":
+        Ji = np.linalg.pinv(J)
+        Mx = np.swapaxes(Ji, 1, 2) @ M @ Ji
+        d = np.where(axes)[0]
+        e = np.linalg.eigvalsh(Mx[:, d[:, np.newaxis], d])
+        w = e[:, 0] / e[:, -1]
+        w[np.linalg.matrix_rank(J) < 6] = 0
+        return w
+
+    else:
+        raise ValueError("Invalid method chosen")
+
+
 class BaseETS(UserList):
     def __init__(self, *args):
         super().__init__(*args)
@@ -684,20 +747,12 @@ class BaseETS(UserList):
 
         """
 
-        if i == 1:
-            q = np.zeros(self.n)
-
-            for i in range(self.n):
-                q[i] = uniform(self.qlim[0, i], self.qlim[1, i])
+        qlim = self.qlim
 
+        if i == 1:
+            return uniform(qlim[0, :], qlim[1, :], size=(self.n,))
         else:
-            q = np.zeros((i, self.n))
-
-            for j in range(i):
-                for i in range(self.n):
-                    q[j, i] = uniform(self.qlim[0, i], self.qlim[1, i])
-
-        return q
+            return uniform(qlim[0, :], qlim[1, :], size=(i, self.n))
 
 
 class ETS(BaseETS):
@@ -1724,41 +1779,13 @@ class ETS(BaseETS):
         else:
             raise ValueError("axes must be all, trans, rot or both")
 
-        def yoshikawa(robot, J, q, axes, **kwargs):
-            J = J[axes, :]
-            if J.shape[0] == J.shape[1]:
-                # simplified case for square matrix
-                return abs(det(J))
-            else:
-                m2 = det(J @ J.T)
-                return np.sqrt(abs(m2))
-
-        def condition(robot, J, q, axes, **kwargs):
-            J = J[axes, :]
-            return 1 / cond(J)
-
-        def minsingular(robot, J, q, axes, **kwargs):
-            J = J[axes, :]
-            s = svd(J, compute_uv=False)
-            return s[-1]  # return last/smallest singular value of J
-
-        # choose the handler function
-        if method == "yoshikawa":
-            mfunc = yoshikawa
-        elif method == "invcondition":
-            mfunc = condition
-        elif method == "minsingular":
-            mfunc = minsingular
-        else:
+        if method not in ("yoshikawa", "invcondition", "minsingular"):
             raise ValueError("Invalid method chosen")
 
         # Otherwise use the q vector/matrix
         q = np.array(getmatrix(q, (None, self.n)))
-        w = np.zeros(q.shape[0])
-
-        for k, qk in enumerate(q):
-            Jk = self.jacob0(qk)
-            w[k] = mfunc(self, Jk, qk, axes_list)
+        J = np.array([self.jacob0(qk) for qk in q])
+        w = _manipulability(J, method, axes_list)
 
         if len(w) == 1:
             return w[0]
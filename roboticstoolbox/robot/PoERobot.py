@@ -1,8 +1,106 @@
 # PoERobot
 import numpy as np
 from spatialmath import Twist3, SE3
-from spatialmath.base import skew
+from spatialmath.base import getmatrix, rt2tr, unitvec
 from roboticstoolbox.robot import Link, Robot
+from roboticstoolbox.robot.ET import ET
+from roboticstoolbox.robot.ETS import ETS
+
+
+def _skew_many(w):
+    """
+    Skew-symmetric matrices for many 3-vectors
+
+    :param w: vectors, one per row
+    :type w: ndarray(n,3)
+    :return: skew-symmetric matrices
+    :rtype: ndarray(n,3,3)
+    """
+    W = np.zeros((w.shape[0], 3, 3))
+    W[:, 0, 1] = -w[:, 2]
+    W[:, 0, 2] = w[:, 1]
+    W[:, 1, 0] = w[:, 2]
+    W[:, 1, 2] = -w[:, 0]
+    W[:, 2, 0] = -w[:, 1]
+    W[:, 2, 1] = w[:, 0]
+    return W
+
+
+def _twist_exp(S, q):
+    r"""
+    Exponential of many twists
+
+    :param S: twist table, one twist :math:`(v, \omega)` per row
+    :type S: ndarray(n,6)
+    :param q: joint coordinates, one configuration per row
+    :type q: ndarray(m,n)
+    :return: homogeneous transforms :math:`e^{[S_j] q_{ij}}`
+    :rtype: ndarray(m,n,4,4)
+
+    Evaluates the closed-form (Rodrigues) exponential of every twist at
+    every configuration at once.  Each twist is normalized so that its
+    rotational part is unit, or its translational part if it has no
+    rotation, and the joint coordinate scaled accordingly.
+    """
+    wn = np.linalg.norm(S[:, 3:], axis=1)
+    scale = np.where(wn > 0, wn, np.linalg.norm(S[:, :3], axis=1))
+    scale[scale == 0] = 1.0
+    S = S / scale[:, np.newaxis]
+    theta = q * scale
+
+    W = _skew_many(S[:, 3:])
+    W2 = W @ W
+    s = np.sin(theta)[..., np.newaxis, np.newaxis]
+    c = np.cos(theta)[..., np.newaxis, np.newaxis]
+    th = theta[..., np.newaxis, np.newaxis]
+
+    T = np.zeros(theta.shape + (4, 4))
+    T[..., :3, :3] = np.eye(3) + s * W + (1 - c) * W2
+    V = th * np.eye(3) + (1 - c) * W + (th - s) * W2
+    T[..., :3, 3] = np.einsum("...ij,...j->...i", V, S[:, :3])
+    T[..., 3, 3] = 1.0
+    return T
+
+
+def _hessian(J):
+    """
+    Manipulator Hessian from geometric Jacobians
+
+    :param J: geometric Jacobians
+    :type J: ndarray(...,6,n)
+    :return: manipulator Hessians
+    :rtype: ndarray(...,n,6,n)
+
+    Vectorized form of the column cross-product construction used by
+    :meth:`ETS.hessian0`, valid in whichever frame ``J`` is expressed.
+    """
+    n = J.shape[-1]
+    v = np.swapaxes(J[..., :3, :], -1, -2)
+    w = np.swapaxes(J[..., 3:, :], -1, -2)
+
+    # element [a, b] is w_a x v_b or w_a x w_b
+    wv = np.cross(w[..., :, np.newaxis, :], v[..., np.newaxis, :, :])
+    ww = np.cross(w[..., :, np.newaxis, :], w[..., np.newaxis, :, :])
+
+    upper = np.triu(np.ones((n, n), dtype=bool))[..., np.newaxis]
+    H = np.empty(J.shape[:-2] + (n, n, 6))
+    H[..., :3] = np.where(upper, wv, np.swapaxes(wv, -2, -3))
+    H[..., 3:] = np.where(upper, ww, 0.0)
+    return np.swapaxes(H, -1, -2)
+
+
+def _zaxis_frame(a):
+    """
+    Rotation matrix whose z-axis is a given direction
+
+    :param a: unit vector
+    :type a: ndarray(3)
+    :return: rotation matrix
+    :rtype: ndarray(3,3)
+    """
+    o = np.r_[0.0, 1.0, 0.0] if abs(a[1]) < 0.9 else np.r_[1.0, 0.0, 0.0]
+    x = unitvec(np.cross(o, a))
+    return np.column_stack((x, np.cross(a, x), a))
 
 
 class PoELink(Link):
@@ -14,10 +112,25 @@ class PoELink(Link):
     :seealso: :class:`Link`
     """
 
-    def __init__(self, twist, name=None):
+    def __init__(self, twist, name=None, qlim=None):
         super().__init__()
         self.S = Twist3(twist)
         self.name = name
+        self.qlim = qlim
+
+    @property
+    def qlim(self):
+        """
+        Get/set joint limits
+
+        :return: joint limits, or ``None`` if not specified
+        :rtype: ndarray(2) or None
+        """
+        return self._poe_qlim
+
+    @qlim.setter
+    def qlim(self, qlim_new):
+        self._poe_qlim = None if qlim_new is None else np.array(qlim_new, dtype=float)
 
     def __repr__(self):
         s = f"PoELink({np.array2string(self.S.S, separator=',')}"
@@ -78,14 +191,20 @@ class PoERobot(Robot):
         :type T0: SE3
 
         This is a subclass of the abstract base Robot class that provides
-        only forward kinematics and world-frame Jacobian.
+        forward kinematics, Jacobians and Hessians.  These are computed from
+        a cached table of joint twists using closed-form twist exponentials,
+        vectorized over many joint configurations.  The model can also be
+        converted to an equivalent ETS with :meth:`ets`.
 
         :seealso: :class:`PoEPrismatic` :class:`PoERevolute`
         """
 
-        self._n = len(links)
+        self._twists = None
 
         super().__init__(links, **kwargs)
+
+        # PoE links are not recognized as joints by the base class
+        self._n = len(links)
         self.T0 = T0
 
     def __str__(self):
@@ -110,75 +229,246 @@ class PoERobot(Robot):
         s += ")"
         return s
 
-
     def nbranches(self):
         return 0
 
+    @property
+    def T0(self):
+        """
+        End-effector pose for zero joint coordinates
+
+        :return: end effector pose
+        :rtype: SE3
+        """
+        return self._T0
+
+    @T0.setter
+    def T0(self, T0):
+        self._T0 = SE3(T0)
+        self._T0A = self._T0.A
+
+    @property
+    def twists(self):
+        r"""
+        Joint twist table
+
+        :return: joint twists, one :math:`(v, \omega)` row per link
+        :rtype: ndarray(n,6)
+
+        The table is built from the link twists on first use and cached, it
+        is the input to all the vectorized kinematic methods.
+        """
+        if self._twists is None:
+            self._twists = np.array([link.S.S for link in self])
+        return self._twists
+
+    def _chain(self, q):
+        # compute the prefix products of the joint exponentials, returns
+        # q as (m,n), the prefix transforms (m,n,4,4) where element j is the
+        # product of the exponentials of joints 0..j-1, and the end-effector
+        # pose (m,4,4)
+        q = getmatrix(q, (None, self.n))
+        E = _twist_exp(self.twists, q)
+        P = np.empty_like(E)
+        P[:, 0] = np.eye(4)
+        for j in range(1, self.n):
+            P[:, j] = P[:, j - 1] @ E[:, j - 1]
+        T = P[:, -1] @ E[:, -1] @ self._T0A
+        return q, P, T
+
+    def _jacob0(self, q):
+        # world-frame Jacobians (m,6,n) and end-effector poses (m,4,4)
+        q, P, T = self._chain(q)
+        S = self.twists
+
+        # twist columns Ad(P_j) S_j converted to spatial velocity of the
+        # end-effector origin
+        w = np.einsum("mjik,jk->mji", P[..., :3, :3], S[:, 3:])
+        v = np.einsum("mjik,jk->mji", P[..., :3, :3], S[:, :3])
+        v += np.cross(P[..., :3, 3] - T[:, np.newaxis, :3, 3], w)
+
+        return np.concatenate((v, w), axis=2).swapaxes(1, 2), T
+
+    def _jacob0_batch(self, q, end=None, start=None):
+        # used by Robot.manipulability, the product of exponentials has no
+        # intermediate frames so end and start are ignored
+        J, _ = self._jacob0(q)
+        return J
+
+    def _fkine_batch(self, q, end=None, start=None):
+        _, _, T = self._chain(q)
+        return T
+
+    def eval(self, q):
+        """
+        Forward kinematics as an array
+
+        :param q: joint configuration
+        :type q: array_like(n) or array_like(m,n)
+        :return: end effector pose
+        :rtype: ndarray(4,4) or ndarray(m,4,4)
+
+        **Trajectory operation**:
+        If ``q`` has multiple rows (mxn), it is considered a trajectory and
+        the result is an ``ndarray(m,4,4)``.
+
+        :seealso: :meth:`fkine`
+        """
+        q = getmatrix(q, (None, self.n))
+        E = _twist_exp(self.twists, q)
+        T = E[:, 0]
+        for j in range(1, self.n):
+            T = T @ E[:, j]
+        T = T @ self._T0A
+        return T[0] if T.shape[0] == 1 else T
+
     def fkine(self, q):
         """
         Forward kinematics
 
         :param q: joint configuration
-        :type q: array_like(n)
+        :type q: array_like(n) or array_like(m,n)
         :return: end effector pose
         :rtype: SE3
-        """
-        T = None
-        for link, qk in zip(self, q):
-            if T is None:
-                T = link.S.exp(qk)
-            else:
-                T *= link.S.exp(qk)
 
-        return T * self.T0
+        **Trajectory operation**:
+        If ``q`` has multiple rows (mxn), it is considered a trajectory and
+        the result is an ``SE3`` instance with ``m`` values.
 
-        # T = reduce(lambda x, y: x * y,
-        #           [link.A(qk) for link, qk in zip(self, q)])
+        :seealso: :meth:`eval`
+        """
+        T = self.eval(q)
+        if T.ndim == 3:
+            return SE3(list(T), check=False)
+        return SE3(T, check=False)
 
     def jacob0(self, q):
         """
         Jacobian in world frame
 
         :param q: joint configuration
-        :type q: array_like(n)
+        :type q: array_like(n) or array_like(m,n)
         :return: Jacobian matrix
-        :rtype: ndarray(6,n)
-        """
-        columns = []
-        T = SE3()
-        for link, qk in zip(self, q):
-            columns.append(T.Ad() @ link.S.S)
-            T *= link.S.exp(qk)
-        T *= self.T0
-        J = np.column_stack(columns)
+        :rtype: ndarray(6,n) or ndarray(m,6,n)
 
-        # convert Jacobian from velocity twist to spatial velocity
-        Jsv = np.eye(6)
-        Jsv[:3, 3:] = -skew(T.t)
-        return Jsv @ J
+        **Trajectory operation**:
+        If ``q`` has multiple rows (mxn), the result is a stack of ``m``
+        Jacobians.
+        """
+        J, _ = self._jacob0(q)
+        return J[0] if J.shape[0] == 1 else J
 
     def jacobe(self, q):
         """
         Jacobian in end-effector frame
 
         :param q: joint configuration
-        :type q: array_like(n)
+        :type q: array_like(n) or array_like(m,n)
         :return: Jacobian matrix
-        :rtype: ndarray(6,n)
+        :rtype: ndarray(6,n) or ndarray(m,6,n)
+
+        **Trajectory operation**:
+        If ``q`` has multiple rows (mxn), the result is a stack of ``m``
+        Jacobians.
         """
-        columns = []
-        T = SE3()
-        for link, qk in zip(self, q):
-            columns.append(T.Ad() @ link.S.S)
-            T *= link.S.exp(qk)
-        T *= self.T0
-        J = np.column_stack(columns)
+        J0, T = self._jacob0(q)
+        RT = np.swapaxes(T[:, :3, :3], 1, 2)
+        Je = np.concatenate((RT @ J0[:, :3], RT @ J0[:, 3:]), axis=1)
+        return Je[0] if Je.shape[0] == 1 else Je
 
-        # convert velocity twist from world frame to EE frame
-        return T.inv().Ad() @ J
+    def hessian0(self, q=None, J0=None):
+        """
+        Manipulator Hessian in world frame
 
-    def ets(self):
-        return NotImplemented
+        :param q: joint configuration
+        :type q: array_like(n) or array_like(m,n)
+        :param J0: Jacobian in world frame, computed from ``q`` if not given
+        :type J0: ndarray(6,n) or ndarray(m,6,n)
+        :return: Hessian tensor
+        :rtype: ndarray(n,6,n) or ndarray(m,n,6,n)
+
+        The manipulator Hessian maps joint acceleration to end-effector
+        spatial acceleration, see :meth:`ETS.hessian0`.
+
+        **Trajectory operation**:
+        If ``q`` has multiple rows (mxn), the result is a stack of ``m``
+        Hessians.
+        """
+        if J0 is None:
+            J0 = self.jacob0(q)
+        return _hessian(J0)
+
+    def hessiane(self, q=None, Je=None):
+        """
+        Manipulator Hessian in end-effector frame
+
+        :param q: joint configuration
+        :type q: array_like(n) or array_like(m,n)
+        :param Je: Jacobian in end-effector frame, computed from ``q`` if not
+            given
+        :type Je: ndarray(6,n) or ndarray(m,6,n)
+        :return: Hessian tensor
+        :rtype: ndarray(n,6,n) or ndarray(m,n,6,n)
+
+        The manipulator Hessian maps joint acceleration to end-effector
+        spatial acceleration, see :meth:`ETS.hessiane`.
+
+        **Trajectory operation**:
+        If ``q`` has multiple rows (mxn), the result is a stack of ``m``
+        Hessians.
+        """
+        if Je is None:
+            Je = self.jacobe(q)
+        return _hessian(Je)
+
+    def ets(self, start=None, end=None):
+        r"""
+        Robot to ETS
+
+        :return: elementary transform sequence
+        :rtype: ETS
+        :raises ValueError: a link twist is not a unit revolute or prismatic
+            twist
+
+        Each joint exponential :math:`e^{[S_j] q_j}` is written as
+        :math:`\mathbf{C}_j \mathbf{R}_z(q_j) \mathbf{C}_j^{-1}`, or with
+        :math:`\mathbf{t}_z(q_j)` for a prismatic joint, where the static
+        transform :math:`\mathbf{C}_j` places the z-axis along the joint axis.
+        This gives the PoE model access to the compiled ETS kinematics and
+        the numerical IK solvers such as :meth:`ikine_LM`.
+
+        .. note:: ``start`` and ``end`` are accepted for compatibility with
+            :meth:`BaseRobot.ets` but the whole chain is always returned.
+        """
+        ets = ETS()
+        Cinv = np.eye(4)
+
+        for link in self:
+            v = link.S.v
+            w = link.S.w
+
+            if np.linalg.norm(w) > 0:
+                if abs(np.linalg.norm(w) - 1) > 1e-10 or abs(w @ v) > 1e-10:
+                    raise ValueError("link twist must be a unit revolute twist")
+                C = rt2tr(_zaxis_frame(w), np.cross(w, v))
+                joint = ET.Rz(qlim=link.qlim)
+            else:
+                if abs(np.linalg.norm(v) - 1) > 1e-10:
+                    raise ValueError("link twist must be a unit prismatic twist")
+                C = rt2tr(_zaxis_frame(v), np.zeros(3))
+                joint = ET.tz(qlim=link.qlim)
+
+            static = Cinv @ C
+            if not np.allclose(static, np.eye(4)):
+                ets *= ET.SE3(static)
+            ets *= joint
+            Cinv = np.linalg.inv(C)
+
+        static = Cinv @ self._T0A
+        if not np.allclose(static, np.eye(4)):
+            ets *= ET.SE3(static)
+
+        return ets
 
 
 if __name__ == "__main__":  # pragma nocover
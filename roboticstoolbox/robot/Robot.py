@@ -6,6 +6,8 @@
 """
 
 # import sys
+import multiprocessing as mp
+from collections import namedtuple
 from os.path import splitext
 from copy import deepcopy
 from warnings import warn
@@ -46,7 +48,7 @@ from roboticstoolbox.robot.BaseRobot import BaseRobot
 from roboticstoolbox.robot.RobotKinematics import RobotKinematicsMixin
 from roboticstoolbox.robot.Gripper import Gripper
 from roboticstoolbox.robot.Link import BaseLink, Link, Link2
-from roboticstoolbox.robot.ETS import ETS, ETS2
+from roboticstoolbox.robot.ETS import ETS, ETS2, _manipulability
 from roboticstoolbox.tools import xacro
 from roboticstoolbox.tools import URDF
 from roboticstoolbox.tools.types import ArrayLike, NDArray
@@ -55,6 +57,17 @@ from roboticstoolbox.tools.data import rtb_path_to_datafile
 # A generic type variable representing any subclass of BaseLink
 LinkType = TypeVar("LinkType", bound=BaseLink)
 
+ManipulabilityMap = namedtuple("ManipulabilityMap", "w p grid origin voxel")
+
+# robot, configurations and options shared with forked manipulability_map
+# workers
+_map_state = {}
+
+
+def _manipulability_chunk(span):
+    robot, Q, args = _map_state["args"]
+    return robot._manipulability_chunk(Q, span, **args)
+
 
 # ==================================================================================== #
 # ================= Robot Class ====================================================== #
@@ -817,19 +830,9 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
 
         """
 
-        ets = self.ets(end, start)
+        axes_list = self._manipulability_axes(axes)
 
-        axes_list: List[bool] = []
-
-        if isinstance(axes, list):
-            axes_list = axes
-        elif axes == "all":
-            axes_list = [True, True, True, True, True, True]
-        elif axes.startswith("trans"):
-            axes_list = [True, True, True, False, False, False]
-        elif axes.startswith("rot"):
-            axes_list = [False, False, False, True, True, True]
-        elif axes == "both":
+        if axes == "both":
             return (
                 self.manipulability(
                     q=q, J=J, end=end, start=start, method=method, axes="trans"
@@ -838,72 +841,266 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
                     q=q, J=J, end=end, start=start, method=method, axes="rot"
                 ),
             )
+
+        method = self._manipulability_method(method)
+
+        # Calculate manipulability based on supplied Jacobian
+        if J is not None:
+            J = J[np.newaxis, :, :]
+            if method == "asada":
+                q = np.array(getmatrix(q, (None, self.n)))
+
+        # Otherwise use the q vector/matrix
+        else:
+            q = np.array(getmatrix(q, (None, self.n)))
+            J = self._jacob0_batch(q, end=end, start=start)
+
+        if method == "asada":
+            M = self.inertia(q).reshape((-1, self.n, self.n))
+            w = _manipulability(J, method, axes_list, M)
+        else:
+            w = _manipulability(J, method, axes_list)
+
+        if len(w) == 1:
+            return w[0]
+        else:
+            return w
+
+    @staticmethod
+    def _manipulability_axes(axes) -> List[bool]:
+        # convert the axes option of manipulability to a list of bools
+        if isinstance(axes, list):
+            return axes
+        elif axes == "all":
+            return [True, True, True, True, True, True]
+        elif axes.startswith("trans"):
+            return [True, True, True, False, False, False]
+        elif axes.startswith("rot"):
+            return [False, False, False, True, True, True]
+        elif axes == "both":
+            return []
         else:
             raise ValueError("axes must be all, trans, rot or both")
 
-        def yoshikawa(robot, J, q, axes_list):
-            J = J[axes_list, :]
-            if J.shape[0] == J.shape[1]:
-                # simplified case for square matrix
-                return abs(np.linalg.det(J))
-            else:
-                m2 = np.linalg.det(J @ J.T)
-                return np.sqrt(abs(m2))
-
-        def condition(robot, J, q, axes_list):
-            J = J[axes_list, :]
-
-            # return 1/cond(J)
-            return 1 / np.linalg.cond(J)
-
-        def minsingular(robot, J, q, axes_list):
-            J = J[axes_list, :]
-            s = np.linalg.svd(J, compute_uv=False)
-
-            # return last/smallest singular value of J
-            return s[-1]
-
-        def asada(robot, J, q, axes_list):
-            # dof = np.sum(axes_list)
-            if np.linalg.matrix_rank(J) < 6:
-                return 0
-            Ji = np.linalg.pinv(J)
-            Mx = Ji.T @ robot.inertia(q) @ Ji
-            d = np.where(axes_list)[0]
-            Mx = Mx[d]
-            Mx = Mx[:, d.tolist()]
-            e, _ = np.linalg.eig(Mx)
-            return np.min(e) / np.max(e)
-
-        # choose the handler function
+    @staticmethod
+    def _manipulability_method(method: str) -> str:
+        # convert the method option of manipulability to its full name
         if method.lower().startswith("yoshi"):
-            mfunc = yoshikawa
+            return "yoshikawa"
         elif method.lower().startswith("invc"):
-            mfunc = condition
+            return "invcondition"
         elif method.lower().startswith("mins"):
-            mfunc = minsingular
+            return "minsingular"
         elif method.lower().startswith("asa"):
-            mfunc = asada
+            return "asada"
         else:
             raise ValueError("Invalid method chosen")
 
-        # Calculate manipulability based on supplied Jacobian
-        if J is not None:
-            w = [mfunc(self, J, q, axes_list)]
+    def _jacob0_batch(self, q: NDArray, end=None, start=None) -> NDArray:
+        """
+        Base-frame Jacobians for many configurations
 
-        # Otherwise use the q vector/matrix
+        :param q: joint configurations
+        :type q: ndarray(m,n)
+        :return: Jacobians
+        :rtype: ndarray(m,6,n)
+
+        Subclasses with a vectorized Jacobian override this method, the
+        default evaluates the compiled ETS Jacobian for each row.
+        """
+        ets = self.ets(start=start, end=end)
+        J = np.empty((q.shape[0], 6, ets.n))
+        for k, qk in enumerate(q):
+            J[k] = ets.jacob0(qk)
+        return J
+
+    def _fkine_batch(self, q: NDArray, end=None, start=None) -> NDArray:
+        """
+        Forward kinematics for many configurations
+
+        :param q: joint configurations
+        :type q: ndarray(m,n)
+        :return: poses including the base transform
+        :rtype: ndarray(m,4,4)
+        """
+        T = self.ets(start=start, end=end).eval(q, base=self._T)
+        return T.reshape((-1, 4, 4))
+
+    def manipulability_map(
+        self,
+        Q: Union[ArrayLike, int],
+        method: L["yoshikawa", "asada", "minsingular", "invcondition"] = "yoshikawa",
+        axes: Union[L["all", "trans", "rot"], List[bool]] = "all",
+        end: Union[str, Link, Gripper, None] = None,
+        start: Union[str, Link, Gripper, None] = None,
+        chunksize: int = 10000,
+        nproc: int = 1,
+        voxel: Union[float, None] = None,
+        filename: Union[str, Path, None] = None,
+    ):
+        """
+        Manipulability over many joint configurations
+
+        ``robot.manipulability_map(Q)`` is the manipulability of the robot at
+        every joint configuration in the rows of ``Q``.
+
+        Parameters
+        ----------
+        Q
+            Joint configurations (m,n), or the number of random
+            configurations to sample within the joint limits
+        method
+            method to use, "yoshikawa" (default), "invcondition",
+            "minsingular"  or "asada"
+        axes
+            Task space axes to consider: "all" [default],
+            "trans", or "rot"
+        chunksize
+            number of configurations processed at once
+        nproc
+            number of worker processes
+        voxel
+            side length of the workspace voxels, if given the end-effector
+            positions are binned into a voxel grid
+        filename
+            write the voxel grid to this ``.npz`` file, requires ``voxel``
+
+        Returns
+        -------
+        w
+            manipulability of each configuration, ndarray(m), if ``voxel``
+            is not given
+        map
+            a ``ManipulabilityMap`` named tuple if ``voxel`` is given
+
+        Synopsis
+        --------
+        The configurations are processed in chunks of ``chunksize`` rows.
+        For each chunk the Jacobians are computed together and the measure
+        is evaluated with a single batched determinant, SVD or eigenvalue
+        call, so that memory use is bounded by the chunk size rather than
+        the number of configurations.  If ``nproc`` is greater than one the
+        chunks are shared between worker processes, this requires the
+        ``fork`` start method and the work is done serially if it is not
+        available.
+
+        If ``voxel`` is given the end-effector position of each
+        configuration is also computed and the result is a named tuple
+        with elements:
+
+        ===========  ========================================================
+        ``w``        manipulability of each configuration, ndarray(m)
+        ``p``        end-effector position of each configuration,
+                     ndarray(m,3)
+        ``grid``     maximum manipulability of the configurations falling
+                     in each voxel, NaN if none, ndarray(nx,ny,nz), empty if
+                     there are no configurations
+        ``origin``   position of the corner of voxel ``[0,0,0]``
+        ``voxel``    voxel side length
+        ===========  ========================================================
+
+        and the voxel at index ``[i,j,k]`` spans
+        ``origin + voxel * [i,j,k]`` to ``origin + voxel * [i+1,j+1,k+1]``.
+        If ``filename`` is given ``grid``, ``origin``, ``voxel`` and the
+        options ``method`` and ``axes`` are written to it with
+        ``numpy.savez_compressed`` and can be read back with ``numpy.load``.
+
+        Examples
+        --------
+        .. runblock:: pycon
+        >>> import roboticstoolbox as rtb
+        >>> puma = rtb.models.DH.Puma560()
+        >>> w = puma.manipulability_map(1000, axes="trans")
+        >>> w.max()
+
+        See Also
+        --------
+        :func:`manipulability`
+
+        """
+
+        if isinstance(Q, (int, np.integer)):
+            Q = self.ets(start=start, end=end).random_q(int(Q))
+        Q = np.array(getmatrix(Q, (None, self.n)))
+
+        axes_list = self._manipulability_axes(axes)
+        if len(axes_list) == 0:
+            raise ValueError("axes must be all, trans, rot")
+        method = self._manipulability_method(method)
+        if filename is not None and voxel is None:
+            raise ValueError("filename requires voxel to be given")
+
+        args = dict(
+            method=method,
+            axes=axes_list,
+            end=end,
+            start=start,
+            position=voxel is not None,
+        )
+        spans = [
+            (i, min(i + chunksize, Q.shape[0])) for i in range(0, Q.shape[0], chunksize)
+        ]
+
+        if nproc > 1 and len(spans) > 1:
+            if "fork" in mp.get_all_start_methods():
+                # the robot is not picklable, workers inherit it from this
+                # process when they are forked
+                _map_state["args"] = (self, Q, args)
+                try:
+                    with mp.get_context("fork").Pool(nproc) as pool:
+                        results = pool.map(_manipulability_chunk, spans)
+                finally:
+                    _map_state.clear()
+            else:  # pragma nocover
+                warn("fork is not available, computing manipulability serially")
+                nproc = 1
+
+        if nproc <= 1 or len(spans) <= 1:
+            results = [self._manipulability_chunk(Q, span, **args) for span in spans]
+
+        w = np.concatenate([r[0] for r in results]) if results else np.zeros(0)
+        if voxel is None:
+            return w
+
+        p = np.concatenate([r[1] for r in results]) if results else np.zeros((0, 3))
+        if p.shape[0] == 0:
+            # no configurations, the grid is empty
+            origin = np.zeros(3)
+            grid = np.zeros((0, 0, 0))
         else:
-            q = np.array(getmatrix(q, (None, self.n)))
-            w = np.zeros(q.shape[0])
+            origin = np.floor(p.min(axis=0) / voxel) * voxel
+            index = np.floor((p - origin) / voxel).astype(int)
+            grid = np.full(index.max(axis=0) + 1, -np.inf)
+            np.maximum.at(grid, tuple(index.T), w)
+            grid[np.isinf(grid)] = np.nan
+
+        if filename is not None:
+            np.savez_compressed(
+                filename,
+                grid=grid,
+                origin=origin,
+                voxel=voxel,
+                method=method,
+                axes=np.array(axes_list),
+            )
 
-            for k, qk in enumerate(q):
-                Jk = ets.jacob0(qk)
-                w[k] = mfunc(self, Jk, qk, axes_list)
+        return ManipulabilityMap(w, p, grid, origin, voxel)
 
-        if len(w) == 1:
-            return w[0]
+    def _manipulability_chunk(self, Q, span, method, axes, end, start, position):
+        # manipulability, and optionally end-effector position, for the rows
+        # of Q in the half-open interval span
+        q = Q[span[0] : span[1]]
+        J = self._jacob0_batch(q, end=end, start=start)
+        if method == "asada":
+            M = self.inertia(q).reshape((-1, self.n, self.n))
+            w = _manipulability(J, method, axes, M)
         else:
-            return w
+            w = _manipulability(J, method, axes)
+
+        if position:
+            return w, self._fkine_batch(q, end=end, start=start)[:, :3, 3]
+        else:
+            return w, None
 
     def jtraj(
         self,
@@ -1021,7 +1218,7 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         |``representation``   |       Rotational representation     |
         |---------------------|-------------------------------------|
         |``'rpy/xyz'``        |   RPY angular rates in XYZ order    |
-        |``'rpy/zyx'``        |   RPY angular rates in XYZ order    |
+        |``'rpy/zyx'``        |   RPY angular rates in ZYX order    |
         |``'eul'``            |   Euler angular rates in ZYZ order  |
         |``'exp'``            |   exponential coordinate rates      |
 
@@ -1035,6 +1232,7 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
         --------
         :func:`jacob0`
         :func:`hessian0`
+        :func:`hessian0_analytical`
 
         """
 
@@ -1046,34 +1244,95 @@ class Robot(BaseRobot[Link], RobotKinematicsMixin):
             H = self.hessian0(q, J0=J0)
 
         else:
-            # # determine analytic rotation
-            # T = self.fkine(q).A
-            # gamma = smb.r2x(smb.t2r(T), representation=representation)
+            H = self.hessian0_analytical(q, J0=J0, representation=representation)
 
-            # # get transformation angular velocity to analytic velocity
-            # Ai = smb.rotvelxform(
-            #     gamma, representation=representation, inverse=True, full=True
-            # )
+        return np.tensordot(H, qd, (0, 0))
 
-            # # get analytic rate from joint rates
-            # omega = J0[3:, :] @ qd
-            # gamma_dot = Ai[3:, 3:] @ omega
-            # Ai_dot = smb.rotvelxform_inv_dot(gamma, gamma_dot, full=True)
-            # Ai_dot = sp.linalg.block_diag(np.zeros((3, 3)), Ai_dot)
+    def hessian0_analytical(
+        self,
+        q: ArrayLike,
+        J0: Union[NDArray, None] = None,
+        representation: L["rpy/xyz", "rpy/zyx", "eul", "exp"] = "rpy/xyz",
+    ) -> NDArray:
+        r"""
+        Manipulator Hessian of the analytical Jacobian
 
-            # Jd = Ai_dot @ J0 + Ai @ Jd
+        ``robot.hessian0_analytical(q)`` is the manipulator Hessian tensor of
+        the analytical Jacobian in the base frame, ie. the derivative of
+        ``robot.jacob0_analytical(q)`` with respect to the joint coordinates.
 
-            # not actually sure this can be written in closed form
+        Parameters
+        ----------
+        q
+            The joint configuration of the robot
+        J0
+            Jacobian in {0} frame
+        representation
+            angular representation
 
-            H = smb.numhess(
-                lambda q: self.jacob0_analytical(q, representation=representation), q
-            )
+        Returns
+        -------
+        ha
+            The analytical Hessian in the base frame, ``ha[k]`` is the
+            derivative of the analytical Jacobian with respect to ``q[k]``
+
+        Synopsis
+        --------
+        The analytical Jacobian is :math:`\mat{J}_a = \mat{A}(\Gamma) \mat{J}_0`
+        where :math:`\mat{A}` maps spatial velocity to analytic velocity
+        :math:`(\vec{v}, \dvec{\Gamma})`.  Its derivative with respect to
+        :math:`q_k` is computed in closed form as
 
-            # Jd = Ai @ Jd
+        .. math::
 
-            # return Jd
+            \mat{H}_{a,k} = \dmat{A}(\Gamma, \mat{J}_{a,k}) \mat{J}_0
+                + \mat{A}(\Gamma) \mat{H}_{0,k}
 
-        return np.tensordot(H, qd, (0, 0))
+        using the geometric Hessian :math:`\mat{H}_0` and the derivative of
+        the angular velocity transformation, rather than by numerical
+        differentiation.  If ``J0`` is already calculated for the joint
+        coordinates ``q`` it can be passed in to to save computation time.
+
+        |``representation``   |       Rotational representation     |
+        |---------------------|-------------------------------------|
+        |``'rpy/xyz'``        |   RPY angular rates in XYZ order    |
+        |``'rpy/zyx'``        |   RPY angular rates in ZYX order    |
+        |``'eul'``            |   Euler angular rates in ZYZ order  |
+        |``'exp'``            |   exponential coordinate rates      |
+
+        See Also
+        --------
+        :func:`jacob0_analytical`
+        :func:`hessian0`
+        :func:`jacob0_dot`
+
+        """
+
+        if J0 is None:
+            J0 = self.jacob0(q)
+        H0 = self.hessian0(q, J0=J0)
+
+        # determine analytic rotation
+        T = self.fkine(q).A
+        gamma = smb.r2x(smb.t2r(T), representation=representation)
+
+        # get transformation angular velocity to analytic velocity
+        A = smb.rotvelxform(
+            gamma, representation=representation, inverse=True, full=True
+        )
+        Ja = A @ J0
+
+        # rotvelxform_inv_dot is linear in the analytic rate, so the
+        # derivative of A with respect to q_k uses the k'th analytic
+        # Jacobian column as the rate
+        Ha = A @ H0
+        for k in range(Ja.shape[1]):
+            A_dot = smb.rotvelxform_inv_dot(
+                gamma, Ja[3:, k], representation=representation, full=True
+            )
+            Ha[k] += A_dot @ J0
+
+        return Ha
 
     @overload
     def jacobm(
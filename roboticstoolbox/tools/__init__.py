@@ -14,6 +14,7 @@ from roboticstoolbox.tools.trajectory import (
 )
 from roboticstoolbox.tools.numerical import jacobian_numerical, hessian_numerical
 from roboticstoolbox.tools.jsingu import jsingu
+from roboticstoolbox.tools.reachability import ReachabilityMap
 from roboticstoolbox.tools.data import (
     rtb_load_data,
     rtb_load_matfile,
@@ -40,6 +41,7 @@ __all__ = [
     "mtraj",
     "mstraj",
     "jsingu",
+    "ReachabilityMap",
     "jacobian_numerical",
     "hessian_numerical",
     "rtb_load_data",
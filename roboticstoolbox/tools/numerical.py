@@ -1,7 +1,13 @@
 import numpy as np
 from spatialmath import base
 
-def jacobian_numerical(f, x, dx=1e-8, N=0):
+def _perturbations(x, dx):
+    # stack the argument and its n perturbations, one per row
+    x = np.array(x, dtype=float)
+    return x + np.vstack((np.zeros(len(x)), np.eye(len(x)) * dx))
+
+
+def jacobian_numerical(f, x, dx=1e-8, N=0, batch=False):
     r"""
     Numerically compute Jacobian of function
 
@@ -13,6 +19,9 @@ def jacobian_numerical(f, x, dx=1e-8, N=0):
     :type dx: float, optional
     :param N: function returns SE(N) matrix, defaults to 0
     :type N: int, optional
+    :param batch: evaluate all perturbations in one call of ``f``, defaults
+        to False
+    :type batch: bool, optional
     :return: Jacobian matrix
     :rtype: ndarray(m,n)
 
@@ -24,15 +33,41 @@ def jacobian_numerical(f, x, dx=1e-8, N=0):
     If ``N`` is 2 or 3, then it is assumed that the function returns
     an SE(N) matrix which is converted into a Jacobian column comprising the
     translational Jacobian followed by the rotational Jacobian.
+
+    If ``batch`` is True then ``f`` is called once with an ndarray(n+1,n)
+    whose rows are ``x`` followed by the ``n`` perturbed arguments, and must
+    return the corresponding results stacked along the first axis, for
+    example :meth:`ETS.eval` or :meth:`DHRobot.eval`.
     """
 
+    if batch:
+        F = np.asarray(f(_perturbations(x, dx)))
+        J0 = F[0]
+        Ji = (F[1:] - J0) / dx
+
+        if N > 0:
+            t = Ji[:, :N, N]
+            S = Ji[:, :N, :N] @ J0[:N, :N].T
+            if N == 2:
+                r = 0.5 * (S[:, 1, 0] - S[:, 0, 1])[:, np.newaxis]
+            else:
+                r = 0.5 * np.column_stack(
+                    (
+                        S[:, 2, 1] - S[:, 1, 2],
+                        S[:, 0, 2] - S[:, 2, 0],
+                        S[:, 1, 0] - S[:, 0, 1],
+                    )
+                )
+            Ji = np.c_[t, r]
+
+        return np.moveaxis(Ji, 0, -1)
+
     Jcol = []
     J0 = f(x)
     I = np.eye(len(x))
-    f0 = f(x)
     for i in range(len(x)):
         fi = f(x + I[:,i] * dx)
-        Ji = (fi - f0) / dx
+        Ji = (fi - J0) / dx
 
         if N > 0:
             t = Ji[:N,N]
@@ -44,7 +79,7 @@ def jacobian_numerical(f, x, dx=1e-8, N=0):
     return np.c_[Jcol].T
 
 
-def hessian_numerical(J, x, dx=1e-8):
+def hessian_numerical(J, x, dx=1e-8, batch=False):
     r"""
     Numerically compute Hessian of Jacobian function
 
@@ -54,6 +89,9 @@ def hessian_numerical(J, x, dx=1e-8):
     :type x: ndarray(n)
     :param dx: the numerical perturbation, defaults to 1e-8
     :type dx: float, optional
+    :param batch: evaluate all perturbations in one call of ``J``, defaults
+        to False
+    :type batch: bool, optional
     :return: Hessian matrix
     :rtype: ndarray(m,n,n)
 
@@ -61,8 +99,17 @@ def hessian_numerical(J, x, dx=1e-8):
     :math:`f: \mathbb{R}^n  \mapsto \mathbb{R}^{m \times n}`
 
     Uses first-order difference :math:`H[:,:,i] = (J(x + dx) - J(x)) / dx`.
+
+    If ``batch`` is True then ``J`` is called once with an ndarray(n+1,n)
+    whose rows are ``x`` followed by the ``n`` perturbed arguments, and must
+    return an ndarray(n+1,m,n) of the corresponding Jacobians, for example
+    :meth:`PoERobot.jacob0`.
     """
 
+    if batch:
+        Jall = np.asarray(J(_perturbations(x, dx)))
+        return np.moveaxis((Jall[1:] - Jall[0]) / dx, 0, -1)
+
     I = np.eye(len(x))
     Hcol = []
     J0 = J(x)
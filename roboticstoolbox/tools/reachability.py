@@ -0,0 +1,399 @@
+"""
+Reachability and capability maps for serial-link manipulators
+"""
+
+import json
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+from spatialmath import SE3
+
+placement = namedtuple("placement", "base score reachable")
+
+
+def _sphere_points(n):
+    # n approximately uniformly distributed unit vectors, Fibonacci lattice
+    k = np.arange(n) + 0.5
+    z = 1 - 2 * k / n
+    r = np.sqrt(1 - z**2)
+    phi = np.pi * (3 - np.sqrt(5)) * k
+    return np.column_stack((r * np.cos(phi), r * np.sin(phi), z))
+
+
+def _poses(T):
+    # convert SE3 or ndarray(4,4)/(m,4,4) to ndarray(m,4,4)
+    if isinstance(T, SE3):
+        T = T.A
+    return np.array(T, dtype=float).reshape((-1, 4, 4))
+
+
+class ReachabilityMap:
+    """
+    Reachability map of a manipulator
+
+    :param robot: the robot
+    :type robot: Robot instance
+    :param voxel: side length of the position voxels, defaults to 0.05
+    :type voxel: float, optional
+    :param ndirections: number of approach direction bins, defaults to 50
+    :type ndirections: int, optional
+    :param extent: half-width of the mapped cube, defaults to 1.2 times the
+        furthest end-effector position in 1000 random configurations
+    :type extent: float, optional
+
+    The map discretizes the end-effector pose, relative to the robot's base
+    frame, into a cubic grid of position voxels and, at every voxel, a set of
+    approach directions (the z-axis of the end-effector frame) spread
+    uniformly over the sphere.  Element ``[i,j,k,d]`` of :attr:`counts`
+    is the number of sampled configurations whose end-effector lies in voxel
+    ``[i,j,k]`` with an approach direction closest to direction ``d``.
+
+    The map is filled by forward kinematics of random configurations,
+    :meth:`fill`, or by inverse kinematics of given poses, :meth:`fill_ik`,
+    and the two can be mixed.  Once filled the map answers reachability,
+    :meth:`reachable`, and base placement, :meth:`base_placement`, queries
+    with array lookups only.
+
+    Example:
+
+    .. runblock:: pycon
+
+        >>> import roboticstoolbox as rtb
+        >>> puma = rtb.models.DH.Puma560()
+        >>> rmap = rtb.ReachabilityMap(puma, voxel=0.1)
+        >>> rmap.fill(20000)
+        >>> rmap.reachable(puma.fkine(puma.qn))
+
+    The map can be saved with :meth:`save` and memory mapped back with
+    :meth:`load`, so a large precomputed map costs nothing to open.
+
+    :references:
+        - Capturing robot workspace structure: representing robot
+          capabilities, F. Zacharias, C. Borst, G. Hirzinger, IROS 2007.
+
+    :seealso: :meth:`Robot.manipulability_map`
+    """
+
+    def __init__(self, robot, voxel=0.05, ndirections=50, extent=None):
+
+        self.robot = robot
+        self.voxel = float(voxel)
+        self.directions = _sphere_points(ndirections)
+
+        if extent is None:
+            # Robot.reach is not available for all models, use the furthest
+            # end-effector position over a pilot set of configurations
+            q = robot.ets().random_q(1000).reshape((1000, -1))
+            T = self._base_relative(robot._fkine_batch(q))
+            extent = 1.2 * np.linalg.norm(T[:, :3, 3], axis=1).max()
+        nvoxels = int(np.ceil(2 * extent / self.voxel)) + 1
+        self.origin = -np.full(3, nvoxels * self.voxel / 2)
+        self.counts = np.zeros((nvoxels,) * 3 + (ndirections,), dtype=np.uint16)
+        self.nsamples = 0
+
+    def __str__(self):
+        s = f"ReachabilityMap: {self.robot.name}, "
+        s += "x".join([str(n) for n in self.counts.shape[:3]])
+        s += f" voxels of {self.voxel:g}, {self.ndirections} directions, "
+        s += f"{self.nsamples} samples"
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def ndirections(self):
+        """
+        Number of approach direction bins
+
+        :return: number of direction bins
+        :rtype: int
+        """
+        return self.directions.shape[0]
+
+    @property
+    def index(self):
+        """
+        Reachability index
+
+        :return: fraction of approach directions reached at each voxel
+        :rtype: ndarray(nx,ny,nz)
+
+        The reachability index is 0 for a voxel that was never reached and
+        1 for one which was reached from every approach direction.
+        """
+        return np.count_nonzero(self.counts, axis=3) / self.ndirections
+
+    def voxel_centres(self):
+        """
+        Centres of all voxels
+
+        :return: position of voxel centres in the robot's base frame
+        :rtype: ndarray(nx,ny,nz,3)
+        """
+        i = np.indices(self.counts.shape[:3]).transpose((1, 2, 3, 0))
+        return self.origin + (i + 0.5) * self.voxel
+
+    def bin(self, T):
+        """
+        Map poses to bins
+
+        :param T: end-effector poses relative to the robot's base frame
+        :type T: SE3 or ndarray(4,4) or ndarray(m,4,4)
+        :return: flat index into :attr:`counts` for each pose, -1 if the
+            pose lies outside the map
+        :rtype: ndarray(m)
+        """
+        T = _poses(T)
+        ijk = np.floor((T[:, :3, 3] - self.origin) / self.voxel).astype(int)
+        inside = np.all((ijk >= 0) & (ijk < self.counts.shape[:3]), axis=1)
+        ijk = np.clip(ijk, 0, np.array(self.counts.shape[:3]) - 1)
+
+        # approach direction is the nearest direction bin
+        d = np.argmax(T[:, :3, 2] @ self.directions.T, axis=1)
+
+        index = np.ravel_multi_index(tuple(ijk.T) + (d,), self.counts.shape)
+        return np.where(inside, index, -1)
+
+    def _base_relative(self, T):
+        # world-frame poses to poses relative to the robot's base frame
+        return np.linalg.inv(self.robot.base.A) @ _poses(T)
+
+    def _add(self, index):
+        # accumulate hits into the count array, saturating
+        index, n = np.unique(index[index >= 0], return_counts=True)
+        if not self.counts.flags.writeable:
+            self.counts = np.array(self.counts)
+        counts = self.counts.reshape(-1)
+        limit = np.iinfo(self.counts.dtype).max
+        counts[index] = np.minimum(counts[index].astype(np.int64) + n, limit)
+
+    def fill(self, nsamples, chunksize=10000):
+        """
+        Fill the map by sampling configurations
+
+        :param nsamples: number of random configurations
+        :type nsamples: int
+        :param chunksize: configurations evaluated at once, defaults to 10000
+        :type chunksize: int, optional
+        :return: the map
+        :rtype: ReachabilityMap
+
+        Random joint configurations are drawn uniformly within the joint
+        limits and the end-effector poses of each chunk are computed in a
+        single vectorized forward kinematics call.
+        """
+        ets = self.robot.ets()
+        for start in range(0, nsamples, chunksize):
+            m = min(chunksize, nsamples - start)
+            q = ets.random_q(m).reshape((m, -1))
+            T = self._base_relative(self.robot._fkine_batch(q))
+            self._add(self.bin(T))
+        self.nsamples += nsamples
+        return self
+
+    def fill_ik(self, T, tol=1e-4, **kwargs):
+        """
+        Fill the map by inverse kinematics
+
+        :param T: end-effector poses in the world frame
+        :type T: SE3 or ndarray(4,4) or ndarray(m,4,4)
+        :param tol: position and orientation error to accept a solution,
+            defaults to 1e-4
+        :type tol: float, optional
+        :param kwargs: options passed to :meth:`Robot.ikine_LM`
+        :return: whether each pose was reached
+        :rtype: ndarray(m) of bool
+
+        Inverse kinematics is attempted for each pose and the forward
+        kinematics of the solutions that attain the pose, within ``tol``,
+        are added to the map.  This fills in regions such as the workspace
+        boundary that random sampling reaches rarely.
+        """
+        T = _poses(T)
+
+        # ikine_LM solves in the frame of the robot's ETS, which includes the
+        # base for a DHRobot but not for an ERobot, find the transform that
+        # _fkine_batch applies in addition and remove it from the targets
+        q0 = np.zeros((1, self.robot.n))
+        B = self.robot._fkine_batch(q0)[0] @ np.linalg.inv(self.robot.ets().eval(q0))
+        Tik = np.linalg.inv(B) @ T
+
+        q = np.zeros((T.shape[0], self.robot.n))
+        for k, Tk in enumerate(Tik):
+            q[k] = self.robot.ikine_LM(Tk, **kwargs).q
+
+        Tq = self.robot._fkine_batch(q)
+        err = np.abs(Tq[:, :3, :] - T[:, :3, :]).max(axis=(1, 2))
+        reached = err < tol
+
+        self._add(self.bin(self._base_relative(Tq[reached])))
+        self.nsamples += np.count_nonzero(reached)
+        return reached
+
+    def reachable(self, T, ik=False, **kwargs):
+        """
+        Test if poses are reachable
+
+        :param T: end-effector poses in the world frame
+        :type T: SE3 or ndarray(4,4) or ndarray(m,4,4)
+        :param ik: confirm poses missing from the map with inverse
+            kinematics, defaults to False
+        :type ik: bool, optional
+        :param kwargs: options passed to :meth:`fill_ik`
+        :return: whether each pose is reachable
+        :rtype: bool or ndarray(m) of bool
+
+        A pose is reachable if its bin in the map has been visited. The map
+        is an inner approximation of the workspace so, if ``ik`` is True,
+        poses that are not in the map are tried with :meth:`fill_ik` which
+        also adds them to the map.
+        """
+        Tw = _poses(T)
+        index = self.bin(self._base_relative(Tw))
+        r = np.zeros(index.shape, dtype=bool)
+        r[index >= 0] = self.counts.reshape(-1)[index[index >= 0]] > 0
+
+        if ik and not np.all(r):
+            r[~r] = self.fill_ik(Tw[~r], **kwargs)
+
+        return r[0] if r.shape[0] == 1 else r
+
+    def base_placement(self, T, bases=None, step=None, nyaw=8):
+        """
+        Find the best base placement
+
+        :param T: end-effector poses in the world frame
+        :type T: SE3 or ndarray(4,4) or ndarray(m,4,4)
+        :param bases: candidate base poses, defaults to a grid
+        :type bases: SE3 or ndarray(b,4,4), optional
+        :param step: spacing of the default grid, defaults to twice the voxel
+            size
+        :type step: float, optional
+        :param nyaw: number of base rotations about the z-axis for the
+            default grid, defaults to 8
+        :type nyaw: int, optional
+        :return: best base pose, its score and which poses it reaches
+        :rtype: namedtuple
+
+        Each candidate base pose is scored by the number of poses in ``T``
+        that are reachable from it, with ties broken by the sum of their
+        reachability indices (the more approach directions reachable at each
+        target the better).  The default candidates are a grid in the xy-plane,
+        at the height of the current base, spanning the robot's reach around
+        the centroid of the targets, with ``nyaw`` orientations at each point.
+
+        The result is a named tuple with elements:
+
+        =============  ======================================================
+        ``base``       best base pose, SE3
+        ``score``      number of reachable poses
+        ``reachable``  whether each pose is reachable from ``base``,
+                       ndarray(m)
+        =============  ======================================================
+        """
+        T = _poses(T)
+
+        if bases is None:
+            if step is None:
+                step = 2 * self.voxel
+            c = T[:, :3, 3].mean(axis=0)
+            r = -self.origin[0]
+            x = np.arange(c[0] - r, c[0] + r + step / 2, step)
+            y = np.arange(c[1] - r, c[1] + r + step / 2, step)
+            yaw = np.arange(nyaw) * 2 * np.pi / nyaw
+            X, Y, Yaw = [a.ravel() for a in np.meshgrid(x, y, yaw, indexing="ij")]
+            bases = np.zeros((X.shape[0], 4, 4))
+            bases[:, 0, 0] = np.cos(Yaw)
+            bases[:, 0, 1] = -np.sin(Yaw)
+            bases[:, 1, 0] = np.sin(Yaw)
+            bases[:, 1, 1] = np.cos(Yaw)
+            bases[:, 2, 2] = 1
+            bases[:, 3, 3] = 1
+            bases[:, :3, 3] = np.column_stack(
+                (X, Y, np.full(X.shape, self.robot.base.t[2]))
+            )
+        else:
+            bases = _poses(bases)
+
+        # every target relative to every candidate base, as one lookup
+        rel = np.linalg.inv(bases)[:, np.newaxis] @ T[np.newaxis]
+        index = self.bin(rel.reshape((-1, 4, 4))).reshape(rel.shape[:2])
+        hit = np.zeros(index.shape, dtype=bool)
+        hit[index >= 0] = self.counts.reshape(-1)[index[index >= 0]] > 0
+
+        ri = self.index.reshape(-1)
+        voxel = index // self.ndirections
+        quality = np.where(hit, ri[voxel], 0).sum(axis=1)
+        score = hit.sum(axis=1)
+
+        best = np.lexsort((quality, score))[-1]
+        return placement(SE3(bases[best], check=False), score[best], hit[best])
+
+    def save(self, filename):
+        """
+        Save the map
+
+        :param filename: name of the map file, without extension
+        :type filename: str or Path
+
+        The count array is written to ``filename.npy``, in a format which
+        :meth:`load` memory maps, and the parameters of the map and the
+        robot it was built for to ``filename.json``.
+        """
+        filename = Path(filename)
+        np.save(filename.with_suffix(".npy"), self.counts)
+
+        meta = {
+            "robot": self.robot.name,
+            "n": self.robot.n,
+            "qlim": self.robot.qlim.tolist(),
+            "base": self.robot.base.A.tolist(),
+            "tool": self.robot.tool.A.tolist(),
+            "voxel": self.voxel,
+            "origin": self.origin.tolist(),
+            "ndirections": self.ndirections,
+            "nsamples": int(self.nsamples),
+        }
+        with open(filename.with_suffix(".json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, robot, filename, mmap=True):
+        """
+        Load a saved map
+
+        :param robot: the robot the map was built for
+        :type robot: Robot instance
+        :param filename: name of the map file, without extension
+        :type filename: str or Path
+        :param mmap: memory map the count array read-only, defaults to True
+        :type mmap: bool, optional
+        :raises ValueError: the map was built for a different robot
+        :return: the map
+        :rtype: ReachabilityMap
+
+        With ``mmap`` True the counts are not read until they are accessed,
+        and only the parts that are accessed.  Filling a memory mapped map
+        further reads it into memory, the file is not changed.
+        """
+        filename = Path(filename)
+        with open(filename.with_suffix(".json"), "r") as f:
+            meta = json.load(f)
+
+        if meta["robot"] != robot.name or meta["n"] != robot.n:
+            raise ValueError(f"map was built for robot {meta['robot']}")
+        if not np.allclose(meta["tool"], robot.tool.A):
+            raise ValueError("map was built for a different tool")
+
+        rmap = cls.__new__(cls)
+        rmap.robot = robot
+        rmap.voxel = meta["voxel"]
+        rmap.origin = np.array(meta["origin"])
+        rmap.directions = _sphere_points(meta["ndirections"])
+        rmap.nsamples = meta["nsamples"]
+        rmap.counts = np.load(
+            filename.with_suffix(".npy"), mmap_mode="r" if mmap else None
+        )
+        return rmap
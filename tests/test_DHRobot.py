@@ -9,6 +9,8 @@ import roboticstoolbox as rp
 import spatialmath as sm
 import unittest
 import math
+import os
+import tempfile
 
 
 class TestDHRobot(unittest.TestCase):
@@ -207,6 +209,49 @@ class TestDHRobot(unittest.TestCase):
         nt.assert_array_almost_equal(TT[2].A, T1)
         nt.assert_array_almost_equal(TT[3].A, T1)
 
+    def test_eval(self):
+        l0 = rp.PrismaticDH()
+        l1 = rp.RevoluteDH()
+        l2 = rp.PrismaticDH(theta=2.0)
+        l3 = rp.RevoluteDH()
+
+        q = np.array([1, 2, 3, 4])
+        qq = np.r_[q, q, q].reshape((3, 4))
+
+        r0 = rp.DHRobot([l0, l1, l2, l3])
+
+        T1 = r0.fkine(q).A
+        nt.assert_array_almost_equal(r0.eval(q), T1)
+        TT = r0.eval(qq)
+        self.assertEqual(TT.shape, (3, 4, 4))
+        nt.assert_array_almost_equal(TT[2], T1)
+
+        Tall = r0.eval(q, frames=True)
+        self.assertEqual(Tall.shape, (5, 4, 4))
+        nt.assert_array_almost_equal(Tall[0], np.eye(4))
+        nt.assert_array_almost_equal(Tall[-1], T1)
+        self.assertEqual(r0.eval(qq, frames=True).shape, (3, 5, 4, 4))
+
+    def test_eval_links(self):
+        # compare the vectorized path with the per-link transforms
+        for robot in [rp.models.DH.Puma560(), rp.models.DH.Panda()]:
+            robot.base = sm.SE3(0.1, 0.2, 0.3) * sm.SE3.Rz(0.4)
+            robot.tool = sm.SE3.Tz(0.1)
+            qq = np.array([robot.qz, robot.qr, np.linspace(-1, 1, robot.n)])
+
+            for q, T in zip(qq, robot.eval(qq)):
+                Tref = robot.base
+                for qj, L in zip(q, robot.links):
+                    Tref *= L.A(qj)
+                Tref *= robot.tool
+                nt.assert_array_almost_equal(T, Tref.A)
+
+            Tall = robot.fkine_all(qq[2])
+            Tpath = robot.fkine_path(qq[2])
+            self.assertEqual(len(Tall), robot.n + 1)
+            nt.assert_array_almost_equal(Tall[-1].A, Tpath[-1].A @ robot.tool.inv().A)
+            nt.assert_array_almost_equal(Tpath[-1].A, robot.eval(qq[2]))
+
     def test_links(self):
         l0 = rp.PrismaticDH()
         with self.assertRaises(TypeError):
@@ -1345,6 +1390,44 @@ class TestDHRobot(unittest.TestCase):
         with self.assertRaises(ValueError):
             puma.manipulability(method="notamethod")
 
+    def test_manipulability_map(self):
+        puma = rp.models.DH.Puma560()
+        puma.base = sm.SE3(0.1, 0.2, 0.3) * sm.SE3.Rx(0.4)
+        puma.tool = sm.SE3(0, 0, 0.1)
+        Q = np.array([puma.random_q() for _ in range(30)])
+
+        J = puma._jacob0_batch(Q)
+        for q, Jk in zip(Q, J):
+            nt.assert_array_almost_equal(Jk, puma.jacob0(q))
+
+        w = puma.manipulability_map(Q, chunksize=8, nproc=2)
+        for q, wk in zip(Q, w):
+            nt.assert_almost_equal(wk, puma.manipulability(q))
+
+        w = puma.manipulability_map(Q[:5], method="asada")
+        for q, wk in zip(Q, w):
+            nt.assert_almost_equal(wk, puma.manipulability(q, method="asada"))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "map.npz")
+            m = puma.manipulability_map(Q, voxel=0.2, filename=filename)
+            data = np.load(filename)
+            nt.assert_array_almost_equal(data["grid"], m.grid)
+            nt.assert_array_almost_equal(data["origin"], m.origin)
+
+        nt.assert_array_almost_equal(m.p, puma.fkine(Q).t)
+        index = np.floor((m.p - m.origin) / m.voxel).astype(int)
+        for i, wk in zip(index, m.w):
+            self.assertGreaterEqual(m.grid[tuple(i)], wk)
+        self.assertEqual(np.sum(~np.isnan(m.grid)), len(np.unique(index, axis=0)))
+
+        # no configurations gives an empty map
+        m = puma.manipulability_map(np.zeros((0, 6)), voxel=0.2)
+        self.assertEqual(m.w.shape, (0,))
+        self.assertEqual(m.p.shape, (0, 3))
+        self.assertEqual(m.grid.size, 0)
+        self.assertEqual(puma.manipulability_map(np.zeros((0, 6))).shape, (0,))
+
     def test_perturb(self):
         puma = rp.models.DH.Puma560()
         p2 = puma.perturb()
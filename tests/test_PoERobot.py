@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import numpy.testing as nt
+import numpy as np
+import unittest
+from spatialmath import SE3
+from spatialmath.base import skew
+from roboticstoolbox import PoERobot, PoERevolute, PoEPrismatic
+
+
+def _fkine_ref(robot, q):
+    # reference product of exponentials using SE3 objects
+    T = SE3()
+    for link, qk in zip(robot, q):
+        T *= link.S.exp(qk)
+    return T * robot.T0
+
+
+def _jacob0_ref(robot, q):
+    columns = []
+    T = SE3()
+    for link, qk in zip(robot, q):
+        columns.append(T.Ad() @ link.S.S)
+        T *= link.S.exp(qk)
+    T *= robot.T0
+    Jsv = np.eye(6)
+    Jsv[:3, 3:] = -skew(T.t)
+    return Jsv @ np.column_stack(columns)
+
+
+class TestPoERobot(unittest.TestCase):
+    def setUp(self):
+        links = [
+            PoERevolute([0, 0, 1], [0, 0, 0]),
+            PoERevolute([0, 1, 0], [0, 0, 0.5]),
+            PoEPrismatic([1, 0, 0], qlim=[0, 1]),
+            PoERevolute([1, 0, 0], [0.3, 0.2, 0.5]),
+            PoERevolute([0, 0.6, 0.8], [0.3, 0.1, 0.5]),
+        ]
+        self.robot = PoERobot(links, SE3.Trans(0.4, 0.1, 0.5) * SE3.Rx(0.3))
+        self.Q = np.array(
+            [
+                [0.1, -0.4, 0.3, 0.9, -1.2],
+                [1.4, 0.2, 0.8, 0.7, 0.1],
+                [-2.0, 1.1, 0.05, -0.3, 2.5],
+            ]
+        )
+
+    def test_n(self):
+        self.assertEqual(self.robot.n, 5)
+        self.assertEqual(self.robot.twists.shape, (5, 6))
+
+    def test_fkine(self):
+        for q in self.Q:
+            nt.assert_array_almost_equal(
+                self.robot.fkine(q).A, _fkine_ref(self.robot, q).A
+            )
+
+    def test_fkine_traj(self):
+        T = self.robot.fkine(self.Q)
+        self.assertEqual(len(T), 3)
+        for Tk, q in zip(T, self.Q):
+            nt.assert_array_almost_equal(Tk.A, _fkine_ref(self.robot, q).A)
+
+        nt.assert_array_almost_equal(self.robot.eval(self.Q)[1], T[1].A)
+
+    def test_jacob0(self):
+        for q in self.Q:
+            nt.assert_array_almost_equal(
+                self.robot.jacob0(q), _jacob0_ref(self.robot, q)
+            )
+
+        J = self.robot.jacob0(self.Q)
+        self.assertEqual(J.shape, (3, 6, 5))
+        nt.assert_array_almost_equal(J[2], self.robot.jacob0(self.Q[2]))
+
+    def test_jacobe(self):
+        for q in self.Q:
+            T = _fkine_ref(self.robot, q)
+            Je = np.zeros((6, 6))
+            Je[:3, :3] = T.R.T
+            Je[3:, 3:] = T.R.T
+            nt.assert_array_almost_equal(
+                self.robot.jacobe(q), Je @ _jacob0_ref(self.robot, q)
+            )
+
+        J = self.robot.jacobe(self.Q)
+        self.assertEqual(J.shape, (3, 6, 5))
+        nt.assert_array_almost_equal(J[0], self.robot.jacobe(self.Q[0]))
+
+    def test_ets(self):
+        ets = self.robot.ets()
+        self.assertEqual(ets.n, 5)
+        for q in self.Q:
+            nt.assert_array_almost_equal(ets.eval(q), self.robot.eval(q))
+            nt.assert_array_almost_equal(ets.jacob0(q), self.robot.jacob0(q))
+            nt.assert_array_almost_equal(ets.jacobe(q), self.robot.jacobe(q))
+
+    def test_hessian(self):
+        ets = self.robot.ets()
+        for q in self.Q:
+            nt.assert_array_almost_equal(self.robot.hessian0(q), ets.hessian0(q))
+            nt.assert_array_almost_equal(self.robot.hessiane(q), ets.hessiane(q))
+
+        H = self.robot.hessian0(self.Q)
+        self.assertEqual(H.shape, (3, 5, 6, 5))
+        nt.assert_array_almost_equal(H[1], self.robot.hessian0(self.Q[1]))
+
+        J0 = self.robot.jacob0(self.Q[0])
+        nt.assert_array_almost_equal(
+            self.robot.hessian0(J0=J0), self.robot.hessian0(self.Q[0])
+        )
+
+    def test_ikine(self):
+        q = self.Q[0]
+        Tep = self.robot.fkine(q)
+        sol = self.robot.ikine_LM(Tep, q0=q + 0.1)
+        self.assertTrue(sol.success)
+        nt.assert_array_almost_equal(self.robot.fkine(sol.q).A, Tep.A)
+
+    def test_ets_bad_twist(self):
+        robot = PoERobot(
+            [PoERevolute([0, 0, 1], [0, 0, 0]), PoERevolute([0, 0, 1], [1, 0, 0])],
+            SE3.Trans(2, 0, 0),
+        )
+        robot.links[1].S = robot.links[1].S * 2
+        with self.assertRaises(ValueError):
+            robot.ets()
+
+
+if __name__ == "__main__":  # pragma nocover
+    unittest.main()
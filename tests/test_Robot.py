@@ -533,6 +533,22 @@ class TestRobot(unittest.TestCase):
         self.assertRaises(TypeError, panda.manipulability, "Wfgsrth")
         self.assertRaises(ValueError, panda.manipulability, [1, 3])
 
+    def test_manipulability_map(self):
+        panda = rtb.models.ETS.Panda()
+        Q = panda.ets().random_q(25)
+
+        for method in ["yoshikawa", "invcondition", "minsingular"]:
+            w = panda.manipulability_map(Q, method=method, axes="trans", chunksize=7)
+            self.assertEqual(w.shape, (25,))
+            for q, wk in zip(Q, w):
+                nt.assert_almost_equal(
+                    wk, panda.manipulability(q, method=method, axes="trans")
+                )
+
+        self.assertEqual(panda.manipulability_map(10).shape, (10,))
+        self.assertRaises(ValueError, panda.manipulability_map, Q, method="bad")
+        self.assertRaises(ValueError, panda.manipulability_map, Q, filename="x.npz")
+
     def test_qlim(self):
         panda = rtb.models.ETS.Panda()
 
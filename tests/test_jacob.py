@@ -96,6 +96,35 @@ class Tests:
         print(np.round(Jd, 2))
         nt.assert_array_almost_equal(j0, Jd, decimal=4)
 
+    def test_jacob_dot_analytical_rpy(self):
+        for rep in ("rpy/xyz", "rpy/zyx", "eul", "exp"):
+            j0 = self.robot.jacob0_dot(self.q, self.qd, representation=rep)
+
+            H = numhess(
+                lambda q: self.robot.jacob0_analytical(q, representation=rep), self.q
+            )
+            Jd = np.zeros((6, self.robot.n))
+            for i in range(self.robot.n):
+                Jd += H[i, :, :] * self.qd[i]
+
+            nt.assert_array_almost_equal(j0, Jd, decimal=4)
+
+    def test_hessian0_analytical(self):
+        for rep in ("rpy/xyz", "rpy/zyx", "eul", "exp"):
+            Ha = self.robot.hessian0_analytical(self.q, representation=rep)
+            H = numhess(
+                lambda q: self.robot.jacob0_analytical(q, representation=rep), self.q
+            )
+            nt.assert_array_almost_equal(Ha, H, decimal=4)
+
+        rep = "rpy/xyz"
+        Ha = self.robot.hessian0_analytical(self.q, representation=rep)
+
+        J0 = self.robot.jacob0(self.q)
+        nt.assert_array_almost_equal(
+            self.robot.hessian0_analytical(self.q, J0=J0, representation=rep), Ha
+        )
+
     # ------ This section tests various ets' with flipped joints ------ #
 
     def test_jacob0_flipped0(self):
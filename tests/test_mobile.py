@@ -8,6 +8,9 @@ import roboticstoolbox as rtb
 import numpy as np
 import spatialmath.base as sm
 import unittest
+import os
+import tempfile
+import shutil
 
 # from roboticstoolbox import Bug2, DistanceTransformPlanner, rtb_loadmat
 from roboticstoolbox import Bug2
@@ -16,6 +19,7 @@ from roboticstoolbox.mobile.landmarkmap import *
 from roboticstoolbox.mobile.drivers import *
 from roboticstoolbox.mobile.sensors import *
 from roboticstoolbox.mobile.Vehicle import *
+from roboticstoolbox.mobile.PoseGraph import _linear_factors
 
 # from roboticstoolbox.mobile import Planner
 
@@ -108,6 +112,35 @@ class RangeBearingSensorTest(unittest.TestCase):
         z, lm_id = rs.reading()
         self.assertEqual(z, None)
 
+    def test_reading_batch(self):
+        rs = RangeBearingSensor(self.veh, self.map, batch=True, angle=pi / 2)
+        self.assertTrue(rs.batch)
+
+        z, lm_id = rs.reading()
+        zv, ids = rs.visible()
+        self.assertEqual(z.shape, (len(ids), 2))
+        nt.assert_array_equal(lm_id, ids)
+        nt.assert_almost_equal(z, zv, decimal=0)
+
+        # nothing visible
+        rs = RangeBearingSensor(self.veh, self.map, batch=True, range=1e-3)
+        z, lm_id = rs.reading()
+        self.assertIsNone(z)
+        self.assertIsNone(lm_id)
+
+    def test_visible(self):
+        map = rtb.LandmarkMap(10000, workspace=100)
+        rs = RangeBearingSensor(self.veh, map, range=(1, 10), angle=pi / 4)
+        z, ids = rs.visible()
+
+        zall = rs.h(self.veh.x)
+        k = np.flatnonzero(
+            (zall[:, 0] >= 1) & (zall[:, 0] <= 10) & (np.abs(zall[:, 1]) <= pi / 4)
+        )
+        nt.assert_array_equal(ids, k)
+        nt.assert_almost_equal(z, zall[k])
+        self.assertTrue(all(rs.isvisible(id) for id in ids))
+
     def test_h(self):
         xv = np.r_[2, 3, 0.5]
         p = np.r_[3, 4]
@@ -236,6 +269,14 @@ class LandMarkTest(unittest.TestCase):
             self.assertTrue(-10 <= x <= 10)
             self.assertTrue(100 <= y <= 200)
 
+    def test_within(self):
+        map = LandmarkMap(1000, workspace=10)
+
+        ids = map.within((1, 2), 3)
+        d = np.linalg.norm(map.landmarks - np.c_[1, 2].T, axis=0)
+        nt.assert_array_equal(ids, np.flatnonzero(d <= 3))
+        self.assertEqual(len(map.within((100, 100), 3)), 0)
+
     def test_plot(self):
         plt.clf()
         map = LandmarkMap(20)
@@ -329,6 +370,416 @@ class TestUnicycle(unittest.TestCase):
         nt.assert_almost_equal(uni.deriv(state, input), np.r_[1, 0, 1])
 
 
+class TestFleet(unittest.TestCase):
+    def test_run(self):
+        x0 = np.array([[0, 0, 0], [1, 2, 0.5], [-3, 1, -2]])
+        u = np.array([[1, 0.2], [3, -0.3], [0.5, 1]])
+        for cls in [Bicycle, Unicycle, DiffSteer]:
+            fleet = rtb.Fleet(cls(speed_max=2, accel_max=1.5), x0)
+            x_hist = fleet.run(T=2, control=u)
+            self.assertEqual(x_hist.shape, (3, 20, 3))
+
+            # same as simulating each vehicle separately
+            for k in range(3):
+                veh = cls(speed_max=2, accel_max=1.5)
+                veh.init(x0=x0[k], control=u[k], animate=False)
+                for i in range(20):
+                    veh.step(animate=False)
+                nt.assert_almost_equal(fleet.x_hist[k], veh.x_hist)
+                nt.assert_almost_equal(fleet.x[k], veh.x)
+
+    def test_step(self):
+        fleet = rtb.Fleet(Bicycle(covar=np.diag([0.1, 0.01]) ** 2), 4)
+        self.assertEqual(len(fleet), 4)
+        odo = fleet.step((1, 0))
+        self.assertEqual(odo.shape, (4, 2))
+        self.assertFalse(np.all(odo[:, 0] == odo[0, 0]))
+        fleet.step(lambda fleet, t, x: np.c_[np.ones(4), x[:, 0]])
+        self.assertEqual(fleet.x_hist.shape, (4, 2, 3))
+        nt.assert_almost_equal(fleet.x[:, 0], 0.2)
+
+        with self.assertRaises(ValueError):
+            fleet.step((1, 2, 3))
+
+    def test_randompath(self):
+        fleet = rtb.Fleet(Bicycle(), 50, control=RandomPath(workspace=10))
+        x_hist = fleet.run(T=20)
+        self.assertEqual(x_hist.shape, (50, 200, 3))
+        self.assertTrue(np.all(np.abs(x_hist[:, :, :2]) < 15))
+
+        # the vehicles drive different paths, repeatably
+        self.assertGreater(np.std(fleet.x[:, 0]), 1)
+        nt.assert_equal(fleet.run(T=20), x_hist)
+
+
+class TestEKF(unittest.TestCase):
+
+    def slam(self, cls, V=True, batch=False, **kwargs):
+        # SLAM problem, or map making if V is False
+        V = np.diag([0.02, np.radians(0.5)]) ** 2 if V else None
+        robot = rtb.Bicycle(covar=V)
+        robot.control = rtb.RandomPath(workspace=10)
+        map = rtb.LandmarkMap(20, workspace=10)
+        W = np.diag([0.1, np.radians(1)]) ** 2
+        sensor = RangeBearingSensor(
+            robot=robot,
+            map=map,
+            covar=W,
+            range=4,
+            angle=[-pi / 2, pi / 2],
+            batch=batch,
+        )
+        P0 = np.diag([0.05, 0.05, np.radians(0.5)]) ** 2
+        filter = cls(
+            robot=(robot, V), sensor=(sensor, W), P0=P0, animate=False, **kwargs
+        )
+        filter.run(T=20)
+        return filter
+
+    def test_inplace(self):
+        for joseph in [True, False]:
+            ekf = self.slam(rtb.EKF, joseph=joseph)
+            ekf2 = self.slam(rtb.EKF, joseph=joseph, inplace=True)
+
+            self.assertGreater(len(ekf.landmarks), 0)
+            nt.assert_almost_equal(ekf2.x_est, ekf.x_est)
+            nt.assert_almost_equal(ekf2.P_est, ekf.P_est)
+            nt.assert_almost_equal(ekf2.get_P(-1), ekf.get_P(-1))
+            nt.assert_almost_equal(ekf2.get_map(), ekf.get_map())
+
+        ekf = self.slam(rtb.EKF, V=False)
+        ekf2 = self.slam(rtb.EKF, V=False, inplace=True)
+        nt.assert_almost_equal(ekf2.x_est, ekf.x_est)
+        nt.assert_almost_equal(ekf2.P_est, ekf.P_est)
+
+    def test_eif(self):
+        # exact information filter is the same as the EKF
+        ekf = self.slam(rtb.EKF)
+        eif = self.slam(rtb.EIF, nactive=None, niter=None)
+
+        self.assertIsInstance(str(eif), str)
+        nt.assert_almost_equal(eif.x_est, ekf.x_est)
+        nt.assert_almost_equal(eif.P_est, ekf.P_est)
+        nt.assert_almost_equal(eif.xi, eif.Omega @ eif.x_est)
+        nt.assert_almost_equal(eif.get_P(-1), ekf.get_P(-1)[:3, :3])
+        nt.assert_almost_equal(eif.get_xyt(), ekf.get_xyt())
+
+        # sparse information filter
+        eif = self.slam(rtb.EIF, nactive=2)
+        self.assertEqual(len(eif.x_est), len(ekf.x_est))
+        self.assertLessEqual(eif.Omega[:3, 3:].nnz, 2 * 2 * 3)
+        self.assertLess(eif.Omega.nnz, len(eif.x_est) ** 2)
+        self.assertEqual(eif.get_P(-1).shape, (3, 3))
+        nt.assert_almost_equal(eif.get_xyt()[-1], ekf.get_xyt()[-1], decimal=1)
+
+        x = eif.recover()
+        nt.assert_almost_equal(eif.Omega @ x, eif.xi)
+        nt.assert_almost_equal(eif.get_map(), ekf.get_map(), decimal=1)
+
+        # map making
+        ekf = self.slam(rtb.EKF, V=False)
+        eif = self.slam(rtb.EIF, V=False)
+        nt.assert_almost_equal(eif.x_est, ekf.x_est)
+        nt.assert_almost_equal(eif.P_est, ekf.P_est)
+
+    def test_batch(self):
+        ekf = self.slam(rtb.EKF)
+        ekf2 = self.slam(rtb.EKF, batch=True)
+        self.assertEqual(len(ekf2.landmarks), len(ekf.landmarks))
+        nt.assert_almost_equal(ekf2.get_xyt()[-1], ekf.get_xyt()[-1], decimal=0)
+        nt.assert_almost_equal(ekf2.get_map(), ekf.get_map(), decimal=0)
+
+        # stacked update for every landmark seen before
+        h = ekf2.history[-1]
+        self.assertEqual(h.z.shape, (len(h.lm), 2))
+        self.assertEqual(h.S.shape, (len(h.innov), len(h.innov)))
+        self.assertEqual(h.K.shape, (len(h.xest), len(h.innov)))
+
+        ekf3 = self.slam(rtb.EKF, batch=True, inplace=True)
+        nt.assert_almost_equal(ekf3.x_est, ekf2.x_est)
+        nt.assert_almost_equal(ekf3.P_est, ekf2.P_est)
+
+        eif = self.slam(rtb.EIF, batch=True)
+        nt.assert_almost_equal(eif.get_xyt()[-1], ekf2.get_xyt()[-1], decimal=0)
+
+        # map making
+        ekf = self.slam(rtb.EKF, V=False, batch=True)
+        eif = self.slam(rtb.EIF, V=False, batch=True)
+        nt.assert_almost_equal(eif.x_est, ekf.x_est)
+
+        # particle filter localization
+        robot = rtb.Bicycle(covar=np.diag([0.02, np.radians(0.5)]) ** 2)
+        robot.control = rtb.RandomPath(workspace=10)
+        map = rtb.LandmarkMap(20, workspace=10)
+        sensor = RangeBearingSensor(
+            robot=robot, map=map, covar=np.diag([0.1, np.radians(1)]) ** 2, batch=True
+        )
+        R = np.diag([0.1, 0.1, np.radians(1)]) ** 2
+        pf = rtb.ParticleFilter(robot, sensor, R, np.diag([0.1, 0.1]), nparticles=200)
+        pf.run(T=5)
+        nt.assert_almost_equal(pf.get_xyt()[-1, :2], robot.x[:2], decimal=0)
+
+    def test_history(self):
+        ekf = self.slam(rtb.EKF)
+        self.assertIsInstance(ekf.history, rtb.History)
+        self.assertEqual(len(ekf.history), 200)
+
+        # decimated, selected fields, vehicle covariance
+        history = rtb.History(fields=["t", "xest", "P"], every=5, covar="vehicle")
+        ekf2 = self.slam(rtb.EKF, history=history)
+        self.assertIsInstance(str(history), str)
+        self.assertEqual(len(ekf2.history), 40)
+        nt.assert_array_equal(ekf2.history.index, np.arange(0, 200, 5))
+        nt.assert_almost_equal(ekf2.get_t(), ekf.get_t()[::5])
+        nt.assert_almost_equal(ekf2.get_xyt(), ekf.get_xyt()[::5])
+        nt.assert_almost_equal(ekf2.get_P(-1), ekf.get_P(195)[:3, :3])
+        self.assertIsNone(ekf2.history[0].K)
+
+        # ring buffer, diagonal covariance
+        ekf2 = self.slam(rtb.EKF, history=rtb.History(maxlen=10, covar="diag"))
+        self.assertEqual(len(ekf2.history), 10)
+        nt.assert_array_equal(ekf2.history.index, np.arange(190, 200))
+        nt.assert_almost_equal(ekf2.get_P(0), np.diag(np.diag(ekf.get_P(190))))
+
+        # on disk
+        with tempfile.TemporaryDirectory() as dir:
+            history = rtb.History(file=dir, chunk=32)
+            ekf2 = self.slam(rtb.EKF, history=history)
+            self.assertEqual(len(ekf2.history), 200)
+            for h, h2 in zip(ekf.history, ekf2.history):
+                self.assertEqual(h.t, h2.t)
+                self.assertEqual(h.lm, h2.lm)
+                nt.assert_almost_equal(h.xest, h2.xest)
+                nt.assert_almost_equal(h.P, h2.P)
+                if h.K is None:
+                    self.assertIsNone(h2.K)
+            nt.assert_almost_equal(ekf2.get_P(-1), ekf.get_P(-1))
+            nt.assert_almost_equal(ekf2.get_Pnorm(), ekf.get_Pnorm())
+
+            history.flush()
+            self.assertEqual(len(os.listdir(dir)), 7)
+            history.clear()
+            self.assertEqual(len(history), 0)
+            self.assertEqual(len(os.listdir(dir)), 0)
+
+        with self.assertRaises(ValueError):
+            rtb.History(covar="upper")
+
+
+class TestParticleFilter(unittest.TestCase):
+    def pf(self, **kwargs):
+        robot = rtb.Bicycle(covar=np.diag([0.02, np.radians(0.5)]) ** 2)
+        robot.control = rtb.RandomPath(workspace=10)
+        map = rtb.LandmarkMap(20, workspace=10)
+        sensor = RangeBearingSensor(
+            robot=robot, map=map, covar=np.diag([0.1, np.radians(1)]) ** 2
+        )
+        R = np.diag([0.1, 0.1, np.radians(1)]) ** 2
+        pf = rtb.ParticleFilter(robot, sensor, R, np.diag([0.1, 0.1]), **kwargs)
+        pf.run(T=5)
+        return pf
+
+    def test_resample(self):
+        for resample in ["systematic", "stratified", "multinomial"]:
+            pf = self.pf(resample=resample)
+            self.assertEqual(pf.nparticles, 500)
+            nt.assert_almost_equal(pf.weight.sum(), 1)
+            nt.assert_almost_equal(pf.get_xyt()[-1, :2], pf.robot.x[:2], decimal=0)
+
+        # weights accumulate between resampling
+        pf = self.pf(ess=0.5)
+        nt.assert_almost_equal(pf.get_xyt()[-1, :2], pf.robot.x[:2], decimal=0)
+
+        with self.assertRaises(ValueError):
+            self.pf(resample="residual")
+
+    def test_kld(self):
+        pf = self.pf(nparticles=5000, kld=True)
+        self.assertGreaterEqual(pf.nparticles, 100)
+        self.assertLess(pf.nparticles, 5000)
+        nt.assert_almost_equal(pf.get_xyt()[-1, :2], pf.robot.x[:2], decimal=0)
+
+        # weights of the resampled particles are equal
+        self.assertEqual(pf.weight.shape, (pf.nparticles,))
+        nt.assert_almost_equal(pf.weight, 1 / pf.nparticles)
+
+        pf = self.pf(nparticles=5000, kld=dict(epsilon=0.2, nmin=10))
+        self.assertGreaterEqual(pf.nparticles, 10)
+        self.assertLess(pf.nparticles, 1000)
+
+
+class TestPoseGraph(unittest.TestCase):
+    def coords(self, pg):
+        return np.array([v.coord for v in pg.graph])
+
+    def test_optimize(self):
+        pg = rtb.PoseGraph("data/pg1.g2o")
+        cost = pg.optimize()
+        self.assertLess(cost, 1e-6)
+        nt.assert_almost_equal(self.coords(pg)[0], [0, 0, 0])
+
+        # Gauss-Newton and Levenberg-Marquardt converge to the same solution
+        pg = rtb.PoseGraph("data/killian-small.toro")
+        x0 = self.coords(pg)[0]
+        cost = pg.optimize()
+        pg2 = rtb.PoseGraph("data/killian-small.toro")
+        cost2 = pg2.optimize(method="lm", iterations=20)
+        self.assertAlmostEqual(cost2 / cost, 1)
+        nt.assert_almost_equal(self.coords(pg)[0], x0)
+        nt.assert_almost_equal(self.coords(pg2), self.coords(pg), decimal=4)
+
+        # robust kernels reject a corrupted loop closure
+        def error(kernel=None):
+            pg2 = rtb.PoseGraph("data/killian-small.toro")
+            lc = np.flatnonzero(np.abs(pg2._ej - pg2._ei) > 100)
+            pg2._emean[lc[len(lc) // 2]] += (5, -5, 1)
+            pg2.optimize(kernel=kernel, delta=5)
+            d = self.coords(pg2)[:, :2] - self.coords(pg)[:, :2]
+            return np.sqrt(np.mean(np.sum(d**2, axis=1)))
+
+        e = error()
+        self.assertGreater(e, 1)
+        for kernel in ["huber", "cauchy"]:
+            self.assertLess(error(kernel), 0.1 * e)
+
+        with self.assertRaises(ValueError):
+            pg.optimize(method="newton")
+        with self.assertRaises(ValueError):
+            pg.optimize(kernel="tukey")
+
+    def test_load(self):
+        pg = rtb.PoseGraph("data/killian-small.toro")
+        self.assertEqual(pg.graph.n, 1941)
+        self.assertEqual(pg.graph.ne, 3995)
+
+        # the graph vertices are views of the coordinate array
+        nt.assert_almost_equal(self.coords(pg), pg._x)
+        nt.assert_almost_equal(pg.pose(10), pg._x[10])
+        pg._x[10, 0] = 99
+        self.assertEqual(pg.graph[pg._names[10]].coord[0], 99)
+
+        edges = {
+            (e.endpoints[0].index, e.endpoints[1].index): e for e in pg.graph.edges()
+        }
+        for k in range(0, 3995, 100):
+            e = edges[pg._ei[k], pg._ej[k]]
+            nt.assert_almost_equal(e.mean, pg._emean[k])
+            nt.assert_almost_equal(e.info, pg._einfo[k])
+            nt.assert_almost_equal(e.info, e.info.T)
+
+    def test_load_lidar(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "killian.g2o.zip")
+            shutil.copy(rtb.rtb_path_to_datafile("data/killian.g2o.zip"), filename)
+
+            pg = rtb.PoseGraph(filename, lidar=True, cache=True)
+            self.assertTrue(os.path.exists(filename + ".npz"))
+            r, theta = pg.scan(100)
+            self.assertEqual(r.shape, (180,))
+            self.assertEqual(theta.shape, (180,))
+            self.assertAlmostEqual(theta[0], -pi / 2, places=5)
+            self.assertEqual(pg.scanxy(100).shape, (2, 180))
+            self.assertIs(pg.vindex[100], pg.graph[pg._names[100]])
+            self.assertEqual(pg.vindex[100].time, pg.time(100))
+
+            # a graph loaded without lidar has no scans
+            pg3 = rtb.PoseGraph(filename)
+            with self.assertRaises(KeyError):
+                pg3.scan(100)
+            with self.assertRaises(KeyError):
+                pg3.time(100)
+
+            # second load is from the cache
+            pg2 = rtb.PoseGraph(filename, lidar=True, cache=True)
+            nt.assert_equal(pg2._x, pg._x)
+            nt.assert_equal(pg2._einfo, pg._einfo)
+            nt.assert_equal(pg2.scan(100)[0], r)
+            self.assertEqual(pg2.time(100), pg.time(100))
+
+    def test_scanmap(self):
+        og = rtb.OccupancyGrid(np.zeros((5, 5)))
+        nt.assert_equal(
+            og._ray_cells(np.array([[0, 0]]), np.array([[3, 0]])), [0, 1, 2]
+        )
+        nt.assert_equal(og._ray_cells(np.array([[0, 0]]), np.array([[0, 0.4]])), [])
+        nt.assert_equal(
+            og._ray_cells(np.array([[1, 1], [4, 1]]), np.array([[3, 3], [4, 9]])),
+            [6, 9, 7, 14, 12, 19, 13, 24],
+        )
+
+        pg = rtb.PoseGraph("data/killian.g2o.zip", lidar=True)
+        og = rtb.OccupancyGrid(workspace=[-60, 60, -60, 60], cellsize=0.5, value=0.0)
+        pg.scanmap(og, maxrange=40, every=50, chunksize=10)
+        g = og.grid
+        self.assertTrue(np.any(g > 0))
+        self.assertLess(g[tuple(og.w2g(pg.pose(0)[:2])[::-1])], 0)
+
+        og2 = rtb.OccupancyGrid(workspace=[-60, 60, -60, 60], cellsize=0.5, value=0.0)
+        pg.scanmap(og2, maxrange=40, every=50, chunksize=10, nproc=2)
+        nt.assert_almost_equal(og2.grid, g)
+
+    def test_scanmatch(self):
+        pg = rtb.PoseGraph("data/killian.g2o.zip", lidar=True)
+
+        # a scan matches itself from an offset start
+        for method in ["line", "point"]:
+            T = pg.scanmatch(500, 500, T=[0.2, -0.1, 0.05], method=method)
+            nt.assert_almost_equal(T.xyt(), [0, 0, 0], decimal=4)
+
+        # consecutive scans match close to the odometry
+        T = pg.scanmatch(0, 1)
+        nt.assert_array_less(np.abs(T.xyt() - pg._emean[0]), [0.05, 0.05, 0.01])
+
+        with self.assertRaises(ValueError):
+            pg.scanmatch(0, 1, method="plane")
+
+    def test_loopclosure(self):
+        pg = rtb.PoseGraph("data/killian.g2o.zip", lidar=True)
+        pg.optimize()
+        ne = pg.graph.ne
+
+        pairs = pg.loopclosure_candidates(radius=3, mingap=100)
+        self.assertGreater(len(pairs), 0)
+        self.assertTrue(np.all(pairs[:, 1] - pairs[:, 0] >= 100))
+        d = np.linalg.norm(pg._x[pairs[:, 0], :2] - pg._x[pairs[:, 1], :2], axis=1)
+        self.assertTrue(np.all(d <= 3))
+
+        added = pg.add_loopclosures(pairs[::20])
+        self.assertGreater(len(added), 0)
+        self.assertEqual(len(pg._ei), 4987 + len(added))
+        self.assertEqual(pg.graph.ne, ne + len(added))
+        nt.assert_equal(pg._ei[-len(added) :], added[:, 0])
+
+        # the new edges are used by the optimizer, reducing their error
+        def error():
+            k = slice(-len(added), None)
+            x = pg._x
+            e, _, _ = _linear_factors(
+                x[pg._ei[k]], x[pg._ej[k]], pg._emean[k], jacobian=False
+            )
+            return np.einsum("ki,kij,kj->", e, pg._einfo[k], e)
+
+        e = error()
+        cost = pg._cost(pg._x, None, 1.0)
+        self.assertLess(pg.optimize(), cost)
+        self.assertLess(error(), 0.5 * e)
+        self.assertEqual(len(pg.add_loopclosures(pairs[:1], maxrms=0)), 0)
+
+    def test_linearize(self):
+        pg = rtb.PoseGraph("data/killian-small.toro")
+        x, _ = pg._setup()
+        for edge in list(pg.graph.edges())[::100]:
+            i, j = [v.index for v in edge.endpoints]
+            e, A, B = _linear_factors(x[[i]], x[[j]], edge.mean[np.newaxis, :])
+            ek, Ak, Bk = edge.linear_factors()
+            nt.assert_almost_equal(e[0], ek)
+            nt.assert_almost_equal(A[0], Ak)
+            nt.assert_almost_equal(B[0], Bk)
+
+        cost = pg.linearize_and_solve()
+        self.assertLess(pg.linearize_and_solve(), cost)
+
+
 # function setupOnce(testCase)
 #     testCase.TestData.Duration = 50;
 # end
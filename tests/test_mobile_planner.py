@@ -4,10 +4,20 @@ import numpy.testing as nt
 import numpy as np
 import unittest
 import spatialmath.base as sm
+from spatialmath import Polygon2, SE2
 
 from roboticstoolbox.mobile import *
 
 
+def _pathcost(costmap, path):
+    # cost of an 8-way connected path with D* edge costs
+    cost = 0
+    for p, q in zip(path[:-1], path[1:]):
+        d = np.sqrt(2) if all(p != q) else 1
+        cost += (costmap[p[1], p[0]] + costmap[q[1], q[0]]) / 2 * d
+    return cost
+
+
 class TestPlanners(unittest.TestCase):
 
     def test_occgrid(self):
@@ -17,7 +27,7 @@ class TestPlanners(unittest.TestCase):
         og = BinaryOccupancyGrid(g, name='my grid')
 
         self.assertEqual(og.shape, g.shape)
-        
+
         s = str(og)
         self.assertIsInstance(s, str)
         self.assertEqual(s, "BinaryOccupancyGrid[my grid]: 120 x 100, cell size=1, x = [0.0, 119.0], y = [0.0, 99.0], 2.5% occupied")
@@ -76,6 +86,134 @@ class TestPlanners(unittest.TestCase):
         og.inflate(0.5)
         self.assertEqual(str(og), "BinaryOccupancyGrid[foo]: 120 x 100, cell size=0.1, x = [2.0, 13.9], y = [4.0, 13.9], 6.3% occupied")
 
+    def test_occgrid_many(self):
+        g = np.zeros((20, 30))
+        g[5:15, 10] = 1
+        og = BinaryOccupancyGrid(g, cellsize=0.5, origin=(1, 2))
+
+        P = np.array([[1, 2], [6, 6], [6, 4], [-1, 2], [15.5, 11.5], [16, 12]])
+        occupied, inside = og.isoccupied_many(P, bounds=True)
+        nt.assert_array_equal(occupied, [False, True, False, True, False, True])
+        nt.assert_array_equal(inside, [True, True, True, False, True, False])
+        for p, o in zip(P[:3], occupied):
+            self.assertEqual(og.isoccupied(p), o)
+
+        # rays towards the wall, along it, and leaving the grid
+        r = og.raycast((2, 6), [0, pi, pi / 2, np.arctan2(1, 4)])
+        nt.assert_array_almost_equal(r[0], 3.75)
+        self.assertTrue(np.isnan(r[1]))
+        self.assertTrue(np.isnan(r[2]))
+        nt.assert_array_almost_equal(r[3], 3.75 / np.cos(np.arctan2(1, 4)))
+        self.assertTrue(np.isnan(og.raycast((2, 6), 0, maxrange=3)[0]))
+        self.assertEqual(og.raycast((6, 6), 0)[0], 0)
+
+        free = og.lines_free(
+            [[2, 6], [2, 6], [2, 3], [2, 6], [3, 3]],
+            [[8, 6], [5, 6], [14, 3], [2, 20], [3, 3]],
+        )
+        nt.assert_array_equal(free, [False, True, True, False, True])
+
+    def test_occgrid_pyramid(self):
+        g = np.zeros((20, 30))
+        g[5:15, 10] = 1
+        og = BinaryOccupancyGrid(g, cellsize=0.5, origin=(1, 2))
+
+        pyramid = og.pyramid
+        self.assertEqual(
+            [p.shape for p in pyramid], [(10, 15), (5, 8), (3, 4), (2, 2), (1, 1)]
+        )
+        self.assertTrue(pyramid[0][2, 5])
+        self.assertFalse(pyramid[0][0, 0])
+        self.assertTrue(pyramid[1][-1, -1])  # beyond the edge of the grid
+
+        # incremental update matches a rebuild
+        og.set([10, 12, 3, 5], True)
+        og.grid[16, 25] = True
+        og.update([13.5, 13.5, 10, 10])
+        incremental = [p.copy() for p in og.pyramid]
+        og.update()
+        for p, q in zip(incremental, og.pyramid):
+            nt.assert_array_equal(p, q)
+
+        # set alone, clearing and filling cells at the edges of an odd sized grid
+        og2 = BinaryOccupancyGrid(np.zeros((21, 31)), cellsize=0.5)
+        og2.pyramid
+        for region, value in [
+            ([0, 3, 0, 2], True),
+            ([14, 15, 9, 10], True),
+            ([1, 2, 0.5, 1], False),
+            ([12.5, 15, 4, 10], True),
+            ([14.5, 15, 10, 10], False),
+        ]:
+            og2.set(region, value)
+            incremental = [p.copy() for p in og2.pyramid]
+            rebuilt = BinaryOccupancyGrid(og2.grid.copy(), cellsize=0.5).pyramid
+            for p, q in zip(incremental, rebuilt):
+                nt.assert_array_equal(p, q)
+
+        # polygon free, overlapping the wall, and extending beyond the grid
+        square = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]])
+        self.assertFalse(og.iscollision(Polygon2((square + [4, 6]).T)))
+        self.assertTrue(og.iscollision(Polygon2((square + [6, 6]).T)))
+        self.assertFalse(og.iscollision(Polygon2((square * 0.1 + [6.6, 7.7]).T)))
+        self.assertTrue(og.iscollision(Polygon2((square + [1.5, 6]).T)))
+
+    def test_occgrid_distancefield(self):
+        g = np.zeros((20, 30))
+        g[5:15, 10] = 1
+        og = BinaryOccupancyGrid(g, cellsize=0.5)
+
+        d = og.distancefield
+        self.assertEqual(d[10, 10], 0)
+        self.assertEqual(d[10, 13], 1.5)
+        nt.assert_almost_equal(d[2, 13], np.sqrt(3**2 + 3**2) * 0.5)
+
+        # inflation by thresholding matches dilation, original is unchanged
+        og2 = og.inflated(1)
+        self.assertTrue(og2.isoccupied((6, 2.5)))
+        self.assertFalse(og2.isoccupied((6, 1.5)))
+        self.assertFalse(og.isoccupied((6, 2.5)))
+        og.copy().inflate(1)
+        self.assertFalse(og.isoccupied((6, 2.5)))
+
+        # incremental update matches a recomputation
+        og.set([10, 11, 2, 3], True)
+        og.set([5, 5, 4, 4], False)
+        nt.assert_array_almost_equal(og.distancefield, og.copy().distancefield)
+        og.grid[:] = False
+        og.update()
+        self.assertTrue(np.all(np.isinf(og.distancefield)))
+
+        cost = BinaryOccupancyGrid(g, cellsize=0.5).costmap(radius=1, scale=5)
+        self.assertTrue(np.isinf(cost[10, 12]))
+        nt.assert_almost_equal(cost[10, 13], 1 + 5 * np.exp(-0.5))
+        self.assertTrue(np.all(cost[np.isfinite(cost)] >= 1))
+
+    def test_polygonmap(self):
+        map = PolygonMap(workspace=[0, 10])
+        map.add([(5, 50), (5, 6), (6, 6), (6, 50)])
+        map.add(np.array([(5, 4), (5, -50), (6, -50), (6, 4)]).T)
+        self.assertEqual(len(PolygonMap().polygons), 0)
+
+        self.assertTrue(map.isoccupied((5.5, 8)))
+        self.assertFalse(map.isoccupied((5.5, 5)))
+        self.assertFalse(map.isoccupied((2, 8)))
+
+        vehicle = Polygon2([(-1, 0.5), (-1, -0.5), (1, -0.5), (1, 0.5)])
+        self.assertFalse(map.iscollision(vehicle.transformed(SE2(5.5, 5, 0))))
+        self.assertTrue(map.iscollision(vehicle.transformed(SE2(5.5, 5, pi / 2))))
+
+        # driving through the gap, or turned across it
+        path = np.column_stack((np.linspace(2, 9, 20), np.full(20, 5), np.zeros(20)))
+        self.assertFalse(map.iscollision_path(vehicle, path))
+        path[10, 2] = pi / 2
+        self.assertTrue(map.iscollision_path(vehicle, path))
+        for q in path:
+            self.assertEqual(
+                map.iscollision_path(vehicle, q),
+                map.iscollision(vehicle.transformed(SE2(q))),
+            )
+
     def test_bug2(self):
         pass
 
@@ -108,6 +246,290 @@ class TestPlanners(unittest.TestCase):
         self.assertTrue(hasattr(status, 'length'))
         self.assertTrue(hasattr(status, 'direction'))
 
+    def test_path_length(self):
+        rng = np.random.default_rng(0)
+        start = rng.uniform((-5, -5, -pi), (5, 5, pi), (20, 3))
+        goal = rng.uniform((-5, -5, -pi), (5, 5, pi), (20, 3))
+
+        for planner in [
+            DubinsPlanner(curvature=2.0, stepsize=0.05),
+            ReedsSheppPlanner(curvature=0.5),
+        ]:
+            L = planner.length(start, goal)
+            self.assertEqual(L.shape, (20,))
+            for s, g, l in zip(start, goal, L):
+                path, status = planner.query(s, g)
+                self.assertAlmostEqual(status.length, l)
+                self.assertAlmostEqual(planner.length(s, g), l)
+                # points are spaced at stepsize along the path
+                d = np.linalg.norm(np.diff(path[:, :2], axis=0), axis=1)
+                self.assertLessEqual(d.max(), planner.stepsize + 1e-9)
+                nt.assert_array_almost_equal(path[-1, :2], g[:2])
+
+            nt.assert_array_almost_equal(
+                planner.length(start[0], goal),
+                [planner.length(start[0], g) for g in goal],
+            )
+
+    def test_prm(self):
+        g = np.zeros((50, 50))
+        g[10:40, 20:30] = 1
+
+        prm = PRMPlanner(g, seed=0, progress=False)
+        prm.plan(npoints=100)
+        self.assertEqual(prm.graph.n, 100)
+
+        # vertices are in free space and edges are obstacle free
+        for v in prm.graph:
+            self.assertFalse(prm.occgrid.isoccupied(v.coord))
+        for e in prm.graph.edges():
+            v1, v2 = e.endpoints
+            self.assertLessEqual(e.cost, prm.dist_thresh)
+            for s in np.linspace(0, 1, 50):
+                self.assertFalse(
+                    prm.occgrid.isoccupied(v1.coord + s * (v2.coord - v1.coord))
+                )
+
+        path = prm.query(start=(5, 5), goal=(45, 45))
+        nt.assert_array_equal(path[0], (5, 5))
+        nt.assert_array_equal(path[-1], (45, 45))
+
+        # same seed gives the same roadmap
+        prm2 = PRMPlanner(g, seed=0, progress=False)
+        prm2.plan(npoints=100)
+        self.assertEqual(prm2.graph.ne, prm.graph.ne)
+
+        prm.grow(50)
+        self.assertEqual(prm.graph.n, 150)
+        self.assertGreater(prm.graph.ne, prm2.graph.ne)
+
+    def test_prm_k(self):
+        g = np.zeros((50, 50))
+        g[10:40, 20:30] = 1
+
+        prm = PRMPlanner(g, seed=0, k=5, progress=False)
+        prm.plan(npoints=200)
+        # each vertex contributes at most k edges
+        self.assertLessEqual(prm.graph.ne, 200 * 5)
+
+        path = prm.query(start=(5, 5), goal=(45, 45))
+        self.assertEqual(path.shape[1], 2)
+
+    def test_vertexindex(self):
+        from roboticstoolbox.mobile.VertexIndex import VertexIndex
+
+        rng = np.random.default_rng(0)
+        P = rng.uniform((0, 0, -pi), (10, 10, pi), size=(500, 3))
+
+        index = VertexIndex(ndims=3, metric="SE2")
+        self.assertEqual(index.closest((0, 0, 0)), (None, np.inf))
+        for k, p in enumerate(P):
+            index.add(p, k)
+            q = rng.uniform((0, 0, -pi), (10, 10, pi))
+            d = P[: k + 1] - q
+            d[:, 2] = (d[:, 2] + pi) % (2 * pi) - pi
+            d = np.linalg.norm(d, axis=1)
+
+            v, dmin = index.closest(q)
+            self.assertEqual(v, np.argmin(d))
+            self.assertAlmostEqual(dmin, d.min())
+        self.assertEqual(len(index), 500)
+
+        # angles either side of +/- pi are close
+        index = VertexIndex(ndims=3, metric="SE2")
+        index.add((0, 0, pi - 0.01), "a")
+        index.add((0, 0.1, 0), "b")
+        v, d = index.closest((0, 0, -pi + 0.01))
+        self.assertEqual(v, "a")
+        self.assertAlmostEqual(d, 0.02)
+
+    def test_lattice(self):
+        lattice = LatticePlanner()
+        lattice.plan(iterations=6)
+        self.assertEqual(lattice.graph.n, 372)
+        self.assertEqual(lattice.graph.ne, 627)
+
+        path, status = lattice.query(start=(0, 0, 0), goal=(1, 2, pi / 2))
+        nt.assert_array_almost_equal(path, [[0, 0, 0], [1, 1, pi / 2], [1, 2, pi / 2]])
+        self.assertEqual(status.segments, ["L", "S"])
+        self.assertAlmostEqual(status.cost, 1 + pi / 2)
+
+        with self.assertRaises(ValueError):
+            lattice.query(start=(0, 0, 0), goal=(0.5, 2, pi / 2))
+
+        # rotated root
+        lattice = LatticePlanner(root=(0.3, 0.2, 0.7))
+        lattice.plan(iterations=6)
+        self.assertEqual(lattice.graph.n, 372)
+
+    def test_distancexform(self):
+        from roboticstoolbox.mobile.DistanceTransformPlanner import (
+            distancexform,
+            grassfire_step,
+        )
+
+        g = np.zeros((30, 40))
+        g[5:25, 20] = 1
+        g[10, 5:20] = 1
+        g[0:3, 30:33] = 1
+        g[1, 31] = 0  # unreachable cell inside an obstacle
+
+        r2 = np.sqrt(2)
+        for metric, D in [
+            ("euclidean", np.array([[r2, 1, r2], [1, 0, 1], [r2, 1, r2]])),
+            (
+                "cityblock",
+                np.array([[np.inf, 1, np.inf], [1, 0, 1], [np.inf, 1, np.inf]]),
+            ),
+        ]:
+            d = distancexform(g, goal=(2, 28), metric=metric)
+
+            # grassfire iterated to convergence
+            ref = np.full(g.shape, np.inf)
+            ref[28, 2] = 0
+            for i in range(200):
+                ref = grassfire_step(ref, D)
+                ref[g > 0] = np.nan
+
+            self.assertTrue(np.isnan(d[g > 0]).all())
+            self.assertEqual(d[1, 31], np.inf)
+            self.assertEqual(d[28, 2], 0)
+            self.assertEqual(d.dtype, np.float32)
+            nt.assert_array_almost_equal(d, ref, decimal=5)
+
+    def test_dxform_cache(self):
+        g = np.zeros((30, 40))
+        g[5:25, 20] = 1
+
+        dx = DistanceTransformPlanner(g, cachesize=2)
+        dx.plan(goal=(35, 15))
+        d1 = dx.distancemap
+        path1 = dx.query(start=(5, 15))
+        nt.assert_array_equal(path1[0], (5, 15))
+        nt.assert_array_equal(path1[-1], (35, 15))
+
+        # query for a new goal plans for it
+        path2 = dx.query(start=(5, 15), goal=(10, 2))
+        nt.assert_array_equal(path2[-1], (10, 2))
+        self.assertIsNot(dx.distancemap, d1)
+
+        # returning to the first goal uses the cached distance map
+        path = dx.query(start=(5, 15), goal=(35, 15))
+        self.assertIs(dx.distancemap, d1)
+        nt.assert_array_equal(path, path1)
+        dx.plan(goal=(35, 15))
+        self.assertIs(dx.distancemap, d1)
+
+        # the oldest distance map is evicted
+        dx.plan(goal=(10, 2))
+        dx.plan(goal=(0, 0))
+        dx.plan(goal=(35, 15))
+        self.assertIsNot(dx.distancemap, d1)
+        nt.assert_array_equal(dx.distancemap, d1)
+
+        # changing the occupancy grid invalidates the cache
+        dx.occgrid.grid[15, 30] = True
+        dx.plan(goal=(35, 15))
+        self.assertTrue(np.isnan(dx.distancemap[15, 30]))
+
+    def test_dxform_query(self):
+        g = np.zeros((30, 40))
+        g[5:25, 20] = 1
+        g[0:3, 30:33] = 1
+        g[1, 31] = 0  # unreachable cell inside an obstacle
+
+        dx = DistanceTransformPlanner(g)
+        dx.plan(goal=(35, 15))
+        d = dx.distancemap
+
+        nextmap = dx.nextmap
+        self.assertEqual(nextmap.shape, g.shape)
+        self.assertEqual(nextmap[15, 35], -1)
+        self.assertEqual(nextmap[10, 20], -1)
+        self.assertEqual(nextmap[1, 31], -1)
+        self.assertIs(dx.nextmap, nextmap)
+
+        starts = np.array([[5, 15], [0, 0], [39, 29], [35, 15], [25, 3]])
+        paths = dx.query(start=starts)
+        self.assertEqual(len(paths), 5)
+        for start, path in zip(starts, paths):
+            nt.assert_array_equal(path, dx.query(start=start))
+            nt.assert_array_equal(path[0], start)
+            nt.assert_array_equal(path[-1], (35, 15))
+
+            # 8-way connected path of decreasing distance
+            self.assertTrue((np.abs(np.diff(path, axis=0)) <= 1).all())
+            self.assertTrue((np.diff(d[path[:, 1], path[:, 0]]) < 0).all())
+        self.assertEqual(len(paths[3]), 1)
+
+        # next agrees with the path
+        path = paths[0]
+        for p, q in zip(path[:-2], path[1:-1]):
+            nt.assert_array_equal(dx.next(p), q)
+        self.assertIsNone(dx.next(path[-2]))
+
+        with self.assertRaises(RuntimeError):
+            dx.query(start=(31, 1))
+
+        # superclass options
+        self.assertIsNone(dx.query(start=(15, 15), next=False))
+        nt.assert_array_equal(dx.start, (15, 15))
+        nt.assert_array_equal(dx.query(start=(5, 15), dtype=int), paths[0])
+        with self.assertRaises(TypeError):
+            dx.query(start=(5, 15), bad=True)
+
+    def test_dstarlite(self):
+        costmap = np.ones((20, 20))
+        costmap[5:15, 10] = np.inf
+        costmap[12:18, 3:6] = 5
+
+        ds = DstarPlanner(costmap.copy(), goal=(18, 18))
+        ds.plan()
+        path_ds, status_ds = ds.query(start=(2, 2))
+
+        dl = DstarLitePlanner(costmap, goal=(18, 18))
+        dl.plan()
+        self.assertEqual(dl.nexpand, 390)
+        path, status = dl.query(start=(2, 2))
+        nt.assert_array_equal(path[0], (2, 2))
+        nt.assert_array_equal(path[-1], (18, 18))
+        self.assertAlmostEqual(status.cost, status_ds.cost)
+        self.assertAlmostEqual(dl.distancemap[2, 2], status.cost)
+        self.assertEqual(dl.metrics.nreplan, 0)
+
+        # block the gap above the wall when the robot reaches it
+        def sensor(p):
+            if p == (8, 13):
+                return [(10, y, np.inf) for y in range(15, 20)]
+
+        path, status = dl.query(start=(2, 2), sensor=sensor)
+        self.assertEqual(dl.metrics.nreplan, 1)
+        self.assertGreater(dl.metrics.expansions[0], 0)
+        self.assertEqual(dl.metrics.latency.shape, (1,))
+        for p in path:
+            self.assertTrue(np.isfinite(dl.costmap[p[1], p[0]]))
+
+        # the remaining path is optimal for the modified costmap
+        fresh = DstarLitePlanner(dl.costmap.copy(), goal=(18, 18))
+        fresh.plan()
+        k = [tuple(p) for p in path].index((8, 13))
+        self.assertAlmostEqual(status.cost, _pathcost(dl.costmap, path))
+        self.assertAlmostEqual(
+            _pathcost(dl.costmap, path[k:]), fresh.distancemap[13, 8]
+        )
+
+        # changes made between queries
+        dl.modify_cost([(10, 0), (10, 1)], np.inf)
+        path, status = dl.query(start=(2, 2))
+        fresh = DstarLitePlanner(dl.costmap.copy(), goal=(18, 18))
+        fresh.plan()
+        self.assertAlmostEqual(status.cost, fresh.distancemap[2, 2])
+
+        # no path to goal
+        dl.modify_cost([(10, y) for y in range(2, 5)], np.inf)
+        with self.assertRaises(RuntimeError):
+            dl.query(start=(2, 2))
+
     # def test_bug2(self):
 
     #     vars = loadmat("data/map1.mat")
@@ -168,7 +590,7 @@ class TestPlanners(unittest.TestCase):
     #     for k in range(len(path)-1):
     #         d = np.linalg.norm(path[k] - path[k+1])
     #         self.assertTrue(d < 1.5)
-            
+
     #     dx.plot()
     #     dx.plot(path=path)
 if __name__ == '__main__':  # pragma nocover
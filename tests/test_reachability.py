@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import numpy.testing as nt
+import numpy as np
+import roboticstoolbox as rtb
+import unittest
+import os
+import tempfile
+from spatialmath import SE3
+
+
+class TestReachabilityMap(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.robot = rtb.models.DH.Puma560()
+        self.robot.base = SE3(1, 0.5, 0) * SE3.Rz(0.3)
+        self.rmap = rtb.ReachabilityMap(self.robot, voxel=0.1, ndirections=20)
+        self.rmap.fill(20000, chunksize=3000)
+
+    def test_fill(self):
+        self.assertEqual(self.rmap.nsamples, 20000)
+        self.assertEqual(self.rmap.counts.shape[3], 20)
+        self.assertEqual(self.rmap.counts.sum(), 20000)
+        self.assertTrue(0 < self.rmap.index.max() <= 1)
+
+    def test_bin(self):
+        q = self.robot.random_q()
+        T = np.linalg.inv(self.robot.base.A) @ self.robot.fkine(q).A
+        i, j, k, d = np.unravel_index(self.rmap.bin(T)[0], self.rmap.counts.shape)
+
+        c = self.rmap.voxel_centres()[i, j, k]
+        self.assertTrue(np.all(np.abs(c - T[:3, 3]) <= self.rmap.voxel / 2))
+        dots = self.rmap.directions @ T[:3, 2]
+        self.assertEqual(d, np.argmax(dots))
+
+        self.assertEqual(self.rmap.bin(SE3(10, 0, 0))[0], -1)
+
+    def test_reachable(self):
+        q = np.array([self.robot.random_q() for _ in range(5)])
+        T = self.robot.fkine(q)
+
+        # poses visited while filling are reachable
+        reached = self.rmap.fill_ik(T, q0=q[0])
+        self.assertTrue(np.any(reached))
+        self.assertTrue(np.all(self.rmap.reachable(T)[reached]))
+        self.assertFalse(self.rmap.reachable(SE3(10, 0, 0)))
+        self.assertFalse(self.rmap.reachable(SE3(10, 0, 0), ik=True))
+
+    def test_fill_ik_base(self):
+        # ERobot, whose ETS does not include the base
+        robot = rtb.models.Panda()
+        robot.base = SE3(0.5, 0.2, 0.1) * SE3.Rz(0.7)
+        rmap = rtb.ReachabilityMap(robot, voxel=0.1, ndirections=20)
+
+        q = np.array([robot.random_q() for _ in range(5)])
+        T = robot.fkine(q)
+        reached = rmap.fill_ik(T, q0=q[0])
+        self.assertGreaterEqual(np.count_nonzero(reached), 4)
+        self.assertEqual(rmap.nsamples, np.count_nonzero(reached))
+        self.assertTrue(np.all(rmap.reachable(T)[reached]))
+
+    def test_base_placement(self):
+        q = np.array([self.robot.random_q() for _ in range(5)])
+        T = self.robot.fkine(q)
+
+        bases = SE3([self.robot.base, SE3(10, 0, 0)])
+        self.rmap.fill_ik(T)
+        sol = self.rmap.base_placement(T, bases=bases)
+        nt.assert_array_almost_equal(sol.base.A, self.robot.base.A)
+        self.assertEqual(sol.score, np.sum(self.rmap.reachable(T)))
+
+        sol = self.rmap.base_placement(T, step=0.3, nyaw=4)
+        self.assertGreater(sol.score, 0)
+        self.assertEqual(sol.reachable.shape, (5,))
+
+    def test_save_load(self):
+        q = np.array([self.robot.random_q() for _ in range(20)])
+        T = self.robot.fkine(q)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "puma")
+            self.rmap.save(filename)
+            rmap = rtb.ReachabilityMap.load(self.robot, filename)
+            self.assertIsInstance(rmap.counts, np.memmap)
+            nt.assert_array_equal(rmap.reachable(T), self.rmap.reachable(T))
+            self.assertEqual(rmap.nsamples, self.rmap.nsamples)
+
+            rmap.fill(100)
+            self.assertEqual(rmap.counts.sum(), self.rmap.counts.sum() + 100)
+
+            with self.assertRaises(ValueError):
+                rtb.ReachabilityMap.load(rtb.models.DH.Panda(), filename)
+
+            del rmap
+
+
+if __name__ == "__main__":  # pragma nocover
+    unittest.main()
@@ -73,6 +73,35 @@ class Testtools(unittest.TestCase):
 
         rtb.jsingu(J)
 
+    def test_jacobian_numerical(self):
+        r = rtb.models.DH.Puma560()
+        q = r.qn
+
+        J = rtb.jacobian_numerical(lambda q: r.fkine(q).A, q, N=3)
+        nt.assert_array_almost_equal(J, r.jacob0(q), decimal=6)
+
+        Jb = rtb.jacobian_numerical(r.eval, q, N=3, batch=True)
+        nt.assert_array_almost_equal(Jb, J)
+
+        f = lambda x: np.array([np.sin(x[0]) * x[1], x[0] ** 2, x[1]])
+        fb = lambda X: np.array([f(x) for x in X])
+        nt.assert_array_almost_equal(
+            rtb.jacobian_numerical(fb, [1.0, 2.0], batch=True),
+            rtb.jacobian_numerical(f, np.r_[1.0, 2.0]),
+        )
+
+    def test_hessian_numerical(self):
+        r = rtb.models.ETS.Puma560()
+        q = np.array([0.1, 0.2, 0.3, 0.1, 0.2, 0.3])
+
+        H = rtb.hessian_numerical(r.jacob0, q)
+        Hb = rtb.hessian_numerical(
+            lambda Q: np.array([r.jacob0(q) for q in Q]), q, batch=True
+        )
+        self.assertEqual(Hb.shape, (6, 6, 6))
+        nt.assert_array_almost_equal(Hb, H)
+        nt.assert_array_almost_equal(np.moveaxis(Hb, 2, 0), r.hessian0(q), decimal=6)
+
     def test_c_angle_axis(self):
         n = 100
 